@@ -0,0 +1,295 @@
+from __future__ import annotations
+import datetime as dt
+import hashlib
+import os
+import select
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple, Optional
+from urllib.parse import urlencode
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.db import dimensions
+from app.models import DATA_VERSION_CHANNEL, DIMENSIONS_CHANNEL
+
+CACHED_PREFIXES = ("/games", "/players", "/standings", "/leaders", "/teams")
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    media_type: str
+
+
+class LRUCache:
+    """In-process LRU bounded by entry count and total body bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._data[key] = entry
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+
+class DiskCache:
+    """Responses shared by every worker on the host, one directory per data version.
+
+    A version's directory is never written again once the version moves on, so
+    older directories are simply removed when a newer version is seen.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, version: int, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, str(version), digest[:2], digest)
+
+    def get(self, version: int, key: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._path(version, key), "rb") as f:
+                header, _, body = f.read().partition(b"\n")
+        except OSError:
+            return None
+        etag, _, media_type = header.decode("utf-8").partition("\t")
+        return CachedResponse(body, etag, media_type)
+
+    def set(self, version: int, key: str, entry: CachedResponse) -> None:
+        path = self._path(version, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(f"{entry.etag}\t{entry.media_type}\n".encode("utf-8") + entry.body)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def prune(self, current: int) -> None:
+        if not os.path.isdir(self.root):
+            return
+        for ent in os.scandir(self.root):
+            if ent.name.isdigit() and int(ent.name) < current:
+                shutil.rmtree(ent.path, ignore_errors=True)
+
+
+class PgListener:
+    """LISTEN on one channel from a dedicated connection, in a background thread.
+
+    Subclasses set ``channel`` and implement ``_read`` (called with a cursor
+    on every (re)connect, after LISTEN, to catch up on anything missed) and
+    optionally ``_notified`` and ``_disconnected``.
+    """
+    channel: str = ""
+
+    def __init__(self, engine, poll_seconds: float = 5.0):
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.channel, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _read(self, cur) -> None:
+        raise NotImplementedError
+
+    def _notified(self, cur, notifies: list) -> None:
+        self._read(cur)
+
+    def _disconnected(self) -> None:
+        pass
+
+    def _run(self) -> None:
+        attempt = 0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self.engine.raw_connection()
+                dbapi = conn.dbapi_connection
+                conn.detach()  # long-lived and autocommit: keep it out of the pool
+                dbapi.autocommit = True
+                with dbapi.cursor() as cur:
+                    # LISTEN before reading, so a notify in between is not lost
+                    cur.execute(f"LISTEN {self.channel}")
+                    self._read(cur)
+                    attempt = 0
+                    while not self._stop.is_set():
+                        if select.select([dbapi], [], [], self.poll_seconds) == ([], [], []):
+                            continue
+                        dbapi.poll()
+                        if dbapi.notifies:
+                            notifies = list(dbapi.notifies)
+                            dbapi.notifies.clear()
+                            self._notified(cur, notifies)
+            except Exception as e:
+                self._disconnected()
+                print(f"Listener on {self.channel} disconnected: {e}")
+                attempt += 1
+                self._stop.wait(min(30.0, 1.5 * attempt))
+            finally:
+                if conn is not None:
+                    conn.close()
+        self._disconnected()
+
+
+class DataVersionListener(PgListener):
+    """Tracks the ETL data version via LISTEN/NOTIFY on a dedicated connection.
+
+    ``version`` is None while the listener is not connected; callers then
+    bypass the cache instead of risking a missed invalidation.
+    """
+    channel = DATA_VERSION_CHANNEL
+
+    def __init__(self, engine, on_change=None, poll_seconds: float = 5.0):
+        super().__init__(engine, poll_seconds)
+        self.on_change = on_change
+        self.version: Optional[int] = None
+        self.updated_at: Optional[dt.datetime] = None
+
+    def _read(self, cur) -> None:
+        cur.execute("SELECT version, updated_at FROM data_version WHERE id = 1")
+        row = cur.fetchone()
+        version, updated_at = row if row else (0, None)
+        if version != self.version:
+            self.version, self.updated_at = version, updated_at
+            if self.on_change is not None:
+                self.on_change(version)
+
+    def _disconnected(self) -> None:
+        self.version = None
+
+
+class DimensionListener(PgListener):
+    """Drops this process's cached teams/seasons whenever a loader changes them."""
+    channel = DIMENSIONS_CHANNEL
+
+    def _read(self, cur) -> None:
+        # (re)connected: a change may have gone by while we were not listening
+        dimensions.invalidate()
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Caches successful GET responses per (data version, path, query).
+
+    Every response carries an ETag and the data version's Last-Modified, and
+    conditional requests that still match get a 304 without touching Postgres.
+    """
+
+    def __init__(self, app, listener: DataVersionListener, memory: LRUCache,
+                 disk: Optional[DiskCache] = None):
+        super().__init__(app)
+        self.listener = listener
+        self.memory = memory
+        self.disk = disk
+
+    async def dispatch(self, request: Request, call_next):
+        version = self.listener.version
+        if request.method != "GET" or version is None or not request.url.path.startswith(CACHED_PREFIXES):
+            return await call_next(request)
+
+        query = urlencode(sorted(request.query_params.multi_items()))
+        key = f"{version}:{request.url.path}?{query}"
+        entry = self.memory.get(key)
+        state = "HIT"
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(version, key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            # content hash, so a load that leaves this response alone still revalidates
+            etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+            entry = CachedResponse(body, etag, response.headers.get("content-type", "application/json"))
+            # a load that committed while the handler ran may not be in this body
+            if self.listener.version == version:
+                self.memory.set(key, entry)
+                if self.disk is not None:
+                    self.disk.set(version, key, entry)
+            state = "MISS"
+
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": state}
+        updated_at = self.listener.updated_at
+        if updated_at is not None:
+            headers["Last-Modified"] = format_datetime(updated_at.astimezone(dt.timezone.utc), usegmt=True)
+        if _not_modified(request, entry.etag, updated_at):
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, headers=headers, media_type=entry.media_type)
+
+
+def _not_modified(request: Request, etag: str, updated_at: Optional[dt.datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return etag in tags or "*" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and updated_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return updated_at.astimezone(dt.timezone.utc).replace(microsecond=0) <= since
+    return False
+
+
+def install(app, engine) -> Optional[DataVersionListener]:
+    """Wire the cache into the app; returns the listener for the lifespan to start/stop."""
+    if not settings.API_CACHE_ENABLED:
+        return None
+    memory = LRUCache(settings.API_CACHE_MAX_ENTRIES, int(settings.API_CACHE_MAX_MB * 1024 * 1024))
+    disk = DiskCache(settings.API_CACHE_DIR) if settings.API_CACHE_DIR else None
+
+    def on_change(version: int) -> None:
+        memory.clear()
+        if disk is not None:
+            disk.prune(version)
+
+    listener = DataVersionListener(engine, on_change)
+    app.add_middleware(ResponseCacheMiddleware, listener=listener, memory=memory, disk=disk)
+    return listener
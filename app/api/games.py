@@ -0,0 +1,76 @@
+from __future__ import annotations
+import base64
+import binascii
+import datetime as dt
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import dimensions
+from app.db.session import get_async_db
+from app.models import Game
+from app.schemas.game import GamePage, GameRead
+
+router = APIRouter(prefix="/games", tags=["games"])
+
+MAX_LIMIT = 500
+
+
+def encode_cursor(date: dt.datetime, game_pk: int) -> str:
+    raw = f"{date.isoformat()}|{game_pk}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_s, _, id_s = base64.urlsafe_b64decode(padded).decode("utf-8").partition("|")
+        return dt.datetime.fromisoformat(date_s), int(id_s)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=GamePage)
+async def list_games(
+    season: Optional[int] = Query(None, description="Season year, e.g. 2025"),
+    team: Optional[int] = Query(None, description="Team id (home or away)"),
+    date_from: Optional[dt.date] = Query(None),
+    date_to: Optional[dt.date] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Games ordered by (date, id), paged by keyset rather than OFFSET."""
+    stmt = select(Game)
+    if season is not None:
+        season_id = (await dimensions.get_async(db)).season_pk.get(season)
+        if season_id is None:
+            return GamePage(items=[], next_cursor=None)
+        stmt = stmt.where(Game.season_id == season_id)
+    if team is not None:
+        stmt = stmt.where(or_(Game.home_team_id == team, Game.away_team_id == team))
+    if date_from is not None:
+        stmt = stmt.where(Game.date >= dt.datetime.combine(date_from, dt.time()))
+    if date_to is not None:
+        stmt = stmt.where(Game.date < dt.datetime.combine(date_to + dt.timedelta(days=1), dt.time()))
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Game.date, Game.id) > tuple_(after_date, after_id))
+    # one extra row tells us whether another page exists
+    stmt = stmt.order_by(Game.date, Game.id).limit(limit + 1)
+
+    rows = (await db.scalars(stmt)).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].date, items[-1].id) if len(rows) > limit else None
+    return GamePage(items=[GameRead.model_validate(g) for g in items], next_cursor=next_cursor)
+
+
+@router.get("/{game_id}", response_model=GameRead)
+async def get_game(game_id: int, db: AsyncSession = Depends(get_async_db)):
+    # the primary key is (id, season_id) since games are partitioned by season
+    game = await db.scalar(select(Game).where(Game.id == game_id))
+    if game is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return game
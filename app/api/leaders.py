@@ -0,0 +1,42 @@
+from __future__ import annotations
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import dimensions
+from app.db.session import get_async_db
+from app.etl.leaders import LEADERS_TOP_K, STATS
+from app.models import LeaderboardEntry, Player
+from app.schemas.leaderboard import LeaderboardEntryRead
+
+router = APIRouter(prefix="/leaders", tags=["leaders"])
+
+
+async def _leaders(db: AsyncSession, stat: str, season: int, limit: int):
+    season_id = (await dimensions.get_async(db)).season_pk.get(season)
+    if season_id is None:
+        return []
+    stmt = (
+        select(LeaderboardEntry.rank, LeaderboardEntry.player_id, LeaderboardEntry.value,
+               Player.name.label("player_name"))
+        .join(Player, Player.id == LeaderboardEntry.player_id)
+        .where(LeaderboardEntry.season_id == season_id, LeaderboardEntry.stat == stat)
+        .order_by(LeaderboardEntry.rank)
+        .limit(limit)
+    )
+    return (await db.execute(stmt)).all()
+
+
+@router.get("", response_model=List[LeaderboardEntryRead])
+async def get_leaders(
+    stat: str = Query(..., description="Stat key, e.g. home_runs, avg, era"),
+    season: int = Query(..., description="Season year"),
+    limit: int = Query(50, ge=1, le=LEADERS_TOP_K),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Precomputed top-K for a stat; rate stats only list qualified players."""
+    if stat not in STATS:
+        raise HTTPException(status_code=400, detail=f"Unknown stat; one of {', '.join(STATS)}")
+    return await _leaders(db, stat, season, limit)
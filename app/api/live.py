@@ -0,0 +1,139 @@
+from __future__ import annotations
+import asyncio
+import datetime as dt
+import json
+from typing import Any, Dict, Optional, Set
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+
+from app.api.cache import PgListener
+from app.config import settings
+from app.models import LIVE_GAMES_CHANNEL
+
+router = APIRouter(prefix="/live", tags=["live"])
+
+SUBSCRIBER_QUEUE = 256
+
+
+class Subscriber:
+    def __init__(self, games: Optional[Set[int]]):
+        self.games = games
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE)
+
+    def wants(self, game_pk: int) -> bool:
+        return self.games is None or game_pk in self.games
+
+    def close(self) -> None:
+        # drop whatever is queued: None tells the socket loop to stop
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class LiveHub:
+    """Latest live state per game plus the WebSocket subscribers it fans deltas out to.
+
+    Only touched from the event loop; the listener thread hands over with
+    call_soon_threadsafe.
+    """
+
+    def __init__(self):
+        self.games: Dict[int, Dict[str, Any]] = {}
+        self.subscribers: Set[Subscriber] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def snapshot(self, games: Optional[Set[int]]) -> Dict[str, Dict[str, Any]]:
+        return {str(pk): s for pk, s in self.games.items() if games is None or pk in games}
+
+    def reset(self, games: Dict[int, Dict[str, Any]]) -> None:
+        # stored columns are authoritative after a reconnect; live-only fields are kept
+        self.games = {pk: {**self.games.get(pk, {}), **fields} for pk, fields in games.items()}
+
+    def publish(self, delta: Dict[str, Any]) -> None:
+        pk = delta["game_pk"]
+        self.games.setdefault(pk, {}).update(delta["changes"])
+        message = {"type": "delta", **delta}
+        for sub in list(self.subscribers):
+            if not sub.wants(pk):
+                continue
+            try:
+                sub.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # too slow to keep up: disconnect; a reconnect starts from a fresh snapshot
+                self.subscribers.discard(sub)
+                sub.close()
+
+    def call(self, fn, *args) -> None:
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(fn, *args)
+
+
+hub = LiveHub()
+
+
+class LiveListener(PgListener):
+    """Feeds live poller NOTIFYs into the hub."""
+    channel = LIVE_GAMES_CHANNEL
+
+    def __init__(self, engine, hub: LiveHub, poll_seconds: float = 5.0):
+        super().__init__(engine, poll_seconds)
+        self.hub = hub
+
+    def _read(self, cur) -> None:
+        # deltas sent while disconnected are gone; reload the stored columns for today
+        cur.execute(
+            "SELECT game_id, status, home_score, away_score FROM games "
+            "WHERE date >= %s AND date < %s",
+            (dt.date.today(), dt.date.today() + dt.timedelta(days=1)),
+        )
+        games = {pk: {"status": s, "home_score": h, "away_score": a} for pk, s, h, a in cur.fetchall()}
+        self.hub.call(self.hub.reset, games)
+
+    def _notified(self, cur, notifies: list) -> None:
+        for n in notifies:
+            self.hub.call(self.hub.publish, json.loads(n.payload))
+
+
+def install(app, engine) -> Optional[LiveListener]:
+    """Mount /live; returns the listener for the lifespan to start/stop."""
+    if not settings.API_LIVE_ENABLED:
+        return None
+    app.include_router(router)
+    return LiveListener(engine, hub)
+
+
+@router.websocket("")
+async def live_games(websocket: WebSocket, games: Optional[str] = Query(None)):
+    """A snapshot of today's games, then a delta message per change.
+
+    ``games`` (comma-separated gamePks) limits both to those games.
+    """
+    try:
+        wanted = {int(pk) for pk in games.split(",")} if games else None
+    except ValueError:
+        await websocket.close(code=1008, reason="games must be comma-separated gamePks")
+        return
+    await websocket.accept()
+    sub = Subscriber(wanted)
+    hub.subscribers.add(sub)
+
+    async def watch_disconnect():
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        sub.close()
+
+    reader = asyncio.create_task(watch_disconnect())
+    try:
+        await websocket.send_json({"type": "snapshot", "games": hub.snapshot(wanted)})
+        while (message := await sub.queue.get()) is not None:
+            await websocket.send_json(message)
+        if not reader.done():
+            await websocket.close(code=1013)  # dropped for falling behind; try again
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        hub.subscribers.discard(sub)
+        reader.cancel()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import datetime as dt
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import dimensions
+from app.db.session import get_async_db
+from app.etl.splits import SPANS
+from app.models import (
+    Player, PlayerBattingSeason, PlayerBattingSplit, PlayerPitchingSeason, PlayerPitchingSplit, PlayerTeamHistory,
+)
+from app.schemas.player import PlayerRead
+from app.schemas.player_team_history import PlayerTeamHistoryRead
+from app.schemas.player_season import PlayerBattingSeasonRead, PlayerPitchingSeasonRead
+from app.schemas.player_split import PlayerBattingSplitRead, PlayerPitchingSplitRead
+
+router = APIRouter(prefix="/players", tags=["players"])
+
+
+@router.get("/{player_id}", response_model=PlayerRead)
+async def get_player(player_id: int, db: AsyncSession = Depends(get_async_db)):
+    player = await db.get(Player, player_id)
+    if player is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return player
+
+
+@router.get("/{player_id}/teams", response_model=List[PlayerTeamHistoryRead])
+async def get_player_teams(player_id: int, db: AsyncSession = Depends(get_async_db)):
+    """The player's team stints in order; the current one has no end_date."""
+    stmt = (
+        select(PlayerTeamHistory)
+        .where(PlayerTeamHistory.player_id == player_id)
+        .order_by(PlayerTeamHistory.start_date)
+    )
+    return (await db.scalars(stmt)).all()
+
+
+async def _season_lines(db: AsyncSession, model, player_id: int, season: Optional[int]):
+    stmt = select(model).where(model.player_id == player_id)
+    if season is not None:
+        season_id = (await dimensions.get_async(db)).season_pk.get(season)
+        if season_id is None:
+            return []
+        stmt = stmt.where(model.season_id == season_id)
+    return (await db.scalars(stmt.order_by(model.season_id, model.team_id))).all()
+
+
+@router.get("/{player_id}/batting", response_model=List[PlayerBattingSeasonRead])
+async def get_player_batting(
+    player_id: int,
+    season: Optional[int] = Query(None, description="Season year; all seasons if omitted"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Season batting lines per team, read from the precomputed rollups."""
+    return await _season_lines(db, PlayerBattingSeason, player_id, season)
+
+
+@router.get("/{player_id}/pitching", response_model=List[PlayerPitchingSeasonRead])
+async def get_player_pitching(
+    player_id: int,
+    season: Optional[int] = Query(None, description="Season year; all seasons if omitted"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Season pitching lines per team, read from the precomputed rollups."""
+    return await _season_lines(db, PlayerPitchingSeason, player_id, season)
+
+
+async def _splits(db: AsyncSession, model, player_id: int, day: Optional[dt.date]):
+    day = day or dt.date.today()
+    season_id = (await dimensions.get_async(db)).season_pk.get(day.year)
+    if season_id is None:
+        return []
+    stmt = (
+        select(model)
+        .where(model.player_id == player_id, model.season_id == season_id, model.as_of <= day)
+        .distinct(model.span)
+        .order_by(model.span, model.as_of.desc())
+    )
+    return _current_splits((await db.scalars(stmt)).all(), day)
+
+
+def _current_splits(rows, day: dt.date) -> list:
+    """The latest row of each span, as it stands on ``day``.
+
+    A last-N-games row holds until the player's next game. A last-N-days row
+    only while its game is inside the N days ending on ``day``; a player idle
+    for longer gets zero sums for that span.
+    """
+    out = []
+    for row in sorted(rows, key=lambda r: SPANS.index(r.span) if r.span in SPANS else len(SPANS)):
+        if row.span.endswith("d") and (day - row.as_of).days >= int(row.span[:-1]):
+            row = {"player_id": row.player_id, "season_id": row.season_id, "as_of": day, "span": row.span}
+        out.append(row)
+    return out
+
+
+@router.get("/{player_id}/batting/splits", response_model=List[PlayerBattingSplitRead])
+async def get_player_batting_splits(
+    player_id: int,
+    date: Optional[dt.date] = Query(None, description="As of this date; today if omitted"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Last-N-days and last-N-games batting on the date, from the player's last game on or before it in its season."""
+    return await _splits(db, PlayerBattingSplit, player_id, date)
+
+
+@router.get("/{player_id}/pitching/splits", response_model=List[PlayerPitchingSplitRead])
+async def get_player_pitching_splits(
+    player_id: int,
+    date: Optional[dt.date] = Query(None, description="As of this date; today if omitted"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Last-N-days and last-N-games pitching on the date, from the player's last game on or before it in its season."""
+    return await _splits(db, PlayerPitchingSplit, player_id, date)
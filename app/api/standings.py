@@ -0,0 +1,39 @@
+from __future__ import annotations
+import datetime as dt
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import dimensions
+from app.db.session import get_async_db
+from app.models import StandingsSnapshot
+from app.schemas.standings import StandingsSnapshotRead
+
+router = APIRouter(prefix="/standings", tags=["standings"])
+
+
+async def _snapshot(db: AsyncSession, season: int, on: Optional[dt.date]):
+    season_id = (await dimensions.get_async(db)).season_pk.get(season)
+    if season_id is None:
+        return []
+    latest = select(func.max(StandingsSnapshot.date)).where(StandingsSnapshot.season_id == season_id)
+    if on is not None:
+        latest = latest.where(StandingsSnapshot.date <= on)
+    stmt = (
+        select(StandingsSnapshot)
+        .where(StandingsSnapshot.season_id == season_id,
+               StandingsSnapshot.date == latest.scalar_subquery())
+        .order_by(StandingsSnapshot.games_back, StandingsSnapshot.pct.desc(), StandingsSnapshot.team_id)
+    )
+    return (await db.scalars(stmt)).all()
+
+
+@router.get("", response_model=List[StandingsSnapshotRead])
+async def get_standings(
+    season: int = Query(..., description="Season year"),
+    date: Optional[dt.date] = Query(None, description="Standings as of this day; latest if omitted"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await _snapshot(db, season, date)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+import datetime as dt
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import dimensions
+from app.db.session import get_async_db
+from app.models import PlayerTeamHistory, TeamHeadToHead
+from app.schemas.head_to_head import HeadToHeadRead, HeadToHeadSummary
+from app.schemas.player_team_history import PlayerTeamHistoryRead
+from app.schemas.team import TeamRead
+
+router = APIRouter(prefix="/teams", tags=["teams"])
+
+
+def stint_covers(day: dt.date):
+    # same expression as ix_player_team_history_during, so the GiST index serves it
+    during = func.daterange(PlayerTeamHistory.start_date, PlayerTeamHistory.end_date, literal_column("'[]'"))
+    return during.op("@>")(day)
+
+
+@router.get("", response_model=List[TeamRead])
+async def list_teams(db: AsyncSession = Depends(get_async_db)):
+    """Every team, served from the in-process dimension cache."""
+    return list((await dimensions.get_async(db)).teams.values())
+
+
+@router.get("/{team_id}", response_model=TeamRead)
+async def get_team(team_id: int, db: AsyncSession = Depends(get_async_db)):
+    team = (await dimensions.get_async(db)).teams.get(team_id)
+    if team is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return team
+
+
+@router.get("/{team_id}/roster", response_model=List[PlayerTeamHistoryRead])
+async def get_roster(
+    team_id: int,
+    date: Optional[dt.date] = Query(None, description="Roster on this day; today if omitted"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Players whose stint with the team (from game appearances) covers the day."""
+    stmt = (
+        select(PlayerTeamHistory)
+        .where(PlayerTeamHistory.team_id == team_id, stint_covers(date or dt.date.today()))
+        .order_by(PlayerTeamHistory.player_id)
+    )
+    return (await db.scalars(stmt)).all()
+
+
+@router.get("/{team_id}/head-to-head", response_model=List[HeadToHeadRead])
+async def get_head_to_head(
+    team_id: int,
+    season: int = Query(..., description="Season year"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """The team's row of the season's head-to-head matrix: one entry per opponent played."""
+    season_id = (await dimensions.get_async(db)).season_pk.get(season)
+    if season_id is None:
+        return []
+    stmt = (
+        select(TeamHeadToHead)
+        .where(TeamHeadToHead.season_id == season_id, TeamHeadToHead.team_id == team_id)
+        .order_by(TeamHeadToHead.opponent_id)
+    )
+    return (await db.scalars(stmt)).all()
+
+
+@router.get("/{team_id}/head-to-head/{opponent_id}", response_model=HeadToHeadSummary)
+async def get_head_to_head_pair(
+    team_id: int,
+    opponent_id: int,
+    season: int = Query(..., description="Season year; the last one when spanning several"),
+    seasons: int = Query(1, ge=1, le=50, description="Seasons to cover, ending with `season`"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """The team's record against one opponent, per season and summed, from the precomputed matrix."""
+    dims = await dimensions.get_async(db)
+    if team_id not in dims.teams or opponent_id not in dims.teams:
+        raise HTTPException(status_code=404, detail="Team not found")
+    season_ids = [dims.season_pk[y] for y in range(season - seasons + 1, season + 1) if y in dims.season_pk]
+    stmt = select(TeamHeadToHead).where(
+        TeamHeadToHead.season_id.in_(season_ids),
+        TeamHeadToHead.team_id == team_id,
+        TeamHeadToHead.opponent_id == opponent_id,
+    )
+    cells = {c.season_id: c for c in (await db.scalars(stmt)).all()}
+    per_season = [HeadToHeadRead.model_validate(cells[sid]) for sid in season_ids if sid in cells]
+    totals = {f: sum(getattr(c, f) for c in per_season)
+              for f in ("games", "wins", "losses", "runs_for", "runs_against")}
+    return HeadToHeadSummary(team_id=team_id, opponent_id=opponent_id, seasons=per_season, **totals)
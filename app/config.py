@@ -1,11 +1,9 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Optional
 import os
 
-load_dotenv()
-
-ENVIRONMENT = os.getenv("ENVIRONMENT", "dev")
-
 
 class Settings(BaseSettings):
     POSTGRES_PORT: int
@@ -15,4 +13,44 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     DATABASE_URL: str
 
-settings = Settings() #type: ignore
\ No newline at end of file
+    # log every SQL statement (both engines); noisy, for debugging only
+    DB_ECHO: bool = False
+
+    # async engine used by the API; defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+    API_DB_POOL_SIZE: int = 10
+    API_DB_MAX_OVERFLOW: int = 10
+    API_DB_POOL_TIMEOUT: float = 10  # seconds to wait for a free connection
+    API_DB_POOL_RECYCLE: int = 1800  # seconds before a pooled connection is replaced
+    API_DB_STATEMENT_TIMEOUT_MS: int = 5000  # 0 disables
+
+    # API response cache; entries are keyed on the ETL data version
+    API_CACHE_ENABLED: bool = True
+    API_CACHE_MAX_ENTRIES: int = 2048
+    API_CACHE_MAX_MB: float = 64
+    API_CACHE_DIR: Optional[str] = None  # shared by all workers on one host when set
+
+    # /live WebSocket: relays the live poller's deltas (one LISTEN connection per worker)
+    API_LIVE_ENABLED: bool = True
+
+
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Read .env and validate the settings, once, on first use rather than at import."""
+    _load_env()
+    return Settings()  # type: ignore
+
+
+def __getattr__(name: str):
+    # `from app.config import settings` keeps working, it just builds them then
+    if name == "settings":
+        return get_settings()
+    if name == "ENVIRONMENT":
+        _load_env()
+        return os.getenv("ENVIRONMENT", "dev")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""Process-wide cache of the small dimension tables: teams and seasons.
+
+Loaders, the bridge and the API all bind MLB team ids and season years to
+primary keys; with the maps held here, binding a whole season's games is
+dictionary lookups instead of per-row queries or joins. The cache is loaded
+on first use (through the caller's session, so it sees that transaction's
+rows) and dropped by ``invalidate``: the loaders call it when upsert_teams /
+upsert_seasons commit, and NOTIFY on DIMENSIONS_CHANNEL so API workers drop
+theirs too.
+
+A snapshot is never mutated, only replaced, so readers need no lock.
+"""
+from __future__ import annotations
+import threading
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.session import get_sessionmaker
+from app.models import Season, Team
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class TeamRow(NamedTuple):
+    id: int
+    team_id: int
+    name: str
+    abbreviation: Optional[str]
+    location: Optional[str]
+    league: Optional[str]
+    division: Optional[str]
+
+
+class Dimensions(NamedTuple):
+    team_pk: Dict[int, int]  # MLB team id -> teams.id
+    season_pk: Dict[int, int]  # year -> seasons.id
+    teams: Dict[int, TeamRow]  # teams.id -> row, in id order
+
+
+_TEAMS = select(Team.id, Team.team_id, Team.name, Team.abbreviation, Team.location,
+                Team.league, Team.division).order_by(Team.id)
+_SEASONS = select(Season.year, Season.id)
+
+_current: Optional[Dimensions] = None
+_generation = 0
+_lock = threading.Lock()
+
+
+def _build(team_rows, season_rows) -> Dimensions:
+    teams = {r[0]: TeamRow(*r) for r in team_rows}
+    return Dimensions({t.team_id: t.id for t in teams.values()}, dict(season_rows), teams)
+
+
+def _store(dims: Dimensions, generation: int) -> Dimensions:
+    global _current
+    with _lock:
+        # an invalidate() while we were reading means these rows may be stale
+        if generation == _generation:
+            _current = dims
+    return dims
+
+
+def invalidate() -> None:
+    global _current, _generation
+    with _lock:
+        _current = None
+        _generation += 1
+
+
+def get(sesh: Optional[Session] = None) -> Dimensions:
+    """The cached dimensions, loaded through ``sesh`` (or a new session) on a miss."""
+    dims = _current
+    if dims is not None:
+        return dims
+    generation = _generation
+    if sesh is None:
+        with get_sessionmaker()() as own:
+            return _store(_build(own.execute(_TEAMS).all(), own.execute(_SEASONS).all()), generation)
+    return _store(_build(sesh.execute(_TEAMS).all(), sesh.execute(_SEASONS).all()), generation)
+
+
+async def get_async(db: AsyncSession) -> Dimensions:
+    """Same as ``get`` for the API's async sessions."""
+    dims = _current
+    if dims is not None:
+        return dims
+    generation = _generation
+    team_rows = (await db.execute(_TEAMS)).all()
+    season_rows = (await db.execute(_SEASONS)).all()
+    return _store(_build(team_rows, season_rows), generation)
+
+
+def fresh(sesh: Session) -> Dimensions:
+    """Reload now: for loaders that missed a key another process may just have inserted."""
+    invalidate()
+    return get(sesh)
@@ -0,0 +1,159 @@
+"""Query-plan regression check: ``python -m app.db.explain_check``.
+
+Runs EXPLAIN for the query shapes the ETL and API depend on, with sequential
+scans disabled for the session. A Seq Scan (or an index scan with no index
+condition) that survives in the plan means no index can serve the query,
+whatever the table size; the check then exits 1. Shapes that filter on
+season_id must also be pruned to a single season partition.
+"""
+from __future__ import annotations
+import datetime as dt
+import re
+import sys
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from app.db.partitions import PARTITIONED
+from app.db.session import get_engine
+from app.etl.load import FINAL_STATUSES, TERMINAL_STATUSES
+
+
+def _in(statuses) -> str:
+    # the loaders' status filters as literal lists, so the plans are theirs
+    return "(" + ", ".join(f"'{s}'" for s in statuses) + ")"
+
+# name -> SQL with the same predicates/order as the code path it stands for
+QUERY_SHAPES: Dict[str, str] = {
+    "games by season (api, standings)":
+        "SELECT * FROM games WHERE season_id = :season_id ORDER BY date, id LIMIT 51",
+    "games by team (api)":
+        "SELECT * FROM games WHERE home_team_id = :team_id OR away_team_id = :team_id "
+        "ORDER BY date, id LIMIT 51",
+    "games by date range (api)":
+        "SELECT * FROM games WHERE date >= :day AND date < :day + interval '7 days' "
+        "ORDER BY date, id LIMIT 51",
+    "games keyset page (api)":
+        "SELECT * FROM games WHERE (date, id) > (:day, :game_id) ORDER BY date, id LIMIT 51",
+    "game by gamePk (merge)":
+        "SELECT id FROM games WHERE game_id = :game_pk AND season_id = :season_id",
+    "games by gamePk (boxscores, live)":
+        "SELECT id, season_id FROM games WHERE season_id = :season_id AND game_id = ANY(:game_ids)",
+    "open games before a day (daily)":
+        "SELECT g.game_id FROM games g "
+        "WHERE g.season_id = :season_id AND g.date < :day "
+        f"AND (g.status IS NULL OR g.status NOT IN {_in(FINAL_STATUSES + TERMINAL_STATUSES)}) "
+        "ORDER BY g.date, g.id",
+    "final games without boxscores (boxscores)":
+        "SELECT g.id, g.game_id FROM games g "
+        f"WHERE g.season_id = :season_id AND g.status IN {_in(FINAL_STATUSES)} "
+        "AND NOT EXISTS (SELECT 1 FROM batter_game_stats b WHERE b.game_id = g.id AND b.season_id = g.season_id) "
+        "ORDER BY g.date, g.id",
+    "batting lines by game (load, rollups)":
+        "SELECT * FROM batter_game_stats WHERE season_id = :season_id AND game_id = ANY(:game_ids)",
+    "pitching lines by game (load, rollups)":
+        "SELECT * FROM pitcher_game_stats WHERE season_id = :season_id AND game_id = ANY(:game_ids)",
+    "fielding lines by game (load)":
+        "SELECT * FROM fielder_game_stats WHERE season_id = :season_id AND game_id = ANY(:game_ids)",
+    "batting lines by player":
+        "SELECT * FROM batter_game_stats WHERE player_id = :player_id",
+    "batting line upsert key":
+        "SELECT id FROM batter_game_stats WHERE player_id = :player_id AND game_id = :game_id "
+        "AND season_id = :season_id",
+    "team records by team and dates (standings)":
+        "SELECT * FROM team_records WHERE team_id = :team_id AND date BETWEEN :day AND :day + 30",
+    "player season batting (api)":
+        "SELECT * FROM player_batting_seasons WHERE player_id = :player_id ORDER BY season_id, team_id",
+    "season batting totals (leaders)":
+        "SELECT player_id, sum(hits) FROM player_batting_seasons WHERE season_id = :season_id "
+        "GROUP BY player_id",
+    "season pitching totals (leaders)":
+        "SELECT player_id, sum(outs) FROM player_pitching_seasons WHERE season_id = :season_id "
+        "GROUP BY player_id",
+    "standings on a day (api)":
+        "SELECT * FROM standings_snapshots WHERE season_id = :season_id AND date = :day",
+    "leaders for a stat (api)":
+        "SELECT * FROM leaderboard_entries WHERE season_id = :season_id AND stat = 'home_runs' "
+        "ORDER BY rank LIMIT 50",
+    "team roster on a day (api)":
+        "SELECT * FROM player_team_history WHERE team_id = :team_id "
+        "AND daterange(start_date, end_date, '[]') @> :day",
+    "player team stints (api, team history)":
+        "SELECT * FROM player_team_history WHERE player_id = :player_id ORDER BY start_date",
+    "head-to-head row of a team (api)":
+        "SELECT * FROM team_head_to_head WHERE season_id = :season_id AND team_id = :team_id "
+        "ORDER BY opponent_id",
+    "head-to-head pair over seasons (api)":
+        "SELECT * FROM team_head_to_head WHERE season_id = ANY(:season_ids) AND team_id = :team_id "
+        "AND opponent_id = :team_id",
+    "player splits as of a day (api)":
+        "SELECT DISTINCT ON (span) * FROM player_batting_splits WHERE player_id = :player_id "
+        "AND season_id = :season_id AND as_of <= :day ORDER BY span, as_of DESC",
+    "season splits from a day (splits)":
+        "SELECT id FROM player_pitching_splits WHERE season_id = :season_id AND as_of >= :day",
+}
+
+PARAMS = {
+    "season_id": 1, "team_id": 1, "player_id": 1, "game_id": 1, "game_pk": 1,
+    "game_ids": [1, 2, 3], "season_ids": [1, 2], "day": dt.date(2024, 6, 1),
+}
+
+
+def _full_scans(plan: dict) -> List[str]:
+    # an index scan without an Index Cond walks the whole index: a seq scan in disguise
+    found = []
+    node = plan.get("Node Type")
+    if node == "Seq Scan" or (node in ("Index Scan", "Index Only Scan") and "Index Cond" not in plan):
+        found.append(f"{node} on {plan.get('Relation Name', '?')}")
+    for child in plan.get("Plans", []):
+        found.extend(_full_scans(child))
+    return found
+
+
+_PARTITION = re.compile(rf"^({'|'.join(PARTITIONED)})_\d{{4}}$")
+
+
+def _unpruned(plan: dict, sql: str) -> List[str]:
+    # a season_id filter should leave one partition of each partitioned table
+    if "season_id = :season_id" not in sql:
+        return []
+    scanned: Dict[str, set] = {}
+
+    def walk(node: dict) -> None:
+        m = _PARTITION.match(node.get("Relation Name", ""))
+        if m:
+            scanned.setdefault(m.group(1), set()).add(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan)
+    return [f"{len(parts)} partitions of {table}" for table, parts in scanned.items() if len(parts) > 1]
+
+
+def check() -> Dict[str, List[str]]:
+    """Map each query shape to the full scans (or unpruned partitions) left in its plan."""
+    results = {}
+    with get_engine().connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for name, sql in QUERY_SHAPES.items():
+            plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), PARAMS).scalar_one()
+            results[name] = _full_scans(plan[0]["Plan"]) + _unpruned(plan[0]["Plan"], sql)
+        conn.rollback()
+    return results
+
+
+def main() -> int:
+    results = check()
+    for name, scans in results.items():
+        status = "ok" if not scans else "; ".join(scans)
+        print(f"{name:<48} {status}")
+    failed = [n for n, t in results.items() if t]
+    if failed:
+        print(f"{len(failed)} query shape(s) fell back to sequential scans or unpruned partitions.")
+        return 1
+    print("All query shapes use indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
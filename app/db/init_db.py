@@ -1,12 +1,78 @@
-from app.db.session import engine
+from sqlalchemy import inspect, text
+
+from app.db import partitions
+from app.db.session import get_engine
 from app.models.base import Base
 
 from app import models
 
+# create_all only creates missing tables; columns added to existing models
+# are applied here so older databases keep up with the ORM definitions.
+UPGRADES = [
+    "ALTER TABLE games ADD COLUMN IF NOT EXISTS row_hash VARCHAR",
+    "ALTER TABLE games ADD COLUMN IF NOT EXISTS home_score INTEGER",
+    "ALTER TABLE games ADD COLUMN IF NOT EXISTS away_score INTEGER",
+    "ALTER TABLE batter_game_stats ADD COLUMN IF NOT EXISTS team_id INTEGER REFERENCES teams (id)",
+    "ALTER TABLE pitcher_game_stats ADD COLUMN IF NOT EXISTS team_id INTEGER REFERENCES teams (id)",
+    "ALTER TABLE fielder_game_stats ADD COLUMN IF NOT EXISTS team_id INTEGER REFERENCES teams (id)",
+]
+
+# keeps the newest row of each duplicate group so a unique index can be built
+_DEDUPE = """
+DELETE FROM {table} a USING {table} b
+WHERE {same} AND a.id < b.id
+RETURNING {returning}
+"""
+
+# stat lines the season rollups are summed from: removing duplicates changes them
+_ROLLUP_SOURCES = ("batter_game_stats", "pitcher_game_stats")
+
+def _create_missing_indexes(conn) -> set:
+    """create_all skips indexes of tables that already exist; add any that are missing.
+
+    Returns the seasons whose rollup stat lines lost duplicates.
+    """
+    stale = set()
+    insp = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {i["name"] for i in insp.get_indexes(table.name)}
+        existing |= {c["name"] for c in insp.get_unique_constraints(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique:
+                same = " AND ".join(f"a.{c.name} = b.{c.name}" for c in index.columns)
+                rollup = table.name in _ROLLUP_SOURCES
+                removed = conn.execute(text(_DEDUPE.format(
+                    table=table.name, same=same, returning="a.season_id" if rollup else "a.id"))).scalars().all()
+                if removed:
+                    print(f"  removed {len(removed)} duplicate rows from {table.name}")
+                    if rollup:
+                        stale.update(removed)
+            print(f"  creating index {index.name}")
+            index.create(conn)
+    return stale
+
 def init_db():
     print("Creating tables..")
+    engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for stmt in UPGRADES:
+            conn.execute(text(stmt))
+        partitions.convert(conn)
+        created = partitions.ensure_partitions(conn)
+        if created:
+            print(f"  created {created} season partitions")
+        stale = _create_missing_indexes(conn)
+        years = conn.execute(text("SELECT year FROM seasons WHERE id = ANY(:ids) ORDER BY year"),
+                             {"ids": sorted(stale)}).scalars().all()
+    if years:
+        from app.etl.load import rebuild_rollups
+        for year in years:
+            print(f"  rebuilding {year} rollups without the removed duplicates")
+            rebuild_rollups(year)
     print("Done.")
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
@@ -0,0 +1,175 @@
+"""Season partitions for games and the per-game stat line tables.
+
+games, batter_game_stats, pitcher_game_stats and fielder_game_stats are
+partitioned by LIST (season_id), one partition per season named
+``<table>_<year>``. Every loader query carries season_id, so reads and upserts
+touch one partition. Partitions are created by ``init_db`` and whenever seasons
+are upserted; ``convert`` rebuilds the tables of an older, unpartitioned
+database in place.
+
+A season can be reloaded without touching what readers see: ``create_shadow``
+makes empty copies of the tables in a ``reload_<year>`` schema, the loaders
+run with that schema first on the search path (``shadow``), and
+``swap_season`` replaces the live partitions with the loaded tables, and the
+season's rollups with the ones accumulated next to them, in one transaction.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import event, text
+
+from app import models  # noqa: F401  (fills Base.metadata)
+from app.db.session import get_engine
+from app.models.base import Base
+
+PARTITIONED = ("games", "batter_game_stats", "pitcher_game_stats", "fielder_game_stats")
+STAT_TABLES = PARTITIONED[1:]
+# the loaders keep these current as they write games and lines; during a reload
+# scratch copies take the updates, and end up holding the reloaded season's rows
+ROLLUP_TABLES = ("player_batting_seasons", "player_pitching_seasons", "team_head_to_head")
+
+_IS_PARTITIONED = text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t))")
+_PARTITIONS = text("""
+SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = to_regclass(:t)""")
+
+
+def partition_name(table: str, year: int) -> str:
+    return f"{table}_{year}"
+
+
+def shadow_schema(year: int) -> str:
+    return f"reload_{year}"
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return conn.execute(_IS_PARTITIONED, {"t": table}).scalar()
+
+
+def _season_id(conn, year: int) -> int:
+    season_id = conn.execute(text("SELECT id FROM seasons WHERE year = :year"), {"year": year}).scalar()
+    if season_id is None:
+        raise ValueError(f"Season {year} not found; insert it first.")
+    return season_id
+
+
+def ensure_partitions(conn, seasons: Optional[Iterable[Tuple[int, int]]] = None) -> int:
+    """Create missing partitions for (season_id, year) pairs, by default every season."""
+    if seasons is None:
+        seasons = conn.execute(text("SELECT id, year FROM seasons ORDER BY year")).all()
+    seasons = list(seasons)
+    created = 0
+    for table in PARTITIONED:
+        if not is_partitioned(conn, table):
+            continue
+        existing = set(conn.execute(_PARTITIONS, {"t": table}).scalars())
+        for season_id, year in seasons:
+            name = partition_name(table, year)
+            if name not in existing:
+                conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES IN ({int(season_id)})"))
+                created += 1
+    return created
+
+
+def drop_season(conn, year: int) -> None:
+    """Drop a season's partitions, i.e. all of its games and stat lines."""
+    for table in reversed(PARTITIONED):  # stat lines reference the games
+        name = partition_name(table, year)
+        if conn.execute(text("SELECT to_regclass(:t)"), {"t": name}).scalar() is not None:
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+
+
+def convert(conn) -> None:
+    """Rebuild unpartitioned games/stat line tables as partitioned ones, keeping rows and ids."""
+    if is_partitioned(conn, "games"):
+        return
+    print("  partitioning games and stat lines by season")
+    tables = Base.metadata.tables
+    for table in PARTITIONED:
+        conn.execute(text(f"CREATE TEMP TABLE {table}_old ON COMMIT DROP AS SELECT * FROM {table}"))
+    # CASCADE also drops team_records' old FK to games.id
+    conn.execute(text(f"DROP TABLE {', '.join(reversed(PARTITIONED))} CASCADE"))
+    for table in PARTITIONED:
+        tables[table].create(conn)
+    ensure_partitions(conn)
+
+    cols = ", ".join(c.name for c in tables["games"].columns)
+    conn.execute(text(f"INSERT INTO games ({cols}) SELECT {cols} FROM games_old"))
+    for table in STAT_TABLES:
+        names = [c.name for c in tables[table].columns if c.name != "season_id"]
+        conn.execute(text(f"""
+INSERT INTO {table} ({', '.join(names)}, season_id)
+SELECT {', '.join(f'l.{c}' for c in names)}, g.season_id
+FROM {table}_old l JOIN games_old g ON g.id = l.game_id"""))
+    for table in PARTITIONED:
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 0) + 1, false) FROM {table}"
+        ))
+
+
+def create_shadow(year: int) -> None:
+    """Empty copies of the partitioned and rollup tables in the season's reload schema."""
+    schema = shadow_schema(year)
+    with get_engine().begin() as conn:
+        season_id = _season_id(conn, year)
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        for table in PARTITIONED + ROLLUP_TABLES:
+            # defaults keep the live id sequences, so ids stay unique after the swap
+            conn.execute(text(f"CREATE TABLE {schema}.{table} (LIKE {table} INCLUDING DEFAULTS INCLUDING INDEXES)"))
+        for table in PARTITIONED:
+            # index names come along verbatim and must not clash once the table moves to public
+            name = partition_name(table, year)
+            for index in conn.execute(text(
+                "SELECT indexname FROM pg_indexes WHERE schemaname = :s AND tablename = :t"
+            ), {"s": schema, "t": table}).scalars():
+                conn.execute(text(f'ALTER INDEX {schema}."{index}" RENAME TO "{f"{name}_{index}"[:63]}"'))
+            # matches the partition bound, so ATTACH PARTITION can skip its validation scan
+            conn.execute(text(
+                f"ALTER TABLE {schema}.{table} ADD CONSTRAINT {name}_season CHECK (season_id = {int(season_id)})"
+            ))
+
+
+@contextmanager
+def shadow(year: int):
+    """Within the block, the loaders' unqualified table names resolve to the reload schema."""
+    schema = shadow_schema(year)
+
+    def set_search_path(dbapi_conn, record):
+        cur = dbapi_conn.cursor()
+        cur.execute(f"SET search_path TO {schema}, public")
+        cur.close()
+        dbapi_conn.commit()  # a rollback on pool return must not undo it
+
+    engine = get_engine()
+    engine.dispose()  # pooled connections still have the default search_path
+    event.listen(engine, "connect", set_search_path)
+    try:
+        yield
+    finally:
+        event.remove(engine, "connect", set_search_path)
+        engine.dispose()
+
+
+def swap_season(year: int) -> dict:
+    """Swap the reloaded tables in as the season's partitions and replace its rollups."""
+    schema = shadow_schema(year)
+    counts = {}
+    with get_engine().begin() as conn:
+        season_id = _season_id(conn, year)
+        for table in PARTITIONED:
+            counts[table] = conn.execute(text(f"SELECT count(*) FROM {schema}.{table}")).scalar()
+        drop_season(conn, year)
+        for table in PARTITIONED:  # games first: the stat lines' FK is checked on attach
+            name = partition_name(table, year)
+            conn.execute(text(f"ALTER TABLE {schema}.{table} RENAME TO {name}"))
+            conn.execute(text(f"ALTER TABLE {schema}.{name} SET SCHEMA public"))
+            conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES IN ({int(season_id)})"))
+        for table in ROLLUP_TABLES:
+            cols = ", ".join(c.name for c in Base.metadata.tables[table].columns if c.name != "id")
+            conn.execute(text(f"DELETE FROM {table} WHERE season_id = :season_id"), {"season_id": season_id})
+            conn.execute(text(f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {schema}.{table}"))
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    return counts
@@ -1,28 +1,96 @@
+"""Engines and session factories, built on first use.
+
+Importing this module reads no settings and creates no engine, so CLI
+subcommands that never touch the database (and ``--help``) skip both.
+``engine``, ``SessionLocal``, ``async_engine`` and ``AsyncSessionLocal`` are
+still importable by name; each is created the first time it is looked up.
+"""
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from typing import Generator
-from app.config import settings
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncGenerator, Generator
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@lru_cache(maxsize=None)
+def get_engine():
+    """Sync engine: ETL, scripts and the API's data version listener."""
+    from app.config import get_settings
+    settings = get_settings()
+    return create_engine(settings.DATABASE_URL, echo=settings.DB_ECHO, future=True)
+
+
+@lru_cache(maxsize=None)
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
 
+def _async_url(settings) -> str:
+    from sqlalchemy.engine import make_url
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
 
 
+@lru_cache(maxsize=None)
+def get_async_engine():
+    """Async engine for the API, so request handlers never block the event loop on DB I/O."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.config import get_settings
+    settings = get_settings()
+    return create_async_engine(
+        _async_url(settings),
+        echo=settings.DB_ECHO,
+        pool_size=settings.API_DB_POOL_SIZE,
+        max_overflow=settings.API_DB_MAX_OVERFLOW,
+        pool_timeout=settings.API_DB_POOL_TIMEOUT,
+        pool_recycle=settings.API_DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={"server_settings": {
+            "statement_timeout": str(settings.API_DB_STATEMENT_TIMEOUT_MS),
+            "application_name": "mlbtracker-api",
+        }},
+    )
 
 
-engine = create_engine(settings.DATABASE_URL, echo=True, future=True)
+@lru_cache(maxsize=None)
+def get_async_sessionmaker():
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    return async_sessionmaker(get_async_engine(), expire_on_commit=False, autoflush=False)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+_LAZY = {
+    "engine": get_engine,
+    "SessionLocal": get_sessionmaker,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_sessionmaker,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return _LAZY[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
         db.commit()
@@ -0,0 +1,197 @@
+"""Durable archive of raw StatsAPI payloads, so transforms can be re-run without refetching.
+
+Layout under MLB_ARCHIVE_DIR::
+
+    <endpoint>/<season>.ndjson.gz   segment: one gzip member per record
+    <endpoint>/<season>.idx         index: "offset<TAB>length<TAB>digest<TAB>key" per record
+
+A record is one NDJSON line, ``{"key", "fetched_at", "payload"}``, compressed
+as its own gzip member so any record is one seek away; ``zcat`` on a segment
+still gives every record in fetch order. Both files are append-only, written
+under a file lock so fetch threads and backfill processes can share them. The
+last index line for a key is its current payload, and a payload identical to
+the current one is not written again.
+
+fetch_data records what it fetches; ``run.py --replay`` makes it serve from
+here instead of the network.
+"""
+from __future__ import annotations
+import datetime as dt
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+ARCHIVE_DIR = os.getenv("MLB_ARCHIVE_DIR", "archive")
+ARCHIVE = os.getenv("MLB_ARCHIVE", "1") == "1"
+COMPRESS_LEVEL = 6
+
+_SEGMENT_SUFFIX = ".ndjson.gz"
+
+
+class ArchiveMiss(LookupError):
+    """Raised in replay mode when a payload was never archived."""
+
+
+class Entry(NamedTuple):
+    offset: int
+    length: int
+    digest: str
+
+
+class Segment:
+    """One endpoint/season pair: the compressed records and their index."""
+
+    def __init__(self, root: str, endpoint: str, season: int):
+        base = os.path.join(root, endpoint, str(season))
+        self.endpoint = endpoint
+        self.season = season
+        self.path = base + _SEGMENT_SUFFIX
+        self.index_path = base + ".idx"
+        self._index: Dict[str, Entry] = {}
+        self._index_pos = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        # picks up lines appended since the last read, by this process or another
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_pos)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1  # a line still being written is read next time
+        for line in data[:end].splitlines():
+            parts = line.decode("utf-8", "replace").split("\t", 3)
+            if len(parts) == 4 and parts[0].isdigit() and parts[1].isdigit():
+                self._index[parts[3]] = Entry(int(parts[0]), int(parts[1]), parts[2])
+        self._index_pos += end
+
+    def entries(self) -> Dict[str, Entry]:
+        with self._lock:
+            self._refresh()
+            return dict(self._index)
+
+    def entry(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            self._refresh()
+            return self._index.get(key)
+
+    def append(self, key: str, payload: bytes, digest: str) -> bool:
+        """Archive ``payload`` (compact JSON) under ``key``; False if it is already current."""
+        fetched_at = dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds")
+        line = b'{"key":%s,"fetched_at":"%s","payload":%s}\n' % (
+            json.dumps(key).encode("utf-8"), fetched_at.encode("ascii"), payload)
+        member = gzip.compress(line, COMPRESS_LEVEL)
+        with self._lock:
+            self._refresh()
+            current = self._index.get(key)
+            if current is not None and current.digest == digest:
+                return False
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "ab") as seg:
+                fcntl.flock(seg, fcntl.LOCK_EX)
+                try:
+                    self._refresh()
+                    current = self._index.get(key)
+                    if current is not None and current.digest == digest:
+                        return False
+                    offset = seg.seek(0, os.SEEK_END)
+                    seg.write(member)
+                    seg.flush()
+                    # the index line goes last: a crash before it leaves an unindexed record, not a bad one
+                    with open(self.index_path, "ab+") as idx:
+                        if idx.seek(0, os.SEEK_END):
+                            idx.seek(-1, os.SEEK_END)
+                            if idx.read(1) != b"\n":
+                                idx.write(b"\n")  # torn line from a crashed writer
+                        idx.write(f"{offset}\t{len(member)}\t{digest}\t{key}\n".encode("utf-8"))
+                finally:
+                    fcntl.flock(seg, fcntl.LOCK_UN)
+            self._refresh()
+        return True
+
+    def _read(self, f, key: str, entry: Entry) -> Any:
+        f.seek(entry.offset)
+        record = json.loads(gzip.decompress(f.read(entry.length)))
+        if record.get("key") != key:
+            raise ArchiveMiss(f"{self.path}: index entry for {key!r} points at {record.get('key')!r}")
+        return record["payload"]
+
+    def read(self, key: str) -> Any:
+        entry = self.entry(key)
+        if entry is None:
+            raise ArchiveMiss(f"{self.endpoint} {key} is not archived for {self.season}")
+        with open(self.path, "rb") as f:
+            return self._read(f, key, entry)
+
+    def records(self) -> Iterator[Tuple[str, Any]]:
+        """(key, current payload) for every key, in the order they were archived."""
+        entries = sorted(self.entries().items(), key=lambda kv: kv[1].offset)
+        if not entries:
+            return
+        with open(self.path, "rb") as f:
+            for key, entry in entries:
+                yield key, self._read(f, key, entry)
+
+
+_segments: Dict[Tuple[str, str, int], Segment] = {}
+_segments_lock = threading.Lock()
+
+
+def segment(endpoint: str, season: int, root: Optional[str] = None) -> Segment:
+    root = root or ARCHIVE_DIR
+    with _segments_lock:
+        seg = _segments.get((root, endpoint, season))
+        if seg is None:
+            seg = _segments[(root, endpoint, season)] = Segment(root, endpoint, season)
+        return seg
+
+
+def seasons(endpoint: str, root: Optional[str] = None) -> List[int]:
+    folder = os.path.join(root or ARCHIVE_DIR, endpoint)
+    if not os.path.isdir(folder):
+        return []
+    names = (n[:-len(_SEGMENT_SUFFIX)] for n in os.listdir(folder) if n.endswith(_SEGMENT_SUFFIX))
+    return sorted(int(n) for n in names if n.isdigit())
+
+
+def record(endpoint: str, season: int, key: str, payload: Any) -> bool:
+    """Archive a fetched payload (a no-op with MLB_ARCHIVE=0)."""
+    if not ARCHIVE:
+        return False
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    digest = hashlib.blake2b(body, digest_size=10).hexdigest()
+    return segment(endpoint, season).append(key, body, digest)
+
+
+def lookup(endpoint: str, key: str, season: Optional[int] = None) -> Any:
+    """The current payload for ``key``; without a season the newest season holding it wins."""
+    for year in ([season] if season is not None else reversed(seasons(endpoint))):
+        seg = segment(endpoint, year)
+        if seg.entry(key) is not None:
+            return seg.read(key)
+    raise ArchiveMiss(f"{endpoint} {key} is not archived" + (f" for {season}" if season is not None else ""))
+
+
+def payloads(endpoint: str, season: int) -> Iterator[Any]:
+    """Current payloads of a segment, streamed in archive order."""
+    for _, payload in segment(endpoint, season).records():
+        yield payload
+
+
+def summary(root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Keys and compressed size per segment."""
+    root = root or ARCHIVE_DIR
+    out = []
+    if not os.path.isdir(root):
+        return out
+    for endpoint in sorted(os.listdir(root)):
+        for year in seasons(endpoint, root):
+            seg = segment(endpoint, year, root)
+            out.append({"endpoint": endpoint, "season": year, "keys": len(seg.entries()),
+                        "bytes": os.path.getsize(seg.path)})
+    return out
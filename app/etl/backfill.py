@@ -0,0 +1,392 @@
+"""Resumable multi-worker backfill on a Postgres job queue (``etl_jobs``).
+
+``plan`` splits seasons into jobs; any number of ``run_worker`` loops, on any
+number of machines, claim them one at a time with FOR UPDATE SKIP LOCKED, so
+workers never wait on each other's claims. Each season moves through stages:
+
+    1 schedule        one per schedule window: fetch + merge the games
+    2 boxscores_plan  once the games are in: enqueue batches of final games
+    3 boxscores       one per batch: fetch + load stat lines and rollups
+    4 derive          standings, leaderboards and team history for the season
+
+A job only becomes claimable once every earlier-stage job of its season is
+done. Running jobs are kept alive by a heartbeat; a job whose worker died is
+reclaimed once the heartbeat is stale. Failures are retried with backoff up to
+``max_attempts``; a boxscores batch whose last attempt still misses some
+games is finished without them (listed in its ``params["missing"]``), so the
+season's derive is not held back by a game the API never serves. All loaders
+are idempotent, so re-running a job that was interrupted half way is safe.
+"""
+from __future__ import annotations
+import datetime as dt
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.session import get_engine
+from app.etl import fetch_data, metrics, transform
+from app.etl.leaders import rebuild_leaders
+from app.etl.load import (
+    games_needing_boxscores, get_session, load_boxscores, merge_games, upsert_seasons,
+)
+from app.etl.splits import compute_splits
+from app.etl.standings import compute_standings
+from app.etl.team_history import rebuild_team_history
+from app.models import EtlJob, Team
+
+HEARTBEAT_SECONDS = float(os.getenv("MLB_BACKFILL_HEARTBEAT", "15"))
+STALE_SECONDS = float(os.getenv("MLB_BACKFILL_STALE", "120"))
+RETRY_BACKOFF_SECONDS = float(os.getenv("MLB_BACKFILL_BACKOFF", "30"))
+
+STAGES = {"schedule": 1, "boxscores_plan": 2, "boxscores": 3, "derive": 4}
+
+# jobs whose heartbeat is stale and that have no attempts left are given up first
+_EXPIRE = text("""
+UPDATE etl_jobs SET status = 'failed', worker = NULL, finished_at = now(),
+       last_error = coalesce(last_error, 'worker lost (heartbeat timed out)')
+WHERE status = 'running' AND heartbeat_at < now() - make_interval(secs => :stale)
+  AND attempts >= max_attempts
+""")
+
+_CLAIM = text("""
+UPDATE etl_jobs SET status = 'running', worker = :worker, attempts = attempts + 1,
+       heartbeat_at = now()
+WHERE id = (
+    SELECT j.id FROM etl_jobs j
+    WHERE (j.status = 'pending'
+           OR (j.status = 'running' AND j.heartbeat_at < now() - make_interval(secs => :stale)))
+      AND j.available_at <= now()
+      AND NOT EXISTS (
+          SELECT 1 FROM etl_jobs d
+          WHERE d.season = j.season AND d.stage < j.stage AND d.status <> 'done'
+      )
+    ORDER BY j.stage, j.season, j.id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, kind, season, params, attempts, max_attempts
+""")
+
+_HEARTBEAT = text("""
+UPDATE etl_jobs SET heartbeat_at = now()
+WHERE id = :id AND worker = :worker AND status = 'running'
+""")
+
+_COMPLETE = text("""
+UPDATE etl_jobs SET status = 'done', finished_at = now(), last_error = NULL,
+       params = params || CAST(:result AS jsonb)
+WHERE id = :id AND worker = :worker AND status = 'running'
+""")
+
+_FAIL = text("""
+UPDATE etl_jobs SET
+    status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+    finished_at = CASE WHEN attempts >= max_attempts THEN now() END,
+    available_at = now() + make_interval(secs => :backoff * attempts),
+    worker = NULL, last_error = :error
+WHERE id = :id AND worker = :worker AND status = 'running'
+RETURNING status
+""")
+
+
+def _job(kind: str, key: str, season: int, params: Dict[str, Any], max_attempts: int) -> dict:
+    now = dt.datetime.now(dt.timezone.utc)
+    return {
+        "kind": kind, "key": key, "season": season, "stage": STAGES[kind], "params": params,
+        "status": "pending", "attempts": 0, "max_attempts": max_attempts,
+        "created_at": now, "available_at": now,
+    }
+
+
+def _enqueue(sesh, jobs: List[dict]) -> int:
+    if not jobs:
+        return 0
+    stmt = pg_insert(EtlJob).values(jobs).on_conflict_do_nothing(index_elements=[EtlJob.kind, EtlJob.key])
+    return sesh.execute(stmt).rowcount
+
+
+def plan(first: int, last: int, batch_size: int = 100, window_days: int = 28,
+         max_attempts: int = 5, replan: bool = False) -> int:
+    """Enqueue the jobs for seasons ``first``..``last``; returns how many were new.
+
+    Planning is idempotent: jobs already queued (done or not) are kept, so a
+    re-run only adds what is missing. ``replan`` first drops the seasons'
+    jobs that are not running, e.g. to reload a season from scratch.
+    """
+    with get_session() as sesh:
+        if sesh.scalar(select(Team.id).limit(1)) is None:
+            raise RuntimeError("No teams loaded; run `bootstrap` first.")
+    upsert_seasons(transform.build_seasons(first, last))
+
+    jobs = []
+    for year in range(first, last + 1):
+        for start, end in fetch_data._season_windows(year, window_days):
+            jobs.append(_job("schedule", f"{year}:{start}", year,
+                             {"start": start, "end": end}, max_attempts))
+        jobs.append(_job("boxscores_plan", str(year), year, {"batch_size": batch_size}, max_attempts))
+        jobs.append(_job("derive", str(year), year, {}, max_attempts))
+
+    with get_session() as sesh:
+        if replan:
+            sesh.execute(text(
+                "DELETE FROM etl_jobs WHERE season BETWEEN :first AND :last AND status <> 'running'"
+            ), {"first": first, "last": last})
+        added = _enqueue(sesh, jobs)
+        sesh.commit()
+    return added
+
+
+def claim(worker: str) -> Optional[dict]:
+    """Take the next runnable job, or None when nothing is claimable right now."""
+    with get_session() as sesh:
+        sesh.execute(_EXPIRE, {"stale": STALE_SECONDS})
+        row = sesh.execute(_CLAIM, {"worker": worker, "stale": STALE_SECONDS}).mappings().first()
+        sesh.commit()
+    return dict(row) if row else None
+
+
+class _Heartbeat:
+    """Refreshes a claimed job's heartbeat from a background thread while it runs."""
+
+    def __init__(self, job_id: int, worker: str):
+        self.job_id = job_id
+        self.worker = worker
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job_id}", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            try:
+                with get_session() as sesh:
+                    updated = sesh.execute(_HEARTBEAT, {"id": self.job_id, "worker": self.worker}).rowcount
+                    sesh.commit()
+            except Exception as e:
+                print(f"Heartbeat for job {self.job_id} failed: {e}")
+                continue
+            if not updated:
+                # reclaimed by another worker; let this attempt finish, it is idempotent,
+                # and _finish will find the job is no longer ours
+                return
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _run_schedule(job: dict, fetch_workers: Optional[int]) -> List[dict]:
+    year, params = job["season"], job["params"]
+    with metrics.stage("fetch_schedule", season=year) as st:
+        schedule = fetch_data.get_schedule_range(dt.date.fromisoformat(params["start"]),
+                                                 dt.date.fromisoformat(params["end"]))
+        total = sum(len(d.get("games", [])) for d in schedule)
+        st.add(rows_out=total)
+    with metrics.stage("transform_games", season=year) as st:
+        games = transform.map_games_columnar(schedule, year)
+        st.add(rows_in=total, rows_out=len(games))
+    with metrics.stage("load_games", season=year) as st:
+        counts = merge_games(games)
+        st.add(rows_in=len(games), rows_out=counts["inserted"] + counts["updated"],
+               rejected=counts["rejected"])
+    return []
+
+
+def _run_boxscores_plan(job: dict, fetch_workers: Optional[int]) -> List[dict]:
+    year, size = job["season"], job["params"]["batch_size"]
+    todo = games_needing_boxscores(year)
+    jobs = []
+    for i in range(0, len(todo), size):
+        batch = todo[i:i + size]
+        jobs.append(_job("boxscores", f"{year}:{batch[0][0]}", year,
+                         {"games": [pk for _, pk in batch]}, job["max_attempts"]))
+    return jobs
+
+
+def _run_boxscores(job: dict, fetch_workers: Optional[int]) -> List[dict]:
+    year, pks = job["season"], job["params"]["games"]
+    with metrics.stage("fetch_boxscores", season=year) as st:
+        payloads = fetch_data.get_boxscores(pks, workers=fetch_workers, season=year)
+        missing = [pk for pk, p in zip(pks, payloads) if p is None]
+        st.add(rows_in=len(pks), rows_out=len(pks) - len(missing), rejected=len(missing))
+    with metrics.stage("transform_boxscores", season=year) as st:
+        boxes = [transform.map_boxscore(p, pk) for pk, p in zip(pks, payloads) if p is not None]
+        st.add(rows_in=len(boxes), rows_out=len(boxes))
+    with metrics.stage("load_boxscores", season=year) as st:
+        counts = load_boxscores(boxes, year)
+        st.add(rows_in=len(boxes), rows_out=counts["batters"] + counts["pitchers"] + counts["fielders"],
+               rejected=len(boxes) - counts["games"])
+    if missing:
+        if job["attempts"] < job["max_attempts"]:
+            # what was fetched is kept; the retry reloads the whole batch, which is idempotent
+            raise RuntimeError(f"{len(missing)} boxscores could not be fetched: {missing[:10]}")
+        # out of attempts: finish without them (recorded on the job) so derive still runs
+        print(f"{len(missing)} boxscores of {year} could not be fetched, giving up: {missing[:10]}")
+        job["result"] = {"missing": missing}
+    return []
+
+
+def _run_derive(job: dict, fetch_workers: Optional[int]) -> List[dict]:
+    year = job["season"]
+    with metrics.stage("standings", season=year) as st:
+        counts = compute_standings(year)
+        st.add(rows_out=counts["team_records"] + counts["snapshots"])
+    with metrics.stage("leaders", season=year) as st:
+        st.add(rows_out=rebuild_leaders(year)["entries"])
+    with metrics.stage("team_history", season=year) as st:
+        counts = rebuild_team_history(year)
+        st.add(rows_in=counts["appearances"], rows_out=counts["stints"])
+    with metrics.stage("splits", season=year) as st:
+        counts = compute_splits(year)
+        st.add(rows_out=counts["batting"] + counts["pitching"])
+    return []
+
+
+_HANDLERS = {
+    "schedule": _run_schedule,
+    "boxscores_plan": _run_boxscores_plan,
+    "boxscores": _run_boxscores,
+    "derive": _run_derive,
+}
+
+
+def _finish(job: dict, worker: str, new_jobs: List[dict]) -> bool:
+    # follow-up jobs are queued in the same transaction that marks the job done
+    with get_session() as sesh:
+        if not sesh.execute(_COMPLETE, {"id": job["id"], "worker": worker,
+                                        "result": json.dumps(job.get("result", {}))}).rowcount:
+            sesh.rollback()
+            return False
+        _enqueue(sesh, new_jobs)
+        sesh.commit()
+    return True
+
+
+def _fail(job: dict, worker: str, error: Exception) -> Optional[str]:
+    with get_session() as sesh:
+        status = sesh.execute(_FAIL, {
+            "id": job["id"], "worker": worker, "error": f"{type(error).__name__}: {error}"[:2000],
+            "backoff": RETRY_BACKOFF_SECONDS,
+        }).scalar()
+        sesh.commit()
+    return status
+
+
+_OUTSTANDING = text("""
+SELECT 1 FROM etl_jobs j
+WHERE j.status = 'running'
+   OR (j.status = 'pending' AND NOT EXISTS (
+           SELECT 1 FROM etl_jobs d
+           WHERE d.season = j.season AND d.stage < j.stage AND d.status = 'failed'))
+LIMIT 1
+""")
+
+
+def _has_outstanding() -> bool:
+    # running jobs, or pending ones (maybe backing off) not stuck behind a failed stage
+    with get_session() as sesh:
+        return sesh.execute(_OUTSTANDING).first() is not None
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(worker: Optional[str] = None, wait: bool = False, poll_seconds: float = 5.0,
+               fetch_workers: Optional[int] = None) -> dict:
+    """Claim and run jobs until the queue is drained (or forever with ``wait``).
+
+    With nothing claimable the worker keeps polling while jobs are still
+    running elsewhere or backing off, since they can unlock later stages.
+    """
+    worker = worker or worker_name()
+    counts = {"done": 0, "retried": 0, "failed": 0}
+    while True:
+        job = claim(worker)
+        if job is None:
+            if not wait and not _has_outstanding():
+                return counts
+            time.sleep(poll_seconds)
+            continue
+
+        label = f"job {job['id']} {job['kind']} {job['season']} (attempt {job['attempts']})"
+        t0 = time.perf_counter()
+        try:
+            with _Heartbeat(job["id"], worker):
+                new_jobs = _HANDLERS[job["kind"]](job, fetch_workers)
+        except Exception as e:
+            status = _fail(job, worker, e)
+            counts["failed" if status == "failed" else "retried"] += 1
+            metrics.inc("backfill_jobs_total", kind=job["kind"], outcome=status or "lost")
+            print(f"[{worker}] {label} failed ({status}): {e}")
+            continue
+
+        if _finish(job, worker, new_jobs):
+            counts["done"] += 1
+            metrics.inc("backfill_jobs_total", kind=job["kind"], outcome="done")
+            extra = f", queued {len(new_jobs)} jobs" if new_jobs else ""
+            print(f"[{worker}] {label} done in {time.perf_counter() - t0:.1f}s{extra}")
+        else:
+            metrics.inc("backfill_jobs_total", kind=job["kind"], outcome="lost")
+            print(f"[{worker}] {label} was reclaimed by another worker; result discarded")
+
+
+def _worker_process(wait: bool, fetch_workers: Optional[int]) -> None:
+    get_engine().dispose(close=False)  # forked: never reuse the parent's pooled connections
+    run_worker(wait=wait, fetch_workers=fetch_workers)
+
+
+def run_workers(processes: int, wait: bool = False, fetch_workers: Optional[int] = None) -> None:
+    """Run ``processes`` forked workers on this machine and wait for them all.
+
+    Each process has its own HTTP rate limit (MLB_RATE_PER_SEC) and connection
+    pool, so throughput grows with the process count until the database or the
+    API becomes the bottleneck. Run reports and metrics only cover a single
+    in-process worker.
+    """
+    if processes <= 1:
+        counts = run_worker(wait=wait, fetch_workers=fetch_workers)
+        print(f"Worker finished: {counts['done']} jobs done, {counts['retried']} retried, "
+              f"{counts['failed']} failed.")
+        return
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_worker_process, args=(wait, fetch_workers), name=f"backfill-{i}")
+             for i in range(processes)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    failed = [p.name for p in procs if p.exitcode]
+    if failed:
+        raise RuntimeError(f"Backfill worker processes exited with errors: {', '.join(failed)}")
+
+
+def status() -> List[dict]:
+    """Job counts per season, kind and status."""
+    with get_session() as sesh:
+        rows = sesh.execute(text("""
+SELECT season, kind, status, count(*) AS jobs, max(last_error) FILTER (WHERE status = 'failed') AS error,
+       coalesce(sum(jsonb_array_length(params->'missing')), 0) AS missing
+FROM etl_jobs GROUP BY season, stage, kind, status ORDER BY season, stage, status
+""")).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def retry_failed(season: Optional[int] = None) -> int:
+    """Give failed jobs a fresh set of attempts."""
+    with get_session() as sesh:
+        n = sesh.execute(text("""
+UPDATE etl_jobs SET status = 'pending', attempts = 0, available_at = now(), finished_at = NULL
+WHERE status = 'failed' AND (CAST(:season AS integer) IS NULL OR season = :season)
+"""), {"season": season}).rowcount
+        sesh.commit()
+    return n
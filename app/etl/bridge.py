@@ -1,23 +1,18 @@
 from __future__ import annotations
 from typing import List, Tuple, Dict, Any
-from sqlalchemy import select
+import pandas as pd
 from sqlalchemy.orm import Session
 
-from app.models import Team, Season
+from app.db import dimensions
 from app.etl.transform import GameIn
 
-# If your Team model uses a different column for the MLB id,
-# change Team.mlb_id below to match (e.g., Team.team_id)
-EXTERNAL_TEAM_ID_COL = Team.team_id  # <-- adjust if needed
-
 def _build_lookup_maps(db: Session) -> tuple[Dict[int, int], Dict[int, int]]:
     """Return (season_map, team_map):
        season_map: year -> season.id
        team_map:   mlb_team_id -> team.id
     """
-    season_map = dict(db.execute(select(Season.year, Season.id)))
-    team_map   = dict(db.execute(select(EXTERNAL_TEAM_ID_COL, Team.id)))
-    return season_map, team_map
+    dims = dimensions.get(db)
+    return dims.season_pk, dims.team_pk
 
 def bind_games_fks(
     db: Session,
@@ -62,3 +57,31 @@ def bind_games_fks(
         })
 
     return good, bad
+
+
+def bind_games_frame(
+    db: Session,
+    frame: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Columnar bind_games_fks: same output columns, FKs mapped a whole column at a time."""
+    season_map, team_map = _build_lookup_maps(db)
+    sid = frame["season_year"].map(season_map).astype("Int64")
+    ht = frame["home_team_mlb_id"].map(team_map).astype("Int64")
+    at = frame["away_team_mlb_id"].map(team_map).astype("Int64")
+
+    ok = sid.notna() & ht.notna() & at.notna()
+    bad = frame.loc[~ok, ["game_id", "season_year", "home_team_mlb_id", "away_team_mlb_id"]]
+    bad.insert(0, "reason", "missing_fk")
+
+    good = pd.DataFrame({
+        "game_id": frame["game_id"],
+        "season_id": sid,
+        "date": frame["date"],
+        "status": frame["status"],
+        "location": frame["location"],
+        "scheduled_start_time": frame["scheduled_start_time"],
+        "official_start_time": frame["official_start_time"],
+        "home_team_id": ht,
+        "away_team_id": at,
+    })[ok].reset_index(drop=True)
+    return good, bad.reset_index(drop=True)
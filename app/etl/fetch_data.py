@@ -1,62 +1,286 @@
 from __future__ import annotations
-import os, time, json
-from typing import Any, Dict, List
-import urllib.request
-import urllib.error
-from urllib.parse import urlencode
+import os, time, json, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 import datetime as dt
 
+import httpx
+
+from app.etl import archive, metrics
+from app.etl.archive import ArchiveMiss
+from app.etl.http_cache import CacheMiss, ResponseCache, ttl_for
+
 API_BASE = os.getenv("MLB_API_BASE", "https://statsapi.mlb.com/api/v1")
-DEBUG_RAW = os.getenv("DEBUG_RAW", "0") == "1"
 
-def _get(url: str) -> Dict[str, Any]:
-    # basic retry/backoff for 429/5xx
-    for attempt in range(5):
+# concurrency knobs; MLB_FETCH_WORKERS=1 gives the old sequential behaviour
+FETCH_WORKERS = int(os.getenv("MLB_FETCH_WORKERS", "4"))
+RATE_PER_SEC = float(os.getenv("MLB_RATE_PER_SEC", "8"))
+RATE_BURST = int(os.getenv("MLB_RATE_BURST", "4"))
+
+# on-disk response cache; MLB_OFFLINE=1 serves only from it and fails fast on a miss
+HTTP_CACHE = os.getenv("MLB_HTTP_CACHE", "1") == "1"
+OFFLINE = os.getenv("MLB_OFFLINE", "0") == "1"
+# serve payloads from the raw archive (app.etl.archive) instead of the network
+REPLAY = os.getenv("MLB_REPLAY", "0") == "1"
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_ATTEMPTS = 5
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every request in the process."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_bucket = TokenBucket(RATE_PER_SEC, RATE_BURST)
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+_cache: Optional[ResponseCache] = None
+
+
+def _get_cache() -> Optional[ResponseCache]:
+    global _cache
+    if not (HTTP_CACHE or OFFLINE):
+        return None
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
+
+
+def _get_client() -> httpx.Client:
+    # one pooled keep-alive client per process, sized for the worker pool
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    timeout=30,
+                    limits=httpx.Limits(
+                        max_connections=max(FETCH_WORKERS, 1) * 2,
+                        max_keepalive_connections=max(FETCH_WORKERS, 1),
+                    ),
+                    headers={"Accept": "application/json"},
+                )
+    return _client
+
+
+def _backoff(attempt: int, resp: Optional[httpx.Response] = None) -> float:
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return 1.5 * (attempt + 1)
+
+
+def _endpoint(url: str) -> str:
+    # low-cardinality metric label: the last path segment ("schedule", "boxscore", ...)
+    return url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+
+
+def _request(url: str, headers: Dict[str, str]) -> httpx.Response:
+    """GET through the rate limiter with retry/backoff for 429/5xx; returns any 2xx/304."""
+    endpoint = _endpoint(url)
+    for attempt in range(MAX_ATTEMPTS):
+        if attempt:
+            metrics.inc("http_retries_total", endpoint=endpoint)
+        _bucket.acquire()
+        t0 = time.perf_counter()
         try:
-            with urllib.request.urlopen(url, timeout=30) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-            
-        except urllib.error.HTTPError as e:
-            body = e.read().decode("utf-8", errors="ignore") if e.fp else ""
-            print(f"[HTTP {e.code}] {url}\n{body[:400]}")
-            if e.code in (429, 500, 502, 503, 504) and attempt < 4:
-                time.sleep(1.5 * (attempt + 1))
+            resp = _get_client().get(url, headers=headers)
+        except httpx.TransportError:
+            metrics.inc("http_requests_total", endpoint=endpoint, status="error")
+            if attempt < MAX_ATTEMPTS - 1:
+                time.sleep(_backoff(attempt))
                 continue
             raise
-        except urllib.error.URLError:
-            if attempt < 4:
-                time.sleep(1.5 * (attempt + 1))
+        metrics.observe("http_request_seconds", time.perf_counter() - t0, endpoint=endpoint)
+        metrics.inc("http_requests_total", endpoint=endpoint, status=resp.status_code)
+        metrics.inc("http_response_bytes_total", len(resp.content), endpoint=endpoint)
+
+        if resp.status_code >= 400:
+            print(f"[HTTP {resp.status_code}] {url}\n{resp.text[:400]}")
+            if resp.status_code in RETRY_STATUSES and attempt < MAX_ATTEMPTS - 1:
+                time.sleep(_backoff(attempt, resp))
                 continue
-            raise
+            resp.raise_for_status()
+        return resp
+    raise RuntimeError(f"unreachable: retries exhausted for {url}")
+
+
+def _get(url: str) -> Dict[str, Any]:
+    cache = _get_cache()
+    entry = cache.lookup(url) if cache else None
+    if entry is not None and (OFFLINE or cache.is_fresh(entry)):
+        metrics.inc("http_cache_total", endpoint=_endpoint(url), result="hit")
+        return json.loads(entry["body"])
+    if OFFLINE:
+        raise CacheMiss(f"offline mode: no cached response for {url}")
+
+    resp = _request(url, ResponseCache.validators(entry))
+    if resp.status_code == 304 and entry is not None:
+        metrics.inc("http_cache_total", endpoint=_endpoint(url), result="revalidated")
+        cache.touch(url, ttl_for(url))
+        return json.loads(entry["body"])
+    if cache is not None:
+        cache.store(url, resp.content, resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"), ttl_for(url))
+    return resp.json()
+
+
+def get_live_schedule(game_pks: List[int], etag: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+    """Schedule rows with linescores for in-progress games, always from the network.
+
+    Sent with If-None-Match when ``etag`` is given; returns ``(None, etag)`` on
+    304, else ``(body, new etag)``. The raw body is returned so callers can
+    skip parsing when it has not changed.
+    """
+    if REPLAY:
+        raise ArchiveMiss("live schedules are not archived")
+    url = (f"{API_BASE}/schedule?sportId=1&gamePks={','.join(map(str, game_pks))}"
+           "&hydrate=linescore")
+    resp = _request(url, {"If-None-Match": etag} if etag else {})
+    if resp.status_code == 304:
+        return None, etag
+    return resp.content, resp.headers.get("ETag")
+
 
 def get_teams(active_only: bool = True) -> List[Dict[str, Any]]:
+    key = "active" if active_only else "all"
+    if REPLAY:
+        return archive.lookup("teams", key).get("teams", [])
     url = f"{API_BASE}/teams"
     if active_only:
         url += "?activeStatus=yes"
     payload = _get(url)
-    teams = payload.get("teams", [])
-    if DEBUG_RAW:
-        os.makedirs("/tmp/mlb_raw", exist_ok=True)
-        with open("/tmp/mlb_raw/teams.json", "w") as f:
-            json.dump(payload, f, indent=2)
-    return teams
+    archive.record("teams", dt.date.today().year, key, payload)
+    return payload.get("teams", [])
+
+
+def _archive_schedule(key: str, payload: Dict[str, Any]) -> None:
+    # one segment per season: a payload spanning New Year is split by its date buckets
+    by_year: Dict[int, List[Dict[str, Any]]] = {}
+    for d in payload.get("dates", []):
+        by_year.setdefault(int(d["date"][:4]), []).append(d)
+    for year, dates in by_year.items():
+        archive.record("schedule", year, key, {**payload, "dates": dates})
+
+
+def _replay_schedule(start: dt.date, end: dt.date) -> List[Dict[str, Any]]:
+    """Archived date buckets between start and end, in the order they were fetched.
+
+    A day fetched more than once comes back once per fetch; the game loaders
+    already keep the best row per game, as they do for overlapping live fetches.
+    """
+    first, last = start.isoformat(), end.isoformat()
+    dates: List[Dict[str, Any]] = []
+    for year in range(start.year, end.year + 1):
+        for payload in archive.payloads("schedule", year):
+            dates.extend(d for d in payload.get("dates", []) if first <= d["date"][:10] <= last)
+    return dates
+
 
 def _fetch_schedule_range(start: str, end: str) -> List[Dict[str, Any]]:
+    if REPLAY:
+        return _replay_schedule(dt.date.fromisoformat(start), dt.date.fromisoformat(end))
     url = f"{API_BASE}/schedule?sportId=1&startDate={start}&endDate={end}&gameTypes=R"
     payload = _get(url)
+    _archive_schedule(f"{start}..{end}", payload)
     return payload.get("dates", [])
 
 
-def get_schedule_for_season(year: int) -> List[Dict[str, Any]]:
+def get_schedule_range(start: dt.date, end: dt.date) -> List[Dict[str, Any]]:
+    return _fetch_schedule_range(start.isoformat(), end.isoformat())
+
+
+def _fetch_schedule_games(pks: str) -> Dict[str, Any]:
+    payload = _get(f"{API_BASE}/schedule?sportId=1&gameTypes=R&gamePks={pks}")
+    _archive_schedule(f"gamePks={pks}", payload)
+    return payload
+
+
+def get_schedule_for_games(game_pks: List[int], chunk: int = 50) -> List[Dict[str, Any]]:
+    """Date buckets for specific games, e.g. ones left unfinished by an earlier run."""
+    if REPLAY:
+        raise ArchiveMiss("replay serves schedules by date range, not by game")
+    batches = [(",".join(map(str, game_pks[i:i + chunk])),) for i in range(0, len(game_pks), chunk)]
+    dates: List[Dict[str, Any]] = []
+    for payload in fetch_concurrently(_fetch_schedule_games, batches):
+        dates.extend(payload.get("dates", []))
+    return dates
+
+
+def _season_windows(year: int, days: int = 28) -> List[Tuple[str, str]]:
     start = dt.date(year, 1, 1)
     end = dt.date(year, 12, 31)
-    step = dt.timedelta(days=28)
-    
-    dates: List[Dict[str, Any]] = []
+    step = dt.timedelta(days=days)
+
+    windows: List[Tuple[str, str]] = []
     cur = start
     while cur <= end:
         win_end = min(cur + step, end)
-        dates.extend(_fetch_schedule_range(cur.isoformat(), win_end.isoformat()))
+        windows.append((cur.isoformat(), win_end.isoformat()))
         cur = win_end + dt.timedelta(days=1)
+    return windows
+
+
+def fetch_concurrently(fn, args: List[Tuple], workers: Optional[int] = None) -> List[Any]:
+    """Run fn(*a) for every a in args on a bounded pool; results keep input order."""
+    workers = FETCH_WORKERS if workers is None else workers
+    if workers <= 1 or len(args) <= 1:
+        return [fn(*a) for a in args]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mlb-fetch") as pool:
+        return list(pool.map(lambda a: fn(*a), args))
+
+
+def get_schedule_for_season(year: int, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    if REPLAY:
+        return _replay_schedule(dt.date(year, 1, 1), dt.date(year, 12, 31))
+    windows = _season_windows(year)
+    chunks = fetch_concurrently(_fetch_schedule_range, windows, workers)
+
+    # windows are disjoint and ordered, so concatenating keeps date order
+    dates: List[Dict[str, Any]] = []
+    for chunk in chunks:
+        dates.extend(chunk)
     return dates
 
+
+def get_boxscore(game_pk: int, season: Optional[int] = None) -> Dict[str, Any]:
+    """A game's boxscore; archived under ``season`` when it is given (the payload has no date)."""
+    if REPLAY:
+        return archive.lookup("boxscore", str(game_pk), season)
+    payload = _get(f"{API_BASE}/game/{game_pk}/boxscore")
+    if season is not None:
+        archive.record("boxscore", season, str(game_pk), payload)
+    return payload
+
+
+def get_boxscores(game_pks: List[int], workers: Optional[int] = None,
+                  season: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+    """Fetch boxscores concurrently, in input order; a game that keeps failing yields None."""
+    def one(pk: int) -> Optional[Dict[str, Any]]:
+        try:
+            return get_boxscore(pk, season)
+        except (httpx.HTTPError, CacheMiss, ArchiveMiss) as e:
+            print(f"Boxscore {pk} failed: {e}")
+            return None
+    return fetch_concurrently(one, [(pk,) for pk in game_pks], workers)
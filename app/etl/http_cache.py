@@ -0,0 +1,167 @@
+from __future__ import annotations
+import os, json, time, hashlib, tempfile, threading
+import datetime as dt
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+
+CACHE_DIR = os.getenv("MLB_HTTP_CACHE_DIR", os.path.expanduser("~/.cache/mlbtracker/http"))
+CACHE_MAX_BYTES = int(float(os.getenv("MLB_HTTP_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+# TTLs in seconds; None means the response never goes stale
+TTL_TEAMS = 24 * 3600
+TTL_RECENT = 6 * 3600
+TTL_CURRENT = 5 * 60
+TTL_DEFAULT = 10 * 60
+TTL_BOXSCORE = 7 * 24 * 3600  # only final games are fetched; allow for scoring changes
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a URL has no cached response."""
+
+
+def ttl_for(url: str, today: Optional[dt.date] = None) -> Optional[float]:
+    """Per-endpoint freshness: past seasons are immutable, the live window is short-lived."""
+    today = today or dt.date.today()
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/")
+    query = parse_qs(parts.query)
+
+    if path.endswith("/teams"):
+        return TTL_TEAMS
+    if path.endswith("/boxscore"):
+        return TTL_BOXSCORE
+    if path.endswith("/schedule"):
+        end = (query.get("endDate") or query.get("date") or [None])[0]
+        if not end:
+            return TTL_CURRENT
+        end_date = dt.date.fromisoformat(end)
+        if end_date.year < today.year:
+            return None
+        if end_date < today - dt.timedelta(days=3):
+            return TTL_RECENT
+        return TTL_CURRENT
+    return TTL_DEFAULT
+
+
+class ResponseCache:
+    """URL-keyed response bodies on disk, with validators and LRU eviction by total size.
+
+    Each entry is two files under ``root/<key[:2]>/``: the raw body and a small
+    JSON sidecar holding the URL, ETag/Last-Modified, fetch time and TTL. A hit
+    bumps the body's mtime, which is what eviction orders on.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        folder = os.path.join(self.root, key[:2])
+        return os.path.join(folder, key + ".body"), os.path.join(folder, key + ".meta")
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        meta["body"] = body
+        return meta
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        ttl = entry.get("ttl")
+        if ttl is None:
+            return True
+        return (now or time.time()) - entry.get("fetched_at", 0) < ttl
+
+    @staticmethod
+    def validators(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str],
+              ttl: Optional[float]) -> None:
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        old = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+        meta = {"url": url, "etag": etag, "last_modified": last_modified,
+                "fetched_at": time.time(), "ttl": ttl}
+        with self._lock:
+            self._current_size()  # the first store scans the cache before its own body lands
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            self._size += len(body) - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def touch(self, url: str, ttl: Optional[float]) -> None:
+        """Mark an entry fresh again after a 304 revalidation."""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        meta["fetched_at"] = time.time()
+        meta["ttl"] = ttl
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(os.path.getsize(p) for p, _ in self._bodies())
+        return self._size
+
+    def _bodies(self):
+        if not os.path.isdir(self.root):
+            return
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for ent in os.scandir(sub.path):
+                if ent.name.endswith(".body"):
+                    yield ent.path, ent.stat().st_mtime
+
+    def _evict(self) -> None:
+        # oldest-used first until we are back under 90% of the budget
+        target = int(self.max_bytes * 0.9)
+        for path, _ in sorted(self._bodies(), key=lambda pm: pm[1]):
+            if self._size <= target:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                os.remove(path[: -len(".body")] + ".meta")
+            except OSError:
+                continue
+            self._size -= size
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
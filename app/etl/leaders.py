@@ -0,0 +1,135 @@
+from __future__ import annotations
+import os
+from typing import Dict, NamedTuple
+
+from sqlalchemy import text
+
+from app.etl import metrics
+from app.etl.load import FINAL_STATUSES, _season_id_by_year, bump_data_version, get_session
+
+LEADERS_TOP_K = int(os.getenv("MLB_LEADERS_TOP_K", "100"))
+
+# qualification for rate stats, per game the player's team has played (for a
+# player who changed teams, the most games of any of their teams)
+MIN_PA_PER_TEAM_GAME = 3.1
+MIN_IP_PER_TEAM_GAME = 1.0
+
+
+class LeaderStat(NamedTuple):
+    group: str       # "batting" or "pitching"
+    expr: str        # SQL over the per-player season totals below
+    ascending: bool  # True when lower is better (ERA, WHIP)
+    rate: bool       # rate stats only rank qualified players
+    digits: int = 0
+
+
+STATS: Dict[str, LeaderStat] = {
+    "hits": LeaderStat("batting", "hits", False, False),
+    "doubles": LeaderStat("batting", "doubles", False, False),
+    "triples": LeaderStat("batting", "triples", False, False),
+    "home_runs": LeaderStat("batting", "home_runs", False, False),
+    "rbis": LeaderStat("batting", "rbis", False, False),
+    "runs_scored": LeaderStat("batting", "runs_scored", False, False),
+    "walks": LeaderStat("batting", "walks", False, False),
+    "stolen_bases": LeaderStat("batting", "stolen_bases", False, False),
+    "avg": LeaderStat("batting", "hits::float / nullif(at_bats, 0)", False, True, 3),
+    "obp": LeaderStat("batting", "(hits + walks)::float / nullif(pa, 0)", False, True, 3),
+    "slg": LeaderStat("batting", "total_bases::float / nullif(at_bats, 0)", False, True, 3),
+    "ops": LeaderStat("batting", "(hits + walks)::float / nullif(pa, 0)"
+                                 " + total_bases::float / nullif(at_bats, 0)", False, True, 3),
+    "innings_pitched": LeaderStat("pitching", "outs / 3.0", False, False, 1),
+    "pitching_strikeouts": LeaderStat("pitching", "strikeouts", False, False),
+    "era": LeaderStat("pitching", "27.0 * earned_runs / nullif(outs, 0)", True, True, 2),
+    "whip": LeaderStat("pitching", "3.0 * (walks + hits_allowed) / nullif(outs, 0)", True, True, 2),
+    "k_per_9": LeaderStat("pitching", "27.0 * strikeouts / nullif(outs, 0)", False, True, 2),
+}
+
+# per-player season totals across teams; "volume" (PA or outs) is the tie-break
+# after the value and decides qualification against the player's team games.
+# PA is AB + BB: HBP and sacrifices are not in the boxscore lines we keep.
+_TOTALS = {
+    "batting": """
+SELECT r.player_id, sum(r.at_bats) AS at_bats, sum(r.hits) AS hits, sum(r.doubles) AS doubles,
+       sum(r.triples) AS triples, sum(r.home_runs) AS home_runs, sum(r.rbis) AS rbis,
+       sum(r.runs_scored) AS runs_scored, sum(r.walks) AS walks, sum(r.stolen_bases) AS stolen_bases,
+       sum(r.at_bats + r.walks) AS pa,
+       sum(r.hits + r.doubles + 2 * r.triples + 3 * r.home_runs) AS total_bases,
+       sum(r.at_bats + r.walks) AS volume,
+       coalesce(max(tg.n), 0) AS team_games
+FROM player_batting_seasons r LEFT JOIN team_games tg ON tg.team_id = r.team_id
+WHERE r.season_id = :season_id GROUP BY r.player_id""",
+    "pitching": """
+SELECT r.player_id, sum(r.outs) AS outs, sum(r.strikeouts) AS strikeouts, sum(r.walks) AS walks,
+       sum(r.hits_allowed) AS hits_allowed, sum(r.earned_runs) AS earned_runs,
+       sum(r.outs) AS volume,
+       coalesce(max(tg.n), 0) AS team_games
+FROM player_pitching_seasons r LEFT JOIN team_games tg ON tg.team_id = r.team_id
+WHERE r.season_id = :season_id GROUP BY r.player_id""",
+}
+
+# final games per team so far; clubs with rainouts have played fewer
+_TEAM_GAMES = """
+SELECT t.team_id, count(*) AS n
+FROM games g CROSS JOIN LATERAL (VALUES (g.home_team_id), (g.away_team_id)) AS t(team_id)
+WHERE g.season_id = :season_id AND g.status = ANY(:final)
+GROUP BY t.team_id"""
+
+
+def _rank_sql(group: str) -> str:
+    # unpivot every stat of the group in one pass, then rank each stat's partition;
+    # values are rounded before ranking so displayed ties break on volume, then id
+    values = ",\n        ".join(
+        f"('{name}', round(({s.expr})::numeric, {s.digits})::float, {str(s.ascending).upper()}, "
+        f"{str(s.rate).upper()})"
+        for name, s in STATS.items() if s.group == group
+    )
+    return f"""
+WITH team_games AS (
+    SELECT * FROM unnest(CAST(:team_ids AS integer[]), CAST(:team_games AS integer[])) AS tg(team_id, n)
+)
+INSERT INTO leaderboard_entries (season_id, stat, rank, player_id, value)
+SELECT :season_id, stat, rank, player_id, value FROM (
+    SELECT s.stat, p.player_id, s.value,
+           row_number() OVER (
+               PARTITION BY s.stat
+               ORDER BY CASE WHEN s.ascending THEN s.value ELSE -s.value END,
+                        p.volume DESC, p.player_id
+           ) AS rank
+    FROM ({_TOTALS[group]}) p
+    CROSS JOIN LATERAL (VALUES
+        {values}
+    ) AS s(stat, value, ascending, rate)
+    WHERE s.value IS NOT NULL AND (NOT s.rate OR p.volume >= :min_{group} * p.team_games)
+) ranked
+WHERE rank <= :k"""
+
+
+def rebuild_leaders(year: int, k: int = LEADERS_TOP_K) -> dict:
+    """Replace a season's top-K lists for every stat from the season rollups.
+
+    Qualification moves with every game played, so the whole season is
+    re-ranked; the inputs are the compact rollup tables, not the stat lines.
+    Readers see the old lists until the replacement commits.
+    """
+    with get_session() as sesh:
+        season_id = _season_id_by_year(sesh, year)
+        # counted once for both groups
+        team_games = sesh.execute(text(_TEAM_GAMES), {
+            "season_id": season_id, "final": list(FINAL_STATUSES),
+        }).all()
+        params = {
+            "season_id": season_id,
+            "k": k,
+            "team_ids": [t for t, _ in team_games],
+            "team_games": [n for _, n in team_games],
+            "min_batting": MIN_PA_PER_TEAM_GAME,
+            "min_pitching": 3 * MIN_IP_PER_TEAM_GAME,  # in outs
+        }
+        sesh.execute(text("DELETE FROM leaderboard_entries WHERE season_id = :season_id"), params)
+        rows = 0
+        for group in ("batting", "pitching"):
+            with metrics.timed("sql_seconds", statement=f"leaders_{group}"):
+                rows += sesh.execute(text(_rank_sql(group)), params).rowcount
+        bump_data_version(sesh)
+        sesh.commit()
+    return {"entries": rows}
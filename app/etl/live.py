@@ -0,0 +1,273 @@
+"""Live scores for today's slate: poll, diff, write what changed, NOTIFY the deltas.
+
+Only games that are in progress or about to start are polled, all of them in
+one schedule request per tick (with linescores), sent with If-None-Match. A
+304, or a body identical to the last one, ends the tick without parsing.
+Each game keeps its own interval: short while live, stretched while nothing
+changes (between innings, rain delays), long before first pitch.
+
+Changed score/status columns are updated in place, and every delta, live-only
+fields (inning, outs) included, is sent with pg_notify on LIVE_GAMES_CHANNEL
+in the same transaction; the API fans those out to WebSocket subscribers.
+The data version, and with it the API's response cache and the head-to-head
+matrix, only moves when a game ends: in-progress scores are served by /live.
+"""
+from __future__ import annotations
+import datetime as dt
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, text, update
+
+from app.db import dimensions
+from app.etl import fetch_data, metrics, transform
+from app.etl.load import (
+    _STATUS_RANK, FINAL_STATUSES, TERMINAL_STATUSES, _refresh_head_to_head, bump_data_version, get_session,
+    merge_games,
+)
+from app.etl.standings import compute_standings
+from app.models import LIVE_GAMES_CHANNEL, Game
+
+LIVE_INTERVAL = float(os.getenv("MLB_LIVE_INTERVAL", "10"))  # seconds, games in progress
+LIVE_SLOW_INTERVAL = float(os.getenv("MLB_LIVE_SLOW_INTERVAL", "60"))  # pre-game, delays
+LIVE_MAX_BACKOFF = float(os.getenv("MLB_LIVE_MAX_BACKOFF", "3"))  # x interval while unchanged
+LIVE_LEAD_MINUTES = float(os.getenv("MLB_LIVE_LEAD_MINUTES", "30"))  # start polling before first pitch
+SLATE_REFRESH_SECONDS = 15 * 60
+
+DB_FIELDS = ("status", "home_score", "away_score")
+LIVE_FIELDS = DB_FIELDS + ("inning", "inning_half", "outs")
+_DONE_PREFIXES = ("Postponed", "Suspended", "Cancelled")
+
+
+class GameState:
+    __slots__ = ("game_pk", "year", "date", "start", "fields", "interval", "next_poll")
+
+    def __init__(self, game_pk: int, year: int, date: dt.date, start: Optional[dt.datetime],
+                 fields: Dict[str, Any]):
+        self.game_pk = game_pk
+        self.year = year
+        self.date = date
+        self.start = start  # naive UTC, like games.scheduled_start_time
+        self.fields = fields
+        self.interval = LIVE_INTERVAL
+        self.next_poll = 0.0  # monotonic seconds; 0 = due now
+
+    def phase(self, now: dt.datetime) -> str:
+        """'done', 'live', 'pre' (close to first pitch) or 'waiting'."""
+        status = self.fields.get("status") or ""
+        if status in FINAL_STATUSES or status in TERMINAL_STATUSES or status.startswith(_DONE_PREFIXES):
+            return "done"
+        if _STATUS_RANK.get(status, 0) >= 2:  # In Progress, Delayed
+            return "live"
+        if self.start is None or self.start - now <= dt.timedelta(minutes=LIVE_LEAD_MINUTES):
+            return "pre"
+        return "waiting"
+
+    def base_interval(self, now: dt.datetime) -> float:
+        status = self.fields.get("status")
+        if status == "In Progress" or (self.start is not None and now >= self.start):
+            return LIVE_INTERVAL
+        return LIVE_SLOW_INTERVAL
+
+
+def live_fields(game: Dict[str, Any]) -> Dict[str, Any]:
+    teams = game.get("teams") or {}
+    linescore = game.get("linescore") or {}
+    return {
+        "status": (game.get("status") or {}).get("detailedState"),
+        "home_score": (teams.get("home") or {}).get("score"),
+        "away_score": (teams.get("away") or {}).get("score"),
+        "inning": linescore.get("currentInning"),
+        "inning_half": linescore.get("inningHalf"),
+        "outs": linescore.get("outs"),
+    }
+
+
+def diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: new[k] for k in LIVE_FIELDS if new.get(k) != old.get(k)}
+
+
+def _delta(game_pk: int, changes: Dict[str, Any]) -> Dict[str, Any]:
+    return {"game_pk": game_pk, "changes": changes,
+            "at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds")}
+
+
+def _notify(sesh, deltas: List[Dict[str, Any]]) -> None:
+    # delivered on commit, together with the rows they describe
+    sesh.execute(text("SELECT pg_notify(:channel, :payload)"), [
+        {"channel": LIVE_GAMES_CHANNEL, "payload": json.dumps(d, separators=(",", ":"))}
+        for d in deltas
+    ])
+
+
+def _utcnow() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc).replace(tzinfo=None)
+
+
+class LivePoller:
+    def __init__(self, day: dt.date):
+        self.day = day
+        self.games: Dict[int, GameState] = {}
+        self.slate_loaded_at = float("-inf")
+        self._etag: Optional[str] = None
+        self._etag_key: Tuple[int, ...] = ()
+        self._body_hash: Optional[bytes] = None
+
+    def load_slate(self) -> None:
+        """Merge the day's schedule, then track every game of the day.
+
+        Games already tracked keep their in-memory state; new ones start from
+        what is stored, so the first poll only reports real changes, and their
+        stored state is announced so API workers hold the whole slate.
+        """
+        schedule = fetch_data.get_schedule_range(self.day, self.day)
+        if schedule:
+            merge_games(transform.map_games_columnar(schedule, self.day.year))
+        start = dt.datetime.combine(self.day, dt.time())
+        with get_session() as sesh:
+            season_id = dimensions.get(sesh).season_pk.get(self.day.year)
+            rows = sesh.execute(
+                select(Game.game_id, Game.scheduled_start_time,
+                       Game.status, Game.home_score, Game.away_score)
+                .where(Game.season_id == season_id,
+                       Game.date >= start, Game.date < start + dt.timedelta(days=1))
+            ).all()
+        added = []
+        for pk, sched, status, home, away in rows:
+            if pk not in self.games:
+                fields = {"status": status, "home_score": home, "away_score": away}
+                self.games[pk] = GameState(pk, self.day.year, self.day, sched, fields)
+                added.append(_delta(pk, dict(fields)))
+        if added:
+            with get_session() as sesh:
+                _notify(sesh, added)
+                sesh.commit()
+        self.slate_loaded_at = time.monotonic()
+
+    def due(self, now: dt.datetime, mono: float) -> List[GameState]:
+        return [g for g in self.games.values()
+                if g.phase(now) in ("live", "pre") and g.next_poll <= mono]
+
+    def pending(self, now: dt.datetime) -> bool:
+        return any(g.phase(now) != "done" for g in self.games.values())
+
+    def next_wake(self, now: dt.datetime, mono: float) -> float:
+        """Monotonic time of the next poll, or of the next game entering the lead window."""
+        wake = self.slate_loaded_at + SLATE_REFRESH_SECONDS
+        for g in self.games.values():
+            phase = g.phase(now)
+            if phase in ("live", "pre"):
+                wake = min(wake, g.next_poll)
+            elif phase == "waiting":
+                lead = g.start - dt.timedelta(minutes=LIVE_LEAD_MINUTES) - now
+                wake = min(wake, mono + lead.total_seconds())
+        return wake
+
+    def _fetch(self, pks: Tuple[int, ...]) -> Optional[List[Dict[str, Any]]]:
+        # validators only apply to the same request, i.e. the same set of games
+        etag = self._etag if pks == self._etag_key else None
+        body, etag = fetch_data.get_live_schedule(list(pks), etag)
+        self._etag, self._etag_key = etag, pks
+        if body is None:
+            metrics.inc("live_polls_total", result="not_modified")
+            return None
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if digest == self._body_hash:
+            metrics.inc("live_polls_total", result="unchanged")
+            return None
+        self._body_hash = digest
+        metrics.inc("live_polls_total", result="changed")
+        return [g for d in json.loads(body).get("dates", []) for g in d.get("games", [])]
+
+    def tick(self) -> List[Dict[str, Any]]:
+        """Poll the due games once; returns the deltas that were written and sent."""
+        now, mono = _utcnow(), time.monotonic()
+        due = self.due(now, mono)
+        if not due:
+            return []
+        payload = self._fetch(tuple(sorted(g.game_pk for g in due)))
+
+        deltas = []
+        changed_pks = set()
+        for game in payload or []:
+            state = self.games.get(game.get("gamePk"))
+            if state is None:
+                continue
+            changes = diff(state.fields, live_fields(game))
+            if changes:
+                state.fields.update(changes)
+                changed_pks.add(state.game_pk)
+                deltas.append(_delta(state.game_pk, changes))
+        for state in due:
+            # back off while a game sits still; snap back on the first change
+            base = state.base_interval(now)
+            if state.game_pk in changed_pks:
+                state.interval = base
+            else:
+                state.interval = min(max(state.interval, base) * 1.5, base * LIVE_MAX_BACKOFF)
+            state.next_poll = mono + state.interval
+        if deltas:
+            self._write(deltas)
+        return deltas
+
+    def _write(self, deltas: List[Dict[str, Any]]) -> None:
+        finished = set()
+        with get_session() as sesh:
+            season_pk = dimensions.get(sesh).season_pk
+            touched: Dict[int, set] = {}
+            for d in deltas:
+                values = {k: v for k, v in d["changes"].items() if k in DB_FIELDS}
+                state = self.games[d["game_pk"]]
+                season_id = season_pk.get(state.year)
+                if not values or season_id is None:
+                    continue
+                teams = sesh.execute(
+                    update(Game).where(Game.season_id == season_id, Game.game_id == d["game_pk"])
+                    .values(**values).returning(Game.home_team_id, Game.away_team_id)
+                ).first()
+                if "status" in values and state.phase(_utcnow()) == "done":
+                    finished.add((state.year, state.date))
+                    if teams is not None:
+                        touched.setdefault(season_id, set()).add(tuple(teams))
+            _notify(sesh, deltas)
+            # in-progress scores reach clients through /live; the cached API
+            # responses (and head-to-head) only move when a game ends
+            for season_id in sorted(touched):
+                _refresh_head_to_head(sesh, season_id, touched[season_id])
+            if finished:
+                bump_data_version(sesh)
+            sesh.commit()
+        metrics.inc("live_deltas_total", len(deltas))
+        # standings only move when a game ends; recompute from that day on
+        for year, day in sorted(finished):
+            compute_standings(year, from_date=day)
+
+
+def run(day: Optional[dt.date] = None, watch: bool = False) -> None:
+    """Track a day's slate until every game is over; with ``watch``, keep rolling to the next day."""
+    poller = LivePoller(day or dt.date.today())
+    poller.load_slate()
+    print(f"(Live) tracking {len(poller.games)} games on {poller.day}")
+    while True:
+        if time.monotonic() - poller.slate_loaded_at >= SLATE_REFRESH_SECONDS:
+            poller.load_slate()
+        for d in poller.tick():
+            print(f"  {d['game_pk']}: {d['changes']}")
+
+        now, mono = _utcnow(), time.monotonic()
+        if not poller.pending(now):
+            if not watch:
+                print(f"(Live) all games on {poller.day} are over.")
+                return
+            if dt.date.today() == poller.day:
+                # slate finished early: check back for tomorrow's at the next refresh
+                time.sleep(SLATE_REFRESH_SECONDS)
+                continue
+            poller = LivePoller(dt.date.today())
+            poller.load_slate()
+            print(f"(Live) tracking {len(poller.games)} games on {poller.day}")
+            continue
+        time.sleep(min(max(poller.next_wake(now, mono) - mono, 0.5), SLATE_REFRESH_SECONDS))
@@ -1,15 +1,45 @@
 from __future__ import annotations
-from typing import List
-from sqlalchemy import select
+import csv
+import datetime as dt
+import hashlib
+import io
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence, Union
+
+from sqlalchemy import delete, exists, insert, or_, select, text, update
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.db.session import SessionLocal
-from app.models import Team, Game, Season
-from app.etl.transform import TeamIn, GameIn, SeasonIn
+from app.db import dimensions
+from app.db.partitions import ensure_partitions
+from app.db.session import get_sessionmaker
+from app.etl import metrics
+from app.models import DATA_VERSION_CHANNEL, DIMENSIONS_CHANNEL, Team, Game, Season, EtlWatermark, Player, BatterGameStats, PitcherGameStats, FielderGameStats
+
+if TYPE_CHECKING:
+    # annotations only: loaders that never see a frame don't pay for pandas or pydantic models
+    import pandas as pd
+    from app.etl.transform import TeamIn, GameIn, SeasonIn, BoxscoreIn
 
 def get_session() -> Session:
-    return SessionLocal()
+    return get_sessionmaker()()
+
+_BUMP_VERSION = text("""
+INSERT INTO data_version AS v (id, version, updated_at) VALUES (1, 1, now())
+ON CONFLICT (id) DO UPDATE SET version = v.version + 1, updated_at = now()
+RETURNING version, pg_notify(:channel, version::text)
+""")
+
+def bump_data_version(sesh: Session) -> int:
+    """Advance the data version inside the caller's transaction.
+
+    NOTIFY is delivered on commit only, so API workers hear about the new
+    version exactly when the data it covers becomes visible.
+    """
+    return sesh.execute(_BUMP_VERSION, {"channel": DATA_VERSION_CHANNEL}).scalar_one()
+
+def _notify_dimensions(sesh: Session) -> None:
+    # on commit: other processes (API workers) drop their cached teams/seasons
+    sesh.execute(text("SELECT pg_notify(:channel, '')"), {"channel": DIMENSIONS_CHANNEL})
 
 def upsert_teams(rows: List[TeamIn]) -> int:
     if not rows:
@@ -22,10 +52,14 @@ def upsert_teams(rows: List[TeamIn]) -> int:
             "abbreviation": insert_stmt.excluded.abbreviation,
             "location": insert_stmt.excluded.location,
             "league": insert_stmt.excluded.league,
+            "division": insert_stmt.excluded.division,
         },
     )
         res = sesh.execute(upsert_stmt)
+        bump_data_version(sesh)
+        _notify_dimensions(sesh)
         sesh.commit()
+        dimensions.invalidate()
 
         return len(dicts)
 
@@ -37,26 +71,40 @@ def upsert_seasons(rows: List[SeasonIn]) -> int:
     with get_session() as sesh:
         insert_stmt = pg_insert(Season).values(dicts)
         upsert_stmt = insert_stmt.on_conflict_do_nothing(index_elements=[Season.year])
-        sesh.execute(upsert_stmt)
+        inserted = sesh.execute(upsert_stmt).rowcount
+        if inserted:
+            bump_data_version(sesh)
+            _notify_dimensions(sesh)
+        ensure_partitions(sesh)
         sesh.commit()
+        if inserted:
+            dimensions.invalidate()
         return len(dicts)
     
+def _season_pk(sesh: Session, year: int) -> Optional[int]:
+    season_id = dimensions.get(sesh).season_pk.get(year)
+    if season_id is None:
+        # may have been inserted by another process since the cache was loaded
+        season_id = dimensions.fresh(sesh).season_pk.get(year)
+    return season_id
+
 def _season_id_by_year(sesh: Session, year: int) -> int:
-    season = sesh.scalar(select(Season).where(Season.year == year))
-    if season is None:
+    season_id = _season_pk(sesh, year)
+    if season_id is None:
         raise ValueError(f"Season {year} not found; insert it first.")
-    return season.id
+    return season_id
 
 def _team_id_by_team_id(sesh: Session, mlb_team_id: int) -> int:
-    # helper for team FK lookups later
-    team = sesh.scalar(select(Team).where(Team.team_id == mlb_team_id))
-    if team is None:
+    team_id = dimensions.get(sesh).team_pk.get(mlb_team_id)
+    if team_id is None:
+        team_id = dimensions.fresh(sesh).team_pk.get(mlb_team_id)
+    if team_id is None:
         raise ValueError(f"Team with team_id={mlb_team_id} not found")
-    return team.id
-
-CHUNK_SIZE = 500
+    return team_id
 
 _STATUS_RANK = {"Final": 4, "Game Over": 4, "In Progress": 3, "Delayed": 2, "Pre-Game": 1}
+FINAL_STATUSES = ("Final", "Game Over", "Completed Early")
+TERMINAL_STATUSES = ("Cancelled",)
 
 def _pick_better(a: dict, b: dict) -> dict:
     # Higher status rank wins
@@ -82,74 +130,510 @@ def _dedupe_by_game_id(rows: list[dict]) -> list[dict]:
             by_id[gid] = d
     return list(by_id.values())
 
-def upsert_games(rows: List[GameIn]) -> int:
-    if not rows:
-        return 0
+_GAME_STAGE_COLUMNS = (
+    "game_id", "date", "status", "location", "season_year",
+    "scheduled_start_time", "official_start_time",
+    "home_team_mlb_id", "away_team_mlb_id", "home_score", "away_score", "row_hash",
+)
+
+# staged rows carry PKs: season year and MLB team ids are bound in memory
+_BOUND_STAGE_COLUMNS = (
+    "game_id", "date", "status", "location", "season_id",
+    "scheduled_start_time", "official_start_time",
+    "home_team_id", "away_team_id", "home_score", "away_score", "row_hash",
+)
+
+_CREATE_GAME_STAGE = """
+CREATE TEMP TABLE games_stage (
+    game_id              integer NOT NULL,
+    date                 timestamp,
+    status               varchar,
+    location             varchar,
+    season_id            integer NOT NULL,
+    scheduled_start_time timestamp,
+    official_start_time  timestamp,
+    home_team_id         integer NOT NULL,
+    away_team_id         integer NOT NULL,
+    home_score           integer,
+    away_score           integer,
+    row_hash             varchar
+) ON COMMIT DROP
+"""
+
+# Existing games are only rewritten when their row hash changed. Rows go in
+# game_id order so concurrent merges (a postponed game sits in two schedule
+# windows) lock conflicting rows in the same order instead of deadlocking.
+# The conflict key carries season_id, so each row is routed to and checked in
+# its season's partition only.
+_MERGE_GAMES = """
+WITH existing AS (
+    -- statement snapshot: tells inserts from updates (xmax is not exposed on partitioned tables)
+    SELECT g.game_id FROM games_stage s
+    JOIN games g ON g.game_id = s.game_id AND g.season_id = s.season_id
+), merged AS (
+INSERT INTO games (
+    game_id, date, status, location, season_id,
+    scheduled_start_time, official_start_time, home_team_id, away_team_id,
+    home_score, away_score, row_hash
+)
+SELECT s.game_id, s.date, s.status, s.location, s.season_id,
+       s.scheduled_start_time, s.official_start_time, s.home_team_id, s.away_team_id,
+       s.home_score, s.away_score, s.row_hash
+FROM games_stage s
+ORDER BY s.game_id
+ON CONFLICT (game_id, season_id) DO UPDATE SET
+    date = EXCLUDED.date,
+    status = EXCLUDED.status,
+    location = EXCLUDED.location,
+    scheduled_start_time = EXCLUDED.scheduled_start_time,
+    official_start_time = EXCLUDED.official_start_time,
+    home_team_id = EXCLUDED.home_team_id,
+    away_team_id = EXCLUDED.away_team_id,
+    home_score = EXCLUDED.home_score,
+    away_score = EXCLUDED.away_score,
+    row_hash = EXCLUDED.row_hash
+WHERE games.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+RETURNING game_id, date, season_id, home_team_id, away_team_id
+)
+SELECT NOT EXISTS (SELECT 1 FROM existing e WHERE e.game_id = m.game_id) AS inserted, m.date,
+       m.season_id, m.home_team_id, m.away_team_id
+FROM merged m
+"""
+
+# the games the merge will rewrite, locked in its order: their current pairings
+# may lose a game, so their head-to-head cells are recomputed too
+_LOCK_CHANGING_GAMES = """
+SELECT g.season_id, g.home_team_id, g.away_team_id
+FROM games g JOIN games_stage s ON s.game_id = g.game_id AND s.season_id = g.season_id
+WHERE g.row_hash IS DISTINCT FROM s.row_hash
+ORDER BY g.game_id
+FOR UPDATE OF g
+"""
+
+# both sides of every scored final game of the season
+_HEAD_TO_HEAD_SELECT = """
+SELECT g.season_id, t.team_id, t.opponent_id, count(*),
+       count(*) FILTER (WHERE t.runs_for > t.runs_against),
+       count(*) FILTER (WHERE t.runs_for < t.runs_against),
+       sum(t.runs_for), sum(t.runs_against)
+FROM games g
+CROSS JOIN LATERAL (VALUES (g.home_team_id, g.away_team_id, g.home_score, g.away_score),
+                           (g.away_team_id, g.home_team_id, g.away_score, g.home_score))
+    AS t (team_id, opponent_id, runs_for, runs_against)
+WHERE g.season_id = :season_id AND g.status = ANY(:final)
+  AND g.home_score IS NOT NULL AND g.away_score IS NOT NULL AND {where}
+GROUP BY g.season_id, t.team_id, t.opponent_id
+"""
+# an unordered team pair as one bigint, so a pair filter is a hashed = ANY(:pairs)
+_PAIR_KEY = "((least({a}, {b})::bigint << 32) | greatest({a}, {b}))"
+
+def _copy_rows(cur, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    # CSV COPY: None is written as an unquoted empty field, which COPY reads as NULL
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+def game_row_hash(d: dict) -> str:
+    """Stable hash of the normalized schedule fields of a game row."""
+    parts = ("" if d.get(c) is None else str(d[c]) for c in _GAME_STAGE_COLUMNS[:-1])
+    return hashlib.md5("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+def _dedupe_games_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized duplicate detection; only the few repeated game_ids go through
+    _pick_better, so precedence and tie-breaking match _dedupe_by_game_id exactly."""
+    import numpy as np
+    dup = frame["game_id"].duplicated(keep=False).to_numpy()
+    if not dup.any():
+        return frame
+    positions = np.flatnonzero(dup)
+    records = frame.iloc[positions].to_dict("records")
+
+    best: dict[int, tuple[int, dict]] = {}
+    first: dict[int, int] = {}
+    for pos, rec in zip(positions.tolist(), records):
+        gid = rec["game_id"]
+        if gid in best:
+            cur_pos, cur = best[gid]
+            best[gid] = (pos, rec) if _pick_better(cur, rec) is rec else (cur_pos, cur)
+        else:
+            best[gid] = (pos, rec)
+            first[gid] = pos
+
+    # each game keeps the position of its first occurrence, like the dict path
+    take = np.flatnonzero(~dup)
+    order = np.concatenate([take, np.array([first[g] for g in best], dtype=np.int64)])
+    rows = np.concatenate([take, np.array([p for p, _ in best.values()], dtype=np.int64)])
+    return frame.iloc[rows[np.argsort(order, kind="stable")]].reset_index(drop=True)
+
+def _prepare_games_frame(frame: pd.DataFrame) -> tuple[List[tuple], int]:
+    """Filter, dedupe and hash a columnar game frame into COPY-ready stage tuples."""
+    import numpy as np
+    import pandas as pd
+    has_teams = (frame["home_team_mlb_id"].to_numpy(dtype=np.int64, na_value=0) != 0) & \
+                (frame["away_team_mlb_id"].to_numpy(dtype=np.int64, na_value=0) != 0)
+    skipped = int((~has_teams).sum())
+    filtered = frame[has_teams] if skipped else frame
+    deduped = _dedupe_games_frame(filtered)
+    removed = len(filtered) - len(deduped)
+    if removed:
+        print(f"Removed {removed} duplicate game_ids before upsert.")
+
+    cols = []
+    text_cols = []
+    for c in _GAME_STAGE_COLUMNS[:-1]:
+        arr = deduped[c].to_numpy(dtype=object, na_value=None)
+        nulls = pd.isna(arr)
+        cols.append(arr.tolist())
+        if deduped[c].dtype == object:
+            text = arr if not nulls.any() else np.where(nulls, "", arr)
+        else:
+            text = deduped[c].to_numpy(dtype=np.int64, na_value=0).astype(str).astype(object)
+            text[nulls] = ""
+        text_cols.append(text.tolist())
+    hashes = [hashlib.md5("\x1f".join(parts).encode("utf-8")).hexdigest() for parts in zip(*text_cols)]
+    return list(zip(*cols, hashes)), skipped
 
+def _prepare_game_dicts(rows: List[GameIn]) -> tuple[List[dict], int]:
     dicts = []
     skipped = 0
+    for row in rows:
+        if not (row.home_team_mlb_id and row.away_team_mlb_id):
+            skipped += 1
+            continue
+        dicts.append(row.model_dump())
+
+    original_len = len(dicts)
+    dicts = _dedupe_by_game_id(dicts)
+    removed = original_len - len(dicts)
+    if removed:
+        print(f"Removed {removed} duplicate game_ids before upsert.")
+    for d in dicts:
+        d["row_hash"] = game_row_hash(d)
+    return dicts, skipped
+
+def _bind_stage_rows(rows: List[Sequence[Any]], dims: dimensions.Dimensions) -> List[tuple]:
+    """Swap season_year and the MLB team ids for PKs; rows with an unknown one are dropped."""
+    season_pk, team_pk = dims.season_pk, dims.team_pk
+    bound = []
+    for r in rows:
+        sid, home, away = season_pk.get(r[4]), team_pk.get(r[7]), team_pk.get(r[8])
+        if sid and home and away:
+            bound.append((*r[:4], sid, r[5], r[6], home, away, *r[9:]))
+    return bound
+
+def merge_games(rows: Union[List[GameIn], pd.DataFrame]) -> dict:
+    """Stage, bind and merge games; returns inserted/updated/unchanged/rejected counts
+    plus ``earliest_changed``, the first date whose games were inserted or updated.
+
+    Accepts either GameIn rows or a frame from transform.map_games_columnar.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "earliest_changed": None}
+    if isinstance(rows, list):
+        dicts, skipped = _prepare_game_dicts(rows)
+        staged = len(dicts)
+        stage_rows = [[d[c] for c in _GAME_STAGE_COLUMNS] for d in dicts]
+    else:
+        stage_rows, skipped = _prepare_games_frame(rows)
+        staged = len(stage_rows)
+
+    if skipped:
+        print(f"Skipped {skipped} rows with missing team ids.")
+    if not staged:
+        return counts
+
     with get_session() as sesh:
-        season_cache: dict[int, int] = {}
-        def season_id_for(y: int) -> int:
-            if y not in season_cache:
-                season_cache[y] = _season_id_by_year(sesh, y)
-            return season_cache[y]
-
-        for row in rows:
-            if not (row.home_team_mlb_id and row.away_team_mlb_id):
-                skipped += 1
-                continue
-            home_pk = _team_id_by_team_id(sesh, row.home_team_mlb_id)
-            away_pk = _team_id_by_team_id(sesh, row.away_team_mlb_id)
-            if home_pk is None or away_pk is None:
-                skipped += 1
-                continue
+        bound_rows = _bind_stage_rows(stage_rows, dimensions.get(sesh))
+        if len(bound_rows) < staged:
+            bound_rows = _bind_stage_rows(stage_rows, dimensions.fresh(sesh))
+        bound = len(bound_rows)
+        cur = sesh.connection().connection.cursor()
+        try:
+            with metrics.timed("sql_seconds", statement="games_stage_copy"):
+                cur.execute(_CREATE_GAME_STAGE)
+                _copy_rows(cur, "games_stage", _BOUND_STAGE_COLUMNS, bound_rows)
+            with metrics.timed("sql_seconds", statement="games_merge"):
+                cur.execute(_LOCK_CHANGING_GAMES)
+                changing = cur.fetchall()
+                cur.execute(_MERGE_GAMES)
+                written = cur.fetchall()
+        finally:
+            cur.close()
+        if written:
+            touched: dict[int, set] = {}
+            for season_id, home, away in changing + [r[2:] for r in written]:
+                touched.setdefault(season_id, set()).add((home, away))
+            with metrics.timed("sql_seconds", statement="head_to_head_refresh"):
+                for season_id in sorted(touched):
+                    _refresh_head_to_head(sesh, season_id, touched[season_id])
+            bump_data_version(sesh)
+        sesh.commit()
 
-            dicts.append({
-                "game_id": row.game_id,
-                "date": row.date,
-                "status": row.status,
-                "location": row.location,
-                "season_id": season_id_for(row.season_year),
-                "scheduled_start_time": row.scheduled_start_time,
-                "official_start_time": row.official_start_time,
-                "home_team_id": home_pk,
-                "away_team_id": away_pk,
-            })
+    counts["inserted"] = sum(1 for r in written if r[0])
+    counts["updated"] = len(written) - counts["inserted"]
+    # lets derived tables (standings) recompute only from the first changed day
+    counts["earliest_changed"] = min((r[1].date() for r in written), default=None)
+    counts["unchanged"] = bound - len(written)
+    counts["rejected"] = staged - bound
+    if counts["rejected"]:
+        print(f"Skipped {counts['rejected']} games due to missing season/team ids "
+              "(run `bootstrap` first to upsert teams/seasons).")
+    return counts
 
-        if not dicts:
-            if skipped:
-                print(f"Skipped {skipped} rows with missing team ids.")
-            return 0
-
-       
-        original_len = len(dicts)
-        dicts = _dedupe_by_game_id(dicts)
-        removed = original_len - len(dicts)
-        if removed:
-            print(f"Removed {removed} duplicate game_ids before upsert.")
-
-        total = 0
-        for i in range(0, len(dicts), CHUNK_SIZE):
-            chunk = dicts[i:i + CHUNK_SIZE]
-            insert_stmt = pg_insert(Game).values(chunk)
-            upsert_stmt = insert_stmt.on_conflict_do_update(
-                index_elements=[Game.game_id],
-                set_={
-                    "date": insert_stmt.excluded.date,
-                    "status": insert_stmt.excluded.status,
-                    "location": insert_stmt.excluded.location,
-                    "season_id": insert_stmt.excluded.season_id,
-                    "scheduled_start_time": insert_stmt.excluded.scheduled_start_time,
-                    "official_start_time": insert_stmt.excluded.official_start_time,
-                    "home_team_id": insert_stmt.excluded.home_team_id,
-                    "away_team_id": insert_stmt.excluded.away_team_id,
-                }
+def upsert_games(rows: Union[List[GameIn], pd.DataFrame]) -> int:
+    counts = merge_games(rows)
+    return counts["inserted"] + counts["updated"]
+
+def _refresh_head_to_head(sesh: Session, season_id: int, pairs: Optional[set] = None) -> None:
+    """Recompute a season's head-to-head cells from its games: those of the
+    given (unordered) team pairs, or the whole matrix."""
+    # one refresh per season at a time, so each sees the games the previous one committed
+    sesh.execute(text("SELECT pg_advisory_xact_lock(hashtext('team_head_to_head'), :season_id)"),
+                 {"season_id": season_id})
+    params: dict = {"season_id": season_id, "final": list(FINAL_STATUSES)}
+    cells = games = "TRUE"
+    if pairs is not None:
+        if not pairs:
+            return
+        params["pairs"] = [(min(a, b) << 32) | max(a, b) for a, b in pairs]
+        cells = _PAIR_KEY.format(a="team_id", b="opponent_id") + " = ANY(:pairs)"
+        games = _PAIR_KEY.format(a="g.home_team_id", b="g.away_team_id") + " = ANY(:pairs)"
+    sesh.execute(text(f"DELETE FROM team_head_to_head WHERE season_id = :season_id AND {cells}"), params)
+    sesh.execute(text(f"""
+INSERT INTO team_head_to_head (season_id, team_id, opponent_id, games, wins, losses, runs_for, runs_against)
+{_HEAD_TO_HEAD_SELECT.format(where=games)}
+"""), params)
+
+def rebuild_head_to_head(year: Optional[int] = None) -> int:
+    """Recompute the head-to-head matrix of one season, or of every season; returns cells written."""
+    with get_session() as sesh:
+        if year is not None:
+            season_ids = [_season_id_by_year(sesh, year)]
+        else:
+            season_ids = sorted(dimensions.get(sesh).season_pk.values())
+        for season_id in season_ids:
+            with metrics.timed("sql_seconds", statement="head_to_head_rebuild"):
+                _refresh_head_to_head(sesh, season_id)
+        cells = sesh.execute(text("SELECT count(*) FROM team_head_to_head WHERE season_id = ANY(:ids)"),
+                             {"ids": season_ids}).scalar()
+        bump_data_version(sesh)
+        sesh.commit()
+    return cells
+
+
+def get_watermark(source: str) -> Optional[dt.date]:
+    with get_session() as sesh:
+        return sesh.scalar(select(EtlWatermark.watermark).where(EtlWatermark.source == source))
+
+def set_watermark(source: str, value: dt.date) -> None:
+    with get_session() as sesh:
+        insert_stmt = pg_insert(EtlWatermark).values(
+            source=source, watermark=value, updated_at=dt.datetime.now(dt.timezone.utc).replace(tzinfo=None),
+        )
+        sesh.execute(insert_stmt.on_conflict_do_update(index_elements=[EtlWatermark.source], set_={
+            "watermark": insert_stmt.excluded.watermark,
+            "updated_at": insert_stmt.excluded.updated_at,
+        }))
+        sesh.commit()
+
+def open_game_pks(year: int, before: dt.date) -> List[int]:
+    """gamePks of a season's games dated before ``before`` that have not reached a terminal state."""
+    with get_session() as sesh:
+        season_id = _season_pk(sesh, year)
+        if season_id is None:
+            return []
+        stmt = (
+            select(Game.game_id)
+            .where(
+                Game.season_id == season_id,
+                Game.date < dt.datetime.combine(before, dt.time()),
+                or_(Game.status.is_(None), Game.status.not_in(FINAL_STATUSES + TERMINAL_STATUSES)),
             )
-            sesh.execute(upsert_stmt)
-            sesh.commit()
-            total += len(chunk)
+            .order_by(Game.date, Game.id)
+        )
+        return list(sesh.scalars(stmt))
+
+
+def games_needing_boxscores(year: int, force: bool = False,
+                            since: Optional[dt.date] = None) -> List[tuple[int, int]]:
+    """(games.id, gamePk) for final games of a season, oldest first.
+
+    Games that already have stat lines are skipped unless ``force`` is set:
+    boxscores are only ingested once a game is final, so existing lines are final too.
+    """
+    with get_session() as sesh:
+        season_id = _season_pk(sesh, year)
+        if season_id is None:
+            return []
+        stmt = (
+            select(Game.id, Game.game_id)
+            .where(Game.season_id == season_id, Game.status.in_(FINAL_STATUSES))
+            .order_by(Game.date, Game.id)
+        )
+        if since is not None:
+            stmt = stmt.where(Game.date >= dt.datetime.combine(since, dt.time()))
+        if not force:
+            stmt = stmt.where(~exists().where(BatterGameStats.game_id == Game.id,
+                                              BatterGameStats.season_id == Game.season_id))
+        return [(gid, pk) for gid, pk in sesh.execute(stmt)]
+
+
+_BATTING_SUMS = (
+    "at_bats", "hits", "doubles", "triples", "home_runs", "rbis", "runs_scored",
+    "walks", "strikeouts", "stolen_bases", "caught_stealing",
+)
+_PITCHING_SUMS = (
+    "hits_allowed", "earned_runs", "strikeouts", "walks", "home_runs_allowed", "pitches_thrown",
+)
+
+def _rollup_select(lines_table: str, sums: Sequence[str], extra: dict[str, str], sign: str) -> str:
+    exprs = {"games": "count(*)", **extra, **{c: f"sum(l.{c})" for c in sums}}
+    cols = ", ".join(exprs)
+    values = ", ".join(f"{sign}{e}" for e in exprs.values())
+    return f"""
+SELECT l.player_id, l.season_id, l.team_id, {values}
+FROM {lines_table} l
+WHERE {{where}} AND l.team_id IS NOT NULL
+GROUP BY l.player_id, l.season_id, l.team_id
+ORDER BY l.player_id, l.season_id, l.team_id
+""", cols
+
+def _rollup_specs():
+    return (
+        ("player_batting_seasons", "batter_game_stats", _BATTING_SUMS, {}),
+        ("player_pitching_seasons", "pitcher_game_stats", _PITCHING_SUMS,
+         {"outs": "sum(round(l.innings_pitched * 3))::integer"}),
+    )
+
+def _apply_rollup_delta(sesh: Session, game_ids: List[int], season_ids: List[int], sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) these games' stat lines from the season rollups."""
+    for rollup, lines, sums, extra in _rollup_specs():
+        select_sql, cols = _rollup_select(lines, sums, extra, "-" if sign < 0 else "")
+        updates = ", ".join(f"{c} = r.{c} + EXCLUDED.{c}" for c in cols.split(", "))
+        sesh.execute(text(f"""
+INSERT INTO {rollup} AS r (player_id, season_id, team_id, {cols})
+{select_sql.format(where="l.season_id = ANY(:season_ids) AND l.game_id = ANY(:game_ids)")}
+ON CONFLICT (player_id, season_id, team_id) DO UPDATE SET {updates}
+"""), {"game_ids": game_ids, "season_ids": season_ids})
+        if sign < 0:
+            sesh.execute(text(f"DELETE FROM {rollup} WHERE season_id = ANY(:season_ids) AND games <= 0"),
+                         {"season_ids": season_ids})
+
+def rebuild_rollups(year: Optional[int] = None) -> dict:
+    """Recompute season rollups from the stat lines, for one season or all of them."""
+    counts = {}
+    with get_session() as sesh:
+        season_ids = None
+        if year is not None:
+            season_ids = [_season_id_by_year(sesh, year)]
+        for rollup, lines, sums, extra in _rollup_specs():
+            select_sql, cols = _rollup_select(lines, sums, extra, "")
+            params: dict = {}
+            where = "TRUE"
+            if season_ids is not None:
+                where = "l.season_id = ANY(:season_ids)"
+                params["season_ids"] = season_ids
+                sesh.execute(text(f"DELETE FROM {rollup} WHERE season_id = ANY(:season_ids)"), params)
+            else:
+                sesh.execute(text(f"DELETE FROM {rollup}"))
+            with metrics.timed("sql_seconds", statement="rollup_rebuild"):
+                res = sesh.execute(text(f"""
+INSERT INTO {rollup} (player_id, season_id, team_id, {cols})
+{select_sql.format(where=where)}
+"""), params)
+            counts[rollup] = res.rowcount
+        bump_data_version(sesh)
+        sesh.commit()
+    return counts
+
+
+def load_boxscores(boxes: List[BoxscoreIn], year: int) -> dict:
+    """Write a batch of mapped boxscores of one season in one transaction.
+
+    Players are upserted in one statement, each game's previous stat lines are
+    replaced wholesale (so a reloaded, corrected boxscore is idempotent), and
+    the boxscore-only Game columns are filled with a bulk update by PK. Season
+    rollups get the difference between the old and new lines in the same
+    transaction, so they stay correct when a corrected boxscore is reloaded.
+    """
+    counts = {"games": 0, "players": 0, "batters": 0, "pitchers": 0, "fielders": 0}
+    if not boxes:
+        return counts
+
+    with get_session() as sesh:
+        game_pks = [b.game_pk for b in boxes]
+        season_id = _season_id_by_year(sesh, year)
+        game_map = {pk: (gid, sid) for pk, gid, sid in sesh.execute(
+            select(Game.game_id, Game.id, Game.season_id)
+            .where(Game.season_id == season_id, Game.game_id.in_(game_pks))
+        )}
+        team_map = dimensions.get(sesh).team_pk
+
+        players: dict[int, dict] = {}
+        batters: dict[tuple, dict] = {}
+        pitchers: dict[tuple, dict] = {}
+        fielders: dict[tuple, dict] = {}
+        game_updates: List[dict] = []
+        for box in boxes:
+            if box.game_pk not in game_map:
+                continue
+            gid, sid = game_map[box.game_pk]
+            for p in box.players:
+                # later games win, so a traded player ends up on the newest team
+                players[p.id] = {
+                    "id": p.id,
+                    "name": p.name,
+                    "position": p.position,
+                    "team_id": team_map.get(p.team_mlb_id),
+                }
+            for lines, out in ((box.batters, batters), (box.pitchers, pitchers), (box.fielders, fielders)):
+                # (player_id, game_id) is unique; a player listed twice keeps the later line
+                out.update(
+                    ((line.player_id, gid), {**line.model_dump(exclude={"team_mlb_id"}), "game_id": gid,
+                                             "season_id": sid, "team_id": team_map.get(line.team_mlb_id)})
+                    for line in lines
+                )
+            game_updates.append({
+                "id": gid,
+                "season_id": sid,
+                "game_duration": box.game_duration,
+                "temperature": box.temperature,
+                "weather_condition": box.weather_condition,
+                "wind": box.wind,
+            })
+
+        if not game_updates:
+            return counts
+        game_ids = [g["id"] for g in game_updates]
+        season_ids = sorted({g["season_id"] for g in game_updates})
+
+        if players:
+            # key order, like the rollup upserts: concurrent batches then lock rows in
+            # the same order and wait on each other instead of deadlocking
+            insert_stmt = pg_insert(Player).values([players[k] for k in sorted(players)])
+            with metrics.timed("sql_seconds", statement="players_upsert"):
+                sesh.execute(insert_stmt.on_conflict_do_update(index_elements=[Player.id], set_={
+                    "name": insert_stmt.excluded.name,
+                    "position": insert_stmt.excluded.position,
+                    "team_id": insert_stmt.excluded.team_id,
+                }))
+
+        # back out whatever these games contributed before, then add the new lines
+        with metrics.timed("sql_seconds", statement="rollup_delta"):
+            _apply_rollup_delta(sesh, game_ids, season_ids, -1)
+        with metrics.timed("sql_seconds", statement="stat_lines_replace"):
+            for model, lines in ((BatterGameStats, batters), (PitcherGameStats, pitchers), (FielderGameStats, fielders)):
+                sesh.execute(delete(model).where(model.season_id.in_(season_ids), model.game_id.in_(game_ids)))
+                if lines:
+                    sesh.execute(insert(model), list(lines.values()))
+        with metrics.timed("sql_seconds", statement="rollup_delta"):
+            _apply_rollup_delta(sesh, game_ids, season_ids, 1)
+
+        with metrics.timed("sql_seconds", statement="games_boxscore_update"):
+            sesh.execute(update(Game), game_updates)
+        bump_data_version(sesh)
+        sesh.commit()
 
-        if skipped:
-            print(f"Skipped {skipped} rows with missing team ids.")
-        return total
+    counts.update(games=len(game_updates), players=len(players), batters=len(batters),
+                  pitchers=len(pitchers), fielders=len(fielders))
+    return counts
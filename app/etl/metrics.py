@@ -0,0 +1,219 @@
+"""Stage timers, counters and histograms for ETL runs.
+
+Off by default: every entry point checks one module flag and returns, and
+``stage()`` hands back a shared no-op object, so instrumented code costs a
+function call when nothing is collecting. ``enable()`` turns collection on;
+optional Sentry spans come from the pinned sentry-sdk when a DSN is given.
+"""
+from __future__ import annotations
+import bisect
+import datetime as dt
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = False
+_sentry = None  # the sentry_sdk module once initialised
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Tuple], float] = {}
+_histograms: Dict[Tuple[str, Tuple], List[float]] = {}  # bucket counts + [sum, count]
+_stages: List[Dict[str, Any]] = []
+_run: Dict[str, Any] = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(command: str, sentry_dsn: Optional[str] = None) -> None:
+    global _enabled, _sentry
+    _enabled = True
+    _run.update(command=command, started_at=dt.datetime.now(dt.timezone.utc), _t0=time.perf_counter())
+    if sentry_dsn:
+        try:
+            import sentry_sdk
+        except ImportError:
+            print("sentry-sdk is not installed; spans disabled")
+        else:
+            sentry_sdk.init(dsn=sentry_dsn, traces_sample_rate=1.0)
+            _sentry = sentry_sdk
+            _run["_txn"] = sentry_sdk.start_transaction(op="etl", name=command)
+            _run["_txn"].__enter__()
+
+
+def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Add one observation to a latency histogram (seconds)."""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            h = _histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0, 0]
+        h[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        h[-2] += value
+        h[-1] += 1
+
+
+@contextmanager
+def timed(name: str, **labels):
+    """Time a block into the ``name`` histogram, e.g. one SQL statement batch."""
+    if not _enabled:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t0, **labels)
+
+
+class Stage:
+    __slots__ = ("name", "labels", "rows_in", "rows_out", "rejected")
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels = labels
+        self.rows_in = self.rows_out = self.rejected = 0
+
+    def add(self, rows_in: int = 0, rows_out: int = 0, rejected: int = 0) -> None:
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+        self.rejected += rejected
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def add(self, rows_in: int = 0, rows_out: int = 0, rejected: int = 0) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+@contextmanager
+def stage(name: str, **labels):
+    """One ETL stage: wall time plus rows in/out/rejected, recorded in the run report."""
+    if not _enabled:
+        yield _NULL_STAGE
+        return
+    st = Stage(name, labels)
+    span = _sentry.start_span(op="etl.stage", name=name) if _sentry is not None else None
+    if span is not None:
+        span.__enter__()
+    t0 = time.perf_counter()
+    try:
+        yield st
+    finally:
+        seconds = time.perf_counter() - t0
+        if span is not None:
+            for k, v in (("rows_in", st.rows_in), ("rows_out", st.rows_out), ("rejected", st.rejected)):
+                span.set_data(k, v)
+            span.__exit__(None, None, None)
+        with _lock:
+            _stages.append({"stage": name, **labels, "seconds": round(seconds, 6),
+                            "rows_in": st.rows_in, "rows_out": st.rows_out, "rejected": st.rejected})
+        observe("etl_stage_seconds", seconds, stage=name)
+        inc("etl_rows_in_total", st.rows_in, stage=name)
+        inc("etl_rows_out_total", st.rows_out, stage=name)
+        inc("etl_rows_rejected_total", st.rejected, stage=name)
+
+
+def report() -> Dict[str, Any]:
+    """The run as a JSON-serialisable dict: stages in order plus metric snapshots."""
+    with _lock:
+        counters = [{"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(_counters.items())]
+        histograms = []
+        for (n, l), h in sorted(_histograms.items()):
+            histograms.append({
+                "name": n, "labels": dict(l), "count": h[-1], "sum": round(h[-2], 6),
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], h[:-2])),
+            })
+        stages = list(_stages)
+    started = _run.get("started_at")
+    return {
+        "command": _run.get("command"),
+        "started_at": started.isoformat(timespec="seconds") if started else None,
+        "seconds": round(time.perf_counter() - _run["_t0"], 6) if "_t0" in _run else None,
+        "stages": stages,
+        "counters": counters,
+        "histograms": histograms,
+    }
+
+
+def _prom_labels(labels: Tuple, extra: Tuple = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _prom_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def prometheus_text() -> str:
+    """Counters and histograms in the Prometheus text exposition format."""
+    lines: List[str] = []
+    with _lock:
+        typed = set()
+        for (name, labels), value in sorted(_counters.items()):
+            metric = f"mlb_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_prom_labels(labels)} {_prom_value(value)}")
+        for (name, labels), h in sorted(_histograms.items()):
+            metric = f"mlb_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, count in zip([f"{b:g}" for b in LATENCY_BUCKETS] + ["+Inf"], h[:-2]):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_prom_labels(labels, (('le', bound),))} {cumulative}")
+            lines.append(f"{metric}_sum{_prom_labels(labels)} {h[-2]:.6f}")
+            lines.append(f"{metric}_count{_prom_labels(labels)} {h[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def _write(path: str, data: str) -> None:
+    # whole-file replace, so a textfile collector never reads a partial file
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def finish(report_path: Optional[str] = None, metrics_path: Optional[str] = None) -> None:
+    """Close the Sentry transaction and write the JSON report / Prometheus textfile."""
+    if not _enabled:
+        return
+    txn = _run.pop("_txn", None)
+    if txn is not None:
+        txn.__exit__(None, None, None)
+        _sentry.flush()
+    if report_path:
+        _write(report_path, json.dumps(report(), indent=2))
+    if metrics_path:
+        _write(metrics_path, prometheus_text())
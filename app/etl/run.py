@@ -1,22 +1,27 @@
 from __future__ import annotations
 import argparse
 import datetime as dt
+import os
 from typing import List
 
-from app.db.session import SessionLocal
-from app.etl import fetch_data, transform
-from app.etl.bridge import bind_games_fks
-from app.etl.fetch_data import get_schedule_for_season, get_teams
-from app.etl.transform import map_games_from_schedule, map_team, build_seasons
-from app.etl.load import upsert_games, upsert_seasons, upsert_teams
+# only argparse and metrics at import time: each subcommand imports the
+# modules it runs (and with them SQLAlchemy, pandas, httpx) when it is chosen
+from app.etl import metrics
 
 def cmd_bootstrap(args):
+        from app.etl.fetch_data import get_teams
+        from app.etl.load import upsert_seasons, upsert_teams
+        from app.etl.transform import build_seasons, map_team
         print("-> Fetching teams...")
-        teams_raw = get_teams(active_only=True)
+        with metrics.stage("fetch_teams") as st:
+            teams_raw = get_teams(active_only=True)
+            st.add(rows_out=len(teams_raw))
         teams = [map_team(t) for t in teams_raw]
         if len(teams) < 30:
             raise RuntimeError(f"Expected at least 30 MLB teams, got {len(teams)}")
-        upserted_teams = upsert_teams(teams)
+        with metrics.stage("load_teams") as st:
+            upserted_teams = upsert_teams(teams)
+            st.add(rows_in=len(teams), rows_out=upserted_teams)
         print(f"Upserted {upserted_teams} teams")
 
         current_year = dt.date.today().year
@@ -25,58 +30,459 @@ def cmd_bootstrap(args):
         expected = current_year - 2016 + 1
         if len (seasons) != expected:
             print(f"Warning: built {len(seasons)} seasons, expected {expected}")
-        upserted_seasons = upsert_seasons(seasons)
+        with metrics.stage("load_seasons") as st:
+            upserted_seasons = upsert_seasons(seasons)
+            st.add(rows_in=len(seasons), rows_out=upserted_seasons)
         print(f"Upserted {upserted_seasons} seasons (idempotent)")
 
 def cmd_season(args):
+    from app.etl import transform
+    from app.etl.fetch_data import get_schedule_for_season
     year = args.year
         # 1) EXTRACT
-    schedule = fetch_data.fetch_season_schedule(year)  # list of date buckets
+    with metrics.stage("fetch_schedule", season=year) as st:
+        schedule = get_schedule_for_season(year, workers=args.workers)  # list of date buckets
 
-        # nice-to-have stats
-    total_days = len(schedule)
-    total_games = sum(len(d.get("games", [])) for d in schedule)
+            # nice-to-have stats
+        total_days = len(schedule)
+        total_games = sum(len(d.get("games", [])) for d in schedule)
+        st.add(rows_out=total_games)
     print(f"Fetched {total_days} days, {total_games} games from API")
 
         # 2) TRANSFORM (API → typed rows with external ids)
-    game_ins = transform.map_games_from_schedule(schedule, year)
-    print(f"Mapped {len(game_ins)} games to GameIn rows")
+    with metrics.stage("transform_games", season=year) as st:
+        if args.rows:
+            game_ins = transform.map_games_from_schedule(schedule, year)
+            print(f"Mapped {len(game_ins)} games to GameIn rows")
+        else:
+            game_ins = transform.map_games_columnar(schedule, year)
+            print(f"Mapped {len(game_ins)} games to columnar rows")
+        st.add(rows_in=total_games, rows_out=len(game_ins))
 
-        # 3) BRIDGE (bind external ids → internal FK ids)
-    bound_rows, rejected = bind_games_fks(game_ins)
-    if rejected:
-        print(
-            f"Skipped {len(rejected)} games due to missing season/team ids "
-            "(run `bootstrap` first to upsert teams/seasons)."
-        )
+        # 3) BRIDGE + 4) LOAD: bind season/team FKs from the dimension cache,
+        # stage rows with COPY and merge into games in a single transaction
+    counts = _merge_games(game_ins, year)
+    print(
+        f"Upserted {counts['inserted'] + counts['updated']} games for {year} "
+        f"({counts['inserted']} new, {counts['updated']} changed, {counts['unchanged']} unchanged)."
+    )
+    _refresh_standings(year, counts["earliest_changed"])
 
-    # 4) LOAD (ready-to-insert rows)
-    upserted = upsert_games(bound_rows)
-    print(f"Upserted {upserted} games for {year}.")
+
+def _merge_games(games, year: int) -> dict:
+    from app.etl.load import merge_games
+    with metrics.stage("load_games", season=year) as st:
+        counts = merge_games(games)
+        st.add(rows_in=len(games), rows_out=counts["inserted"] + counts["updated"],
+               rejected=counts["rejected"])
+    return counts
+
+
+def _refresh_standings(year: int, since) -> None:
+    from app.etl.standings import compute_standings
+    if since is None:
+        return
+    with metrics.stage("standings", season=year) as st:
+        counts = compute_standings(year, from_date=since)
+        st.add(rows_out=counts["team_records"] + counts["snapshots"])
+    print(f"Standings for {year} from {since}: {counts['team_records']} team records, "
+          f"{counts['snapshots']} snapshots.")
+
+
+def cmd_standings(args):
+    from app.etl.standings import compute_standings
+    since = dt.date.fromisoformat(args.since) if args.since else None
+    counts = compute_standings(args.year, from_date=since)
+    print(f"Standings for {args.year}: {counts['team_records']} team records, "
+          f"{counts['snapshots']} snapshots.")
+
+
+def _load_boxscores(year: int, todo: List[tuple[int, int]], workers, batch_size: int) -> dict:
+    from app.etl import fetch_data, transform
+    from app.etl.load import load_boxscores
+    totals = {"games": 0, "players": 0, "batters": 0, "pitchers": 0, "fielders": 0}
+    for i in range(0, len(todo), batch_size):
+        batch = todo[i:i + batch_size]
+        with metrics.stage("fetch_boxscores") as st:
+            payloads = fetch_data.get_boxscores([pk for _, pk in batch], workers=workers, season=year)
+            fetched = sum(p is not None for p in payloads)
+            st.add(rows_in=len(batch), rows_out=fetched, rejected=len(batch) - fetched)
+        with metrics.stage("transform_boxscores") as st:
+            boxes = [
+                transform.map_boxscore(payload, pk)
+                for (_, pk), payload in zip(batch, payloads)
+                if payload is not None
+            ]
+            st.add(rows_in=fetched, rows_out=len(boxes))
+        with metrics.stage("load_boxscores") as st:
+            counts = load_boxscores(boxes, year)
+            st.add(rows_in=len(boxes), rows_out=counts["batters"] + counts["pitchers"] + counts["fielders"],
+                   rejected=len(boxes) - counts["games"])
+        for k, v in counts.items():
+            totals[k] += v
+        print(f"  {min(i + batch_size, len(todo))}/{len(todo)} games processed")
+    return totals
+
+
+def cmd_boxscores(args):
+    from app.etl.load import games_needing_boxscores
+    year = args.year
+    todo = games_needing_boxscores(year, force=args.force)
+    print(f"-> {len(todo)} final games in {year} need boxscores")
+
+    totals = _load_boxscores(year, todo, args.workers, args.batch_size)
+    print(
+        f"Loaded boxscores for {totals['games']} games: {totals['batters']} batting, "
+        f"{totals['pitchers']} pitching, {totals['fielders']} fielding lines "
+        f"({totals['players']} player upserts)."
+    )
+    if totals["games"]:
+        _refresh_leaders(year)
+        _refresh_team_history(year)
+        _refresh_splits(year)
+
+
+def _refresh_leaders(year: int) -> None:
+    from app.etl.leaders import rebuild_leaders
+    with metrics.stage("leaders", season=year) as st:
+        counts = rebuild_leaders(year)
+        st.add(rows_out=counts["entries"])
+    print(f"Leaderboards for {year}: {counts['entries']} entries "
+          "(qualifying on each player's team games).")
+
+
+def cmd_leaders(args):
+    _refresh_leaders(args.year)
+
+
+def _refresh_team_history(year) -> None:
+    from app.etl.team_history import rebuild_team_history
+    with metrics.stage("team_history", season=year) as st:
+        counts = rebuild_team_history(year)
+        st.add(rows_in=counts["appearances"], rows_out=counts["stints"])
+    scope = f"players of {year}" if year else "all players"
+    print(f"Team history for {scope}: {counts['stints']} stints for {counts['players']} players.")
+
+
+def cmd_history(args):
+    _refresh_team_history(args.season)
+
+
+def _refresh_splits(year: int, since=None) -> None:
+    from app.etl.splits import compute_splits
+    with metrics.stage("splits", season=year) as st:
+        counts = compute_splits(year, from_date=since)
+        st.add(rows_out=counts["batting"] + counts["pitching"])
+    scope = f" from {since}" if since else ""
+    print(f"Rolling splits for {year}{scope}: {counts['batting']} batting, "
+          f"{counts['pitching']} pitching rows.")
+
+
+def cmd_splits(args):
+    since = dt.date.fromisoformat(args.since) if args.since else None
+    _refresh_splits(args.year, since)
+
+
+def cmd_rollups(args):
+    from app.etl.load import rebuild_rollups
+    scope = f"season {args.season}" if args.season else "all seasons"
+    print(f"-> Rebuilding player season rollups for {scope}..")
+    with metrics.stage("rollups") as st:
+        counts = rebuild_rollups(args.season)
+        st.add(rows_out=sum(counts.values()))
+    for table, n in counts.items():
+        print(f"  {table}: {n} rows")
+    if args.season:
+        _refresh_leaders(args.season)
+
+
+def cmd_head_to_head(args):
+    from app.etl.load import rebuild_head_to_head
+    scope = f"season {args.season}" if args.season else "all seasons"
+    print(f"-> Rebuilding the team head-to-head matrix for {scope}..")
+    with metrics.stage("head_to_head") as st:
+        cells = rebuild_head_to_head(args.season)
+        st.add(rows_out=cells)
+    print(f"  team_head_to_head: {cells} rows")
 
 
 def cmd_daily(args):
+    from app.etl import fetch_data, transform
+    from app.etl.load import games_needing_boxscores, get_watermark, open_game_pks, set_watermark
     today = dt.date.today()
     yesterday = today - dt.timedelta(days=1)
     tomorrow = today + dt.timedelta(days=1)
     year = today.year
-    print(f"(Daily) refreshing games for {year} (basic mode)..")
+
+    # resume from the watermark so a skipped day is caught up, never before Jan 1
+    watermark = get_watermark("schedule")
+    start = yesterday
+    if watermark is not None and watermark + dt.timedelta(days=1) < start:
+        start = watermark + dt.timedelta(days=1)
+    start = max(start, dt.date(year, 1, 1))
+    print(f"(Daily) refreshing {start} .. {tomorrow} plus unfinished games for {year}..")
+
+    with metrics.stage("fetch_schedule", season=year) as st:
+        schedule = fetch_data.get_schedule_range(start, tomorrow)
+        open_pks = open_game_pks(year, before=start)
+        if open_pks:
+            print(f"-> {len(open_pks)} earlier games not final yet; re-fetching them")
+            schedule += fetch_data.get_schedule_for_games(open_pks)
+        total_games = sum(len(d.get("games", [])) for d in schedule)
+        st.add(rows_out=total_games)
+
+    with metrics.stage("transform_games", season=year) as st:
+        games = transform.map_games_columnar(schedule, year)
+        st.add(rows_in=total_games, rows_out=len(games))
+    counts = _merge_games(games, year)
+    print(
+        f"Daily games: {counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['unchanged']} unchanged, {counts['rejected']} rejected."
+    )
+    _refresh_standings(year, counts["earliest_changed"])
+
+    if not args.skip_boxscores:
+        since = min([start] + [dt.date.fromisoformat(d[:10]) for d in games["date"]])
+        todo = games_needing_boxscores(year, since=since)
+        if todo:
+            totals = _load_boxscores(year, todo, None, 100)
+            print(f"Loaded boxscores for {totals['games']} newly final games.")
+            if totals["games"]:
+                _refresh_leaders(year)
+                _refresh_team_history(year)
+                # windows only move forward: the days before the new games keep their rows
+                _refresh_splits(year, since)
+
+    set_watermark("schedule", yesterday)
+
+def cmd_reload(args):
+    from app.db import partitions
+    from app.etl import transform
+    from app.etl.fetch_data import get_schedule_for_season
+    from app.etl.load import games_needing_boxscores
+    year = args.year
+    # the live partitions keep serving reads until the swap
+    print(f"(Reload) loading {year} into schema {partitions.shadow_schema(year)}..")
+    partitions.create_shadow(year)
+    with partitions.shadow(year):
+        with metrics.stage("fetch_schedule", season=year) as st:
+            schedule = get_schedule_for_season(year, workers=args.workers)
+            total_games = sum(len(d.get("games", [])) for d in schedule)
+            st.add(rows_out=total_games)
+        with metrics.stage("transform_games", season=year) as st:
+            games = transform.map_games_columnar(schedule, year)
+            st.add(rows_in=total_games, rows_out=len(games))
+        counts = _merge_games(games, year)
+        if not args.skip_boxscores:
+            _load_boxscores(year, games_needing_boxscores(year), args.workers, args.batch_size)
+    with metrics.stage("swap_partitions", season=year) as st:
+        swapped = partitions.swap_season(year)
+        st.add(rows_out=sum(swapped.values()))
+    print(f"Swapped in {swapped['games']} games ({counts['rejected']} rejected) and "
+          f"{swapped['batter_game_stats']} batting, {swapped['pitcher_game_stats']} pitching, "
+          f"{swapped['fielder_game_stats']} fielding lines for {year}.")
+    _refresh_standings(year, dt.date(year, 1, 1))
+    _refresh_leaders(year)
+    _refresh_team_history(year)
+    _refresh_splits(year)
+
+
+def cmd_snapshot(args):
+    from app.etl.snapshot import export_snapshots
+    years = [args.season] if args.season else None
+    with metrics.stage("snapshot") as st:
+        results = export_snapshots(years, root=args.dir, force=args.force)
+        st.add(rows_in=len(results), rows_out=sum(1 for r in results.values() if r is not None))
+    for year, rows in results.items():
+        if rows is None:
+            print(f"  {year}: unchanged")
+        else:
+            print(f"  {year}: " + ", ".join(f"{n} {t}" for t, n in rows.items()))
+
+
+def cmd_archive(args):
+    from app.etl import archive
+    rows = archive.summary()
+    if not rows:
+        print(f"Nothing archived under {archive.ARCHIVE_DIR}.")
+    for r in rows:
+        print(f"{r['endpoint']:<10} {r['season']}  {r['keys']:>6} payloads  {r['bytes'] / 1e6:8.1f} MB")
+
+
+def cmd_live(args):
+    from app.etl import live
+    day = dt.date.fromisoformat(args.date) if args.date else None
+    live.run(day, watch=args.watch)
+
+
+def cmd_backfill_plan(args):
+    from app.etl import backfill
+    last = args.last or args.first
+    added = backfill.plan(args.first, last, batch_size=args.batch_size, window_days=args.window_days,
+                          max_attempts=args.max_attempts, replan=args.replan)
+    print(f"Queued {added} new backfill jobs for {args.first}-{last}.")
+
+
+def cmd_backfill_work(args):
+    from app.etl import backfill
+    backfill.run_workers(args.processes, wait=args.wait, fetch_workers=args.workers)
+
+
+def cmd_backfill_status(args):
+    from app.etl import backfill
+    rows = backfill.status()
+    if not rows:
+        print("No backfill jobs queued.")
+    for r in rows:
+        line = f"{r['season']}  {r['kind']:<15} {r['status']:<8} {r['jobs']:>5}"
+        if r["missing"]:
+            line += f"  {r['missing']} boxscores missing"
+        if r["error"]:
+            line += f"  last error: {r['error'][:120]}"
+        print(line)
+
+
+def cmd_backfill_retry(args):
+    from app.etl import backfill
+    print(f"Reset {backfill.retry_failed(args.season)} failed jobs to pending.")
+
 
 def main():
      argpars = argparse.ArgumentParser("MLB ETL runner")
+     argpars.add_argument("--offline", action="store_true",
+                          help="Serve StatsAPI calls from the HTTP cache only; fail on a miss")
+     argpars.add_argument("--no-cache", action="store_true",
+                          help="Bypass the on-disk HTTP response cache")
+     argpars.add_argument("--replay", action="store_true",
+                          help="Serve StatsAPI payloads from the raw archive (MLB_ARCHIVE_DIR) instead of "
+                               "the network, e.g. `--replay reload 2021` to re-derive a season")
+     argpars.add_argument("--report", default=os.getenv("MLB_ETL_REPORT"),
+                          help="Write a JSON run report (per-stage timings, rows, HTTP/SQL metrics) here")
+     argpars.add_argument("--metrics", default=os.getenv("MLB_ETL_METRICS"),
+                          help="Write Prometheus text-format metrics here (e.g. a node_exporter textfile)")
+     argpars.add_argument("--sentry-dsn", default=os.getenv("SENTRY_DSN"),
+                          help="Send the run and its stages to Sentry as a transaction with spans")
      subcmd = argpars.add_subparsers(dest="cmd", required=True)
      boot = subcmd.add_parser("bootstrap", help="Upsert teams + seasons")
      boot.set_defaults(func=cmd_bootstrap)
 
      season_sub = subcmd.add_parser("season", help="Load/refresh games for a season")
      season_sub.add_argument("year", type=int)
+     season_sub.add_argument("--workers", type=int, default=None,
+                             help="Concurrent schedule requests (default MLB_FETCH_WORKERS)")
+     season_sub.add_argument("--rows", action="store_true",
+                             help="Use the per-row GameIn transform instead of the columnar one")
      season_sub.set_defaults(func=cmd_season)
 
-     daily_sub = subcmd.add_parser("daily", help="Basic daily refresh (placeholder)")
+     box_sub = subcmd.add_parser("boxscores", help="Load per-game player stats for a season's final games")
+     box_sub.add_argument("year", type=int)
+     box_sub.add_argument("--workers", type=int, default=None,
+                          help="Concurrent boxscore requests (default MLB_FETCH_WORKERS)")
+     box_sub.add_argument("--batch-size", type=int, default=100,
+                          help="Games fetched and written per transaction")
+     box_sub.add_argument("--force", action="store_true",
+                          help="Reload games that already have stat lines")
+     box_sub.set_defaults(func=cmd_boxscores)
+
+     roll_sub = subcmd.add_parser("rollups", help="Rebuild player season rollups from stat lines (repair)")
+     roll_sub.add_argument("--season", type=int, default=None, help="Only this season year")
+     roll_sub.set_defaults(func=cmd_rollups)
+
+     h2h_sub = subcmd.add_parser("head-to-head", help="Rebuild the team head-to-head matrix from games (repair)")
+     h2h_sub.add_argument("--season", type=int, default=None, help="Only this season year")
+     h2h_sub.set_defaults(func=cmd_head_to_head)
+
+     hist_sub = subcmd.add_parser("history", help="Rebuild player team stints from game appearances")
+     hist_sub.add_argument("--season", type=int, default=None,
+                           help="Only players who appeared in this season year")
+     hist_sub.set_defaults(func=cmd_history)
+
+     split_sub = subcmd.add_parser("splits", help="Recompute rolling last-N-days/games player splits")
+     split_sub.add_argument("year", type=int)
+     split_sub.add_argument("--since", default=None,
+                            help="Only rewrite days from this date (YYYY-MM-DD); default whole season")
+     split_sub.set_defaults(func=cmd_splits)
+
+     stand_sub = subcmd.add_parser("standings", help="Recompute team records + standings snapshots")
+     stand_sub.add_argument("year", type=int)
+     stand_sub.add_argument("--since", default=None,
+                            help="Only rewrite days from this date (YYYY-MM-DD); default whole season")
+     stand_sub.set_defaults(func=cmd_standings)
+
+     lead_sub = subcmd.add_parser("leaders", help="Rebuild a season's stat leaderboards from the rollups")
+     lead_sub.add_argument("year", type=int)
+     lead_sub.set_defaults(func=cmd_leaders)
+
+     daily_sub = subcmd.add_parser("daily", help="Incremental refresh around today since the last watermark")
+     daily_sub.add_argument("--skip-boxscores", action="store_true",
+                            help="Only refresh games, not stats of newly final games")
      daily_sub.set_defaults(func=cmd_daily)
 
+     reload_sub = subcmd.add_parser("reload", help="Reload a season into new partitions and swap them in")
+     reload_sub.add_argument("year", type=int)
+     reload_sub.add_argument("--workers", type=int, default=None,
+                             help="Concurrent schedule/boxscore requests (default MLB_FETCH_WORKERS)")
+     reload_sub.add_argument("--batch-size", type=int, default=100,
+                             help="Games fetched and written per transaction")
+     reload_sub.add_argument("--skip-boxscores", action="store_true",
+                             help="Reload the schedule only (the season's stat lines are emptied)")
+     reload_sub.set_defaults(func=cmd_reload)
+
+     snap_sub = subcmd.add_parser("snapshot", help="Export per-season columnar snapshots for analysis")
+     snap_sub.add_argument("--season", type=int, default=None, help="Only this season year")
+     snap_sub.add_argument("--dir", default=None, help="Snapshot root (default MLB_SNAPSHOT_DIR or ./snapshots)")
+     snap_sub.add_argument("--force", action="store_true", help="Re-export seasons that did not change")
+     snap_sub.set_defaults(func=cmd_snapshot)
+
+     arch_sub = subcmd.add_parser("archive", help="List the raw payload archive's segments")
+     arch_sub.set_defaults(func=cmd_archive)
+
+     live_sub = subcmd.add_parser("live", help="Poll in-progress games, write changes and push deltas")
+     live_sub.add_argument("--date", default=None, help="Slate date (YYYY-MM-DD); default today")
+     live_sub.add_argument("--watch", action="store_true",
+                           help="Keep running and move on to each next day's slate")
+     live_sub.set_defaults(func=cmd_live)
+
+     back_sub = subcmd.add_parser("backfill", help="Resumable multi-worker backfill over a Postgres job queue")
+     back_cmd = back_sub.add_subparsers(dest="action", required=True)
+     plan_sub = back_cmd.add_parser("plan", help="Queue schedule, boxscore and derive jobs for seasons")
+     plan_sub.add_argument("first", type=int)
+     plan_sub.add_argument("last", type=int, nargs="?", default=None, help="Last season (default: first)")
+     plan_sub.add_argument("--batch-size", type=int, default=100, help="Games per boxscore job")
+     plan_sub.add_argument("--window-days", type=int, default=28, help="Days per schedule job")
+     plan_sub.add_argument("--max-attempts", type=int, default=5)
+     plan_sub.add_argument("--replan", action="store_true",
+                           help="Drop the seasons' existing (non-running) jobs first")
+     plan_sub.set_defaults(func=cmd_backfill_plan)
+     work_sub = back_cmd.add_parser("work", help="Claim and run jobs until the queue is drained")
+     work_sub.add_argument("--processes", type=int, default=1, help="Worker processes on this machine")
+     work_sub.add_argument("--workers", type=int, default=None,
+                           help="Concurrent boxscore requests per process (default MLB_FETCH_WORKERS)")
+     work_sub.add_argument("--wait", action="store_true", help="Keep polling for new jobs when idle")
+     work_sub.set_defaults(func=cmd_backfill_work)
+     bstat_sub = back_cmd.add_parser("status", help="Job counts per season, kind and status")
+     bstat_sub.set_defaults(func=cmd_backfill_status)
+     retry_sub = back_cmd.add_parser("retry", help="Give failed jobs a fresh set of attempts")
+     retry_sub.add_argument("--season", type=int, default=None)
+     retry_sub.set_defaults(func=cmd_backfill_retry)
+
      args = argpars.parse_args()
-     args.func(args)
+     if args.replay and args.cmd in ("daily", "live"):
+         argpars.error(f"--replay does not apply to {args.cmd}: it follows today's games")
+     if args.offline or args.no_cache or args.replay:
+         from app.etl import fetch_data
+         if args.offline:
+             fetch_data.OFFLINE = True
+         if args.no_cache:
+             fetch_data.HTTP_CACHE = False
+         if args.replay:
+             fetch_data.REPLAY = True
+     if args.report or args.metrics or args.sentry_dsn:
+         metrics.enable(args.cmd, sentry_dsn=args.sentry_dsn)
+     try:
+         args.func(args)
+     finally:
+         metrics.finish(args.report, args.metrics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,176 @@
+"""Export per-season columnar snapshots (see app.etl.snapshot_reader for the format).
+
+Each season gets a fingerprint: row count plus an order-independent sum of
+row hashes for every exported table, computed in the database. A season whose
+fingerprint matches its manifest is skipped, so re-running the export only
+rewrites seasons that changed, whichever loader changed them.
+
+A new export goes into a fresh version directory and becomes visible when
+the manifest is replaced (atomically). Readers open column files lazily, so
+the version it replaces is kept until the season's next export: a reader that
+opened the old manifest can still read any of its columns. Older versions are
+removed.
+"""
+from __future__ import annotations
+import datetime as dt
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, text
+
+from app import models  # noqa: F401  (fills Base.metadata)
+from app.etl import metrics
+from app.etl.load import get_session
+from app.etl.snapshot_reader import FORMAT_VERSION, SNAPSHOT_DIR, manifest_path, read_manifest
+from app.models.base import Base
+
+# table -> rows of the season; team_records has no season_id and goes by date
+EXPORTS = {
+    "games": "season_id = :season_id",
+    "team_records": "date >= :first AND date < :end",
+    "batter_game_stats": "season_id = :season_id",
+    "pitcher_game_stats": "season_id = :season_id",
+    "fielder_game_stats": "season_id = :season_id",
+}
+_SKIP_COLUMNS = {"row_hash"}
+
+
+def _columns(table: str) -> List[Tuple[str, str]]:
+    """(column, kind) for the exported columns of a table."""
+    out = []
+    for c in Base.metadata.tables[table].columns:
+        if c.name in _SKIP_COLUMNS:
+            continue
+        if isinstance(c.type, Boolean):
+            kind = "bool"
+        elif isinstance(c.type, Integer):
+            kind = "int"
+        elif isinstance(c.type, Float):
+            kind = "float"
+        elif isinstance(c.type, DateTime):
+            kind = "datetime"
+        elif isinstance(c.type, Date):
+            kind = "date"
+        else:
+            kind = "category"
+        out.append((c.name, kind))
+    return out
+
+
+def _params(season_id: int, year: int) -> Dict[str, Any]:
+    return {"season_id": season_id, "first": dt.date(year, 1, 1), "end": dt.date(year + 1, 1, 1)}
+
+
+def fingerprint(sesh, season_id: int, year: int) -> str:
+    params = _params(season_id, year)
+    parts = [FORMAT_VERSION]
+    for table, where in EXPORTS.items():
+        n, h = sesh.execute(text(
+            f"SELECT count(*), coalesce(sum(hashtextextended(t::text, 0)), 0) FROM {table} t WHERE {where}"
+        ), params).one()
+        parts.append([table, n, str(h)])
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def _encode(kind: str, values: tuple) -> Tuple[np.ndarray, Optional[np.ndarray], Dict[str, Any]]:
+    """A column's values -> (stored array, validity mask or None, manifest entry)."""
+    meta: Dict[str, Any] = {"kind": kind}
+    if kind == "category":
+        codes, uniques = pd.factorize(np.array(values, dtype=object))
+        meta["categories"] = [str(u) for u in uniques]
+        return codes.astype(np.int32), None, meta
+    if kind == "datetime":
+        return np.array(values, dtype="datetime64[us]"), None, meta
+    if kind == "date":
+        return np.array(values, dtype="datetime64[D]"), None, meta
+    if kind == "float":
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64), None, meta
+    valid = np.array([v is not None for v in values], dtype=bool)
+    dtype = np.bool_ if kind == "bool" else np.int64
+    if valid.all():
+        return np.array(values, dtype=dtype), None, meta
+    meta["has_nulls"] = True
+    return np.array([v if v is not None else 0 for v in values], dtype=dtype), valid, meta
+
+
+def _export_table(sesh, table: str, params: Dict[str, Any], out_dir: str) -> Dict[str, Any]:
+    cols = _columns(table)
+    with metrics.timed("sql_seconds", statement=f"snapshot_{table}"):
+        rows = sesh.execute(text(
+            f"SELECT {', '.join(c for c, _ in cols)} FROM {table} WHERE {EXPORTS[table]} ORDER BY id"
+        ), params).all()
+    os.makedirs(out_dir)
+    columns = {}
+    values = list(zip(*rows)) if rows else [() for _ in cols]
+    for (name, kind), vals in zip(cols, values):
+        arr, valid, meta = _encode(kind, vals)
+        np.save(os.path.join(out_dir, f"{name}.npy"), arr)
+        if valid is not None:
+            np.save(os.path.join(out_dir, f"{name}.valid.npy"), valid)
+        meta["dtype"] = str(arr.dtype)
+        columns[name] = meta
+    return {"rows": len(rows), "columns": columns}
+
+
+def _write_manifest(root: str, year: int, manifest: Dict[str, Any]) -> None:
+    path = manifest_path(root, year)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, path)
+
+
+def export_season(year: int, root: Optional[str] = None, force: bool = False) -> Optional[Dict[str, int]]:
+    """Write the season's snapshot unless it is unchanged; returns rows per table, or None if skipped."""
+    root = root or SNAPSHOT_DIR
+    with get_session() as sesh:
+        # one snapshot of the database for the fingerprint and every table
+        sesh.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        season_id = sesh.execute(text("SELECT id FROM seasons WHERE year = :year"), {"year": year}).scalar()
+        if season_id is None:
+            raise ValueError(f"Season {year} not found; insert it first.")
+        fp = fingerprint(sesh, season_id, year)
+        current = read_manifest(root, year)
+        if not force and current is not None and current.get("fingerprint") == fp:
+            return None
+
+        # never the directory of the current (or previous) version, even on a forced re-export
+        stamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        version = os.path.join(str(year), f"{fp[:16]}-{stamp}")
+        out = os.path.join(root, version)
+        params = _params(season_id, year)
+        tables = {t: _export_table(sesh, t, params, os.path.join(out, t)) for t in EXPORTS}
+        sesh.rollback()
+
+    _write_manifest(root, year, {
+        "format": FORMAT_VERSION,
+        "season": year,
+        "fingerprint": fp,
+        "exported_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "path": version,
+        "tables": tables,
+    })
+    # the replaced version stays for readers that opened its manifest; anything
+    # older (or left over from an interrupted export) goes
+    keep = {version} | ({current["path"]} if current is not None else set())
+    for name in os.listdir(os.path.join(root, str(year))):
+        if os.path.join(str(year), name) not in keep:
+            shutil.rmtree(os.path.join(root, str(year), name), ignore_errors=True)
+    return {t: meta["rows"] for t, meta in tables.items()}
+
+
+def export_snapshots(years: Optional[List[int]] = None, root: Optional[str] = None,
+                     force: bool = False) -> Dict[int, Optional[Dict[str, int]]]:
+    """Export the given seasons (default: every season with games)."""
+    if years is None:
+        with get_session() as sesh:
+            years = list(sesh.execute(text(
+                "SELECT s.year FROM seasons s WHERE EXISTS (SELECT 1 FROM games g WHERE g.season_id = s.id) "
+                "ORDER BY s.year"
+            )).scalars())
+    return {year: export_season(year, root, force) for year in years}
@@ -0,0 +1,135 @@
+"""Read per-season columnar snapshots written by ``run.py snapshot``.
+
+Layout under the snapshot root (MLB_SNAPSHOT_DIR)::
+
+    <year>.json                         manifest: tables, columns, dtypes, categories
+    <year>/<version>/<table>/<col>.npy  one NumPy file per column
+    <year>/<version>/<table>/<col>.valid.npy   validity mask, only for columns with NULLs
+
+Columns are opened with ``mmap_mode="r"``: nothing is read until it is
+touched, and only the pages touched. Strings are dictionary encoded (int32
+codes, -1 for NULL; the categories are in the manifest). Only numpy and
+pandas are needed here, no database settings.
+
+    snap = open_season(2024)
+    games = snap.read("games", ["date", "home_team_id", "home_score"])
+    batting = snap.frame("batter_game_stats", ["player_id", "hits", "home_runs"])
+"""
+from __future__ import annotations
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = os.getenv("MLB_SNAPSHOT_DIR", "snapshots")
+FORMAT_VERSION = 1
+
+
+def manifest_path(root: str, year: int) -> str:
+    return os.path.join(root, f"{year}.json")
+
+
+def read_manifest(root: str, year: int) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path(root, year)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def seasons(root: Optional[str] = None) -> List[int]:
+    """Years with a snapshot under ``root``."""
+    root = root or SNAPSHOT_DIR
+    if not os.path.isdir(root):
+        return []
+    return sorted(int(name[:-5]) for name in os.listdir(root)
+                  if name.endswith(".json") and name[:-5].isdigit())
+
+
+class Snapshot:
+    """One season's exported tables; each column is memory-mapped on first use.
+
+    Its files stay in place until the season is exported twice more, so a
+    Snapshot opened before a re-export can still read every column.
+    """
+
+    def __init__(self, root: str, manifest: Dict[str, Any]):
+        self.manifest = manifest
+        self.season: int = manifest["season"]
+        self.path = os.path.join(root, manifest["path"])
+        self._open: Dict[str, np.ndarray] = {}
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self.manifest["tables"])
+
+    def rows(self, table: str) -> int:
+        return self.manifest["tables"][table]["rows"]
+
+    def columns(self, table: str) -> List[str]:
+        return list(self.manifest["tables"][table]["columns"])
+
+    def _meta(self, table: str, name: str) -> Dict[str, Any]:
+        try:
+            return self.manifest["tables"][table]["columns"][name]
+        except KeyError:
+            raise KeyError(f"{table}.{name} is not in the {self.season} snapshot") from None
+
+    def _load(self, table: str, filename: str) -> np.ndarray:
+        key = f"{table}/{filename}"
+        arr = self._open.get(key)
+        if arr is None:
+            arr = self._open[key] = np.load(os.path.join(self.path, table, filename), mmap_mode="r")
+        return arr
+
+    def column(self, table: str, name: str) -> np.ndarray:
+        """The stored array (codes for string columns), read-only and memory-mapped."""
+        self._meta(table, name)
+        return self._load(table, f"{name}.npy")
+
+    def valid(self, table: str, name: str) -> Optional[np.ndarray]:
+        """Boolean mask of non-NULL rows, or None when the column has no NULLs."""
+        if not self._meta(table, name).get("has_nulls"):
+            return None
+        return self._load(table, f"{name}.valid.npy")
+
+    def categories(self, table: str, name: str) -> Optional[List[str]]:
+        return self._meta(table, name).get("categories")
+
+    def read(self, table: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Only the requested columns, as memory-mapped arrays."""
+        return {c: self.column(table, c) for c in (columns or self.columns(table))}
+
+    def frame(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """A DataFrame over the requested columns.
+
+        Numeric and timestamp columns wrap the mapped arrays without copying;
+        date columns are converted to datetime64[s] (pandas has no day unit),
+        strings come back as Categoricals and NULLable integers/booleans as
+        pandas masked arrays.
+        """
+        data = {}
+        for c in columns or self.columns(table):
+            meta = self._meta(table, c)
+            arr = self.column(table, c)
+            if meta["kind"] == "category":
+                data[c] = pd.Categorical.from_codes(arr, categories=meta["categories"])
+            elif meta.get("has_nulls") and meta["kind"] in ("int", "bool"):
+                mask = ~self.valid(table, c)
+                data[c] = (pd.arrays.IntegerArray(arr, mask) if meta["kind"] == "int"
+                           else pd.arrays.BooleanArray(arr, mask))
+            else:
+                data[c] = arr
+        return pd.DataFrame(data, copy=False)
+
+
+def open_season(year: int, root: Optional[str] = None) -> Snapshot:
+    root = root or SNAPSHOT_DIR
+    manifest = read_manifest(root, year)
+    if manifest is None:
+        raise FileNotFoundError(f"No snapshot for {year} under {root}; run `run.py snapshot` first.")
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Snapshot for {year} has format {manifest.get('format')}, expected {FORMAT_VERSION}.")
+    return Snapshot(root, manifest)
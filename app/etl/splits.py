@@ -0,0 +1,128 @@
+"""Rolling batting and pitching splits from the per-game stat lines.
+
+For every player and every day they played, each span sums their lines of
+the last N days ("7d", the day itself included) or of their last N games
+("10g"), within the season. A season's lines are pulled once into arrays
+sorted by player, date and game; one cumulative sum over all stat columns
+turns every window into the difference of two of its rows, so all spans of
+all players come out of one vectorized pass.
+"""
+from __future__ import annotations
+import datetime as dt
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.etl import metrics
+from app.etl.load import (
+    _BATTING_SUMS, _PITCHING_SUMS, _copy_rows, _season_id_by_year, bump_data_version, get_session,
+)
+
+DAY_SPANS = (7, 15, 30)
+GAME_SPANS = (5, 10, 20)
+SPANS = tuple(f"{n}d" for n in DAY_SPANS) + tuple(f"{n}g" for n in GAME_SPANS)
+
+# group -> (lines table, splits table, {column: expression over a line})
+_GROUPS = {
+    "batting": ("batter_game_stats", "player_batting_splits",
+                {c: f"coalesce(l.{c}, 0)" for c in _BATTING_SUMS}),
+    "pitching": ("pitcher_game_stats", "player_pitching_splits",
+                 {"outs": "round(l.innings_pitched * 3)::integer",
+                  **{c: f"coalesce(l.{c}, 0)" for c in _PITCHING_SUMS}}),
+}
+
+_LINES = """
+SELECT l.player_id, g.date::date AS day, {exprs}
+FROM {lines} l
+JOIN games g ON g.id = l.game_id AND g.season_id = l.season_id
+WHERE l.season_id = :season_id
+ORDER BY l.player_id, g.date, g.id"""
+
+
+def rolling_sums(player: np.ndarray, day: np.ndarray, values: np.ndarray,
+                 day_spans: Sequence[int] = DAY_SPANS,
+                 game_spans: Sequence[int] = GAME_SPANS) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Window sums as of each (player, day), from lines sorted by (player, day, game).
+
+    ``day`` is in days (any integer origin) and ``values`` is (lines x stats).
+    Returns the index of each player-day's last line, and per span a
+    (player-days x stats) array of sums.
+    """
+    n = len(player)
+    cum = np.zeros((n + 1, values.shape[1]), dtype=np.int64)
+    np.cumsum(values, axis=0, out=cum[1:])
+
+    new_day = np.ones(n, dtype=bool)
+    new_day[1:] = (player[1:] != player[:-1]) | (day[1:] != day[:-1])
+    last = np.append(np.flatnonzero(new_day)[1:], n) - 1
+    end = last + 1  # window is lines [start, end)
+
+    # (player, day) as one sortable key, so a day window's first line is one searchsorted away
+    width = int(day.max() - day.min()) + max(day_spans, default=0) + 1
+    rank = np.cumsum(np.append(True, player[1:] != player[:-1])) - 1
+    key = rank * width + (day - day.min())
+    first_line = np.searchsorted(rank, rank[last], side="left")
+
+    sums = {}
+    for span in day_spans:
+        start = np.searchsorted(key, key[last] - (span - 1), side="left")
+        sums[f"{span}d"] = cum[end] - cum[start]
+    for span in game_spans:
+        start = np.maximum(end - span, first_line)
+        sums[f"{span}g"] = cum[end] - cum[start]
+    return last, sums
+
+
+def _compute_group(sesh, group: str, season_id: int, from_date: Optional[dt.date]) -> int:
+    lines_table, splits_table, exprs = _GROUPS[group]
+    with metrics.timed("sql_seconds", statement=f"splits_{group}_lines"):
+        rows = sesh.execute(text(_LINES.format(
+            lines=lines_table, exprs=", ".join(f"{e} AS {c}" for c, e in exprs.items()),
+        )), {"season_id": season_id}).all()
+
+    out = []
+    if rows:
+        cols = list(zip(*rows))
+        player = np.array(cols[0], dtype=np.int64)
+        day = np.array(cols[1], dtype="datetime64[D]")
+        # a leading column of ones sums to the games in the window
+        values = np.column_stack([np.ones(len(rows), dtype=np.int64)]
+                                 + [np.array(c, dtype=np.int64) for c in cols[2:]])
+        last, sums = rolling_sums(player, day.astype(np.int64), values)
+
+        keep = np.ones(len(last), dtype=bool) if from_date is None else day[last] >= np.datetime64(from_date, "D")
+        players = player[last][keep].tolist()
+        days = day[last][keep].astype(object).tolist()
+        for span, s in sums.items():
+            out.extend(zip(players, [season_id] * len(players), days, [span] * len(players),
+                           *s[keep].T.tolist()))
+
+    columns = ("player_id", "season_id", "as_of", "span", "games", *exprs)
+    cur = sesh.connection().connection.cursor()
+    try:
+        if from_date is None:
+            cur.execute(f"DELETE FROM {splits_table} WHERE season_id = %s", (season_id,))
+        else:
+            cur.execute(f"DELETE FROM {splits_table} WHERE season_id = %s AND as_of >= %s",
+                        (season_id, from_date))
+        with metrics.timed("sql_seconds", statement=f"splits_{group}_copy"):
+            _copy_rows(cur, splits_table, columns, out)
+    finally:
+        cur.close()
+    return len(out)
+
+
+def compute_splits(year: int, from_date: Optional[dt.date] = None) -> dict:
+    """Rolling splits of a season's players; with ``from_date`` only days from then on are rewritten.
+
+    Windows reach back up to 30 days or 20 games, so earlier lines are still
+    read (the whole season's lines fit in a few arrays); a daily run only
+    writes the new days' rows.
+    """
+    with get_session() as sesh:
+        season_id = _season_id_by_year(sesh, year)
+        counts = {group: _compute_group(sesh, group, season_id, from_date) for group in _GROUPS}
+        bump_data_version(sesh)
+        sesh.commit()
+    return counts
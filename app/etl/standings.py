@@ -0,0 +1,198 @@
+from __future__ import annotations
+import datetime as dt
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from app.db import dimensions
+from app.etl import metrics
+from app.etl.load import FINAL_STATUSES, _copy_rows, _season_id_by_year, bump_data_version, get_session
+from app.models import Game
+
+_TEAM_RECORD_COLUMNS = ("team_id", "date", "played", "won", "opponent_team_id", "game_id")
+_SNAPSHOT_COLUMNS = (
+    "season_id", "date", "team_id", "wins", "losses", "pct", "games_back", "streak", "last_10",
+)
+
+
+def _season_arrays(sesh, season_id: int):
+    rows = sesh.execute(
+        select(Game.id, Game.date, Game.status, Game.home_team_id, Game.away_team_id,
+               Game.home_score, Game.away_score)
+        .where(Game.season_id == season_id)
+        .order_by(Game.date, Game.id)
+    ).all()
+    if not rows:
+        return None
+    gid, date, status, home, away, hs, as_ = zip(*rows)
+    final = np.array(
+        [s in FINAL_STATUSES and h is not None and a is not None and h != a
+         for s, h, a in zip(status, hs, as_)],
+        dtype=bool,
+    )
+    return {
+        "id": np.array(gid, dtype=np.int64),
+        "day": np.array([d.date() for d in date], dtype="datetime64[D]"),
+        "home": np.array(home, dtype=np.int64),
+        "away": np.array(away, dtype=np.int64),
+        "home_won": np.array([(h or 0) > (a or 0) for h, a in zip(hs, as_)], dtype=bool),
+        "final": final,
+    }
+
+
+def compute_standings(year: int, from_date: Optional[dt.date] = None,
+                      today: Optional[dt.date] = None) -> dict:
+    """Derive team_records and standings_snapshots for a season from final games.
+
+    Wins and losses go into a team x day matrix whose cumulative sums give every
+    team's record on every day in one pass; streaks and last-10 come from the
+    per-team game sequence the same way. With ``from_date`` only rows on or
+    after that day are rewritten (the cumulative state before it is still
+    computed from the whole season, which is cheap).
+    """
+    today = today or dt.date.today()
+    counts = {"team_records": 0, "snapshots": 0}
+    with get_session() as sesh:
+        season_id = _season_id_by_year(sesh, year)
+        g = _season_arrays(sesh, season_id)
+        if g is None:
+            return counts
+
+        start = g["day"].min()
+        end = min(g["day"].max(), np.datetime64(today, "D"))
+        if end < start:
+            return counts
+        n_days = int((end - start).astype(int)) + 1
+        first = start if from_date is None else max(start, np.datetime64(from_date, "D"))
+        if first > end:
+            return counts
+        first_ix = int((first - start).astype(int))
+
+        team_ids = np.unique(np.concatenate([g["home"], g["away"]]))
+        teams = dimensions.get(sesh).teams
+        divisions = {t: teams[t].division for t in team_ids.tolist() if t in teams}
+        n_teams = len(team_ids)
+
+        # --- team x day win/loss matrix ---------------------------------------
+        f = g["final"] & (g["day"] <= end)
+        day = (g["day"][f] - start).astype(int)
+        home = np.searchsorted(team_ids, g["home"][f])
+        away = np.searchsorted(team_ids, g["away"][f])
+        home_won = g["home_won"][f]
+        winners = np.where(home_won, home, away)
+        losers = np.where(home_won, away, home)
+
+        wins = np.zeros((n_teams, n_days), dtype=np.int32)
+        losses = np.zeros((n_teams, n_days), dtype=np.int32)
+        np.add.at(wins, (winners, day), 1)
+        np.add.at(losses, (losers, day), 1)
+        cw = wins.cumsum(axis=1)
+        cl = losses.cumsum(axis=1)
+        played = cw + cl
+        pct = np.divide(cw, played, out=np.zeros(played.shape), where=played > 0)
+
+        diff = cw - cl
+        _, div_code = np.unique(np.array([divisions.get(t) or "" for t in team_ids.tolist()]), return_inverse=True)
+        leader = np.full((div_code.max() + 1, n_days), np.iinfo(np.int32).min, dtype=np.int64)
+        np.maximum.at(leader, div_code, diff)
+        games_back = (leader[div_code] - diff) / 2.0
+
+        # --- per-team game sequence: streaks and last 10 ----------------------
+        n_final = int(f.sum())
+        e_team = np.concatenate([home, away])
+        e_day = np.concatenate([day, day])
+        e_won = np.concatenate([home_won, ~home_won])
+        e_opp = np.concatenate([away, home])
+        e_game = np.concatenate([g["id"][f], g["id"][f]])
+        e_ord = np.concatenate([np.arange(n_final), np.arange(n_final)])
+        order = np.lexsort((e_ord, e_team))
+        e_team, e_day, e_won, e_opp, e_game = (a[order] for a in (e_team, e_day, e_won, e_opp, e_game))
+
+        n = len(e_team)
+        pos = np.arange(n)
+        team_start = np.searchsorted(e_team, np.arange(n_teams))
+        new_run = np.ones(n, dtype=bool)
+        new_run[1:] = (e_team[1:] != e_team[:-1]) | (e_won[1:] != e_won[:-1])
+        run_first = np.flatnonzero(new_run)
+        streak_len = pos - run_first[np.cumsum(new_run) - 1] + 1
+        cum_wins = np.cumsum(e_won)
+        in_team = pos - team_start[e_team]
+        back = np.where(in_team >= 10, pos - 10, team_start[e_team] - 1)
+        l10_wins = cum_wins - np.where(back >= 0, cum_wins[np.maximum(back, 0)], 0)
+        l10_games = np.minimum(in_team + 1, 10)
+
+        # --- rows for the days being rewritten --------------------------------
+        days = (start + np.arange(first_ix, n_days)).astype(object)
+        t_grid, d_grid = np.meshgrid(np.arange(n_teams), np.arange(first_ix, n_days), indexing="ij")
+        t_flat, d_flat = t_grid.ravel(), d_grid.ravel()
+        gp = played[t_flat, d_flat]
+        has = gp > 0
+        streak = [None] * len(gp)
+        last_10 = [None] * len(gp)
+        if n:
+            last = np.where(has, team_start[t_flat] + gp - 1, 0)
+            streak = [
+                f"{'W' if w else 'L'}{k}" if ok else None
+                for ok, w, k in zip(has.tolist(), e_won[last].tolist(), streak_len[last].tolist())
+            ]
+            last_10 = [
+                f"{w}-{k - w}" if ok else None
+                for ok, w, k in zip(has.tolist(), l10_wins[last].tolist(), l10_games[last].tolist())
+            ]
+        snap_rows = zip(
+            [season_id] * len(t_flat),
+            days[d_flat - first_ix].tolist(),
+            team_ids[t_flat].tolist(),
+            cw[t_flat, d_flat].tolist(),
+            cl[t_flat, d_flat].tolist(),
+            np.round(pct[t_flat, d_flat], 3).tolist(),
+            games_back[t_flat, d_flat].tolist(),
+            streak,
+            last_10,
+        )
+
+        keep = e_day >= first_ix
+        game_rows = list(zip(
+            team_ids[e_team[keep]].tolist(),
+            (start + e_day[keep]).astype(object).tolist(),
+            [True] * int(keep.sum()),
+            e_won[keep].tolist(),
+            team_ids[e_opp[keep]].tolist(),
+            e_game[keep].tolist(),
+        ))
+        idle = (wins[:, first_ix:] + losses[:, first_ix:]) == 0
+        it, idd = np.nonzero(idle)
+        idle_rows = list(zip(
+            team_ids[it].tolist(),
+            days[idd].tolist(),
+            [False] * len(it),
+            [False] * len(it),
+            [None] * len(it),
+            [None] * len(it),
+        ))
+
+        first_date = days[0]
+        season_last = g["day"].max().astype(object)
+        cur = sesh.connection().connection.cursor()
+        try:
+            cur.execute(
+                "DELETE FROM team_records WHERE date BETWEEN %s AND %s AND team_id = ANY(%s)",
+                (first_date, season_last, team_ids.tolist()),
+            )
+            with metrics.timed("sql_seconds", statement="team_records_copy"):
+                _copy_rows(cur, "team_records", _TEAM_RECORD_COLUMNS, game_rows + idle_rows)
+            cur.execute(
+                "DELETE FROM standings_snapshots WHERE season_id = %s AND date >= %s",
+                (season_id, first_date),
+            )
+            with metrics.timed("sql_seconds", statement="standings_copy"):
+                _copy_rows(cur, "standings_snapshots", _SNAPSHOT_COLUMNS, snap_rows)
+        finally:
+            cur.close()
+        bump_data_version(sesh)
+        sesh.commit()
+
+    counts["team_records"] = len(game_rows) + len(idle_rows)
+    counts["snapshots"] = len(t_flat)
+    return counts
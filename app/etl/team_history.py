@@ -0,0 +1,108 @@
+"""PlayerTeamHistory stints derived from game appearances.
+
+Every stat line (batting, pitching or fielding) is an appearance for the team
+it was recorded with. Sorted by player and game, consecutive appearances for
+the same team form one stint; a stint ends when the player shows up for
+another team (a trade or claim) or goes more than STINT_GAP_DAYS without
+appearing (optioned and later recalled, a long IL stay, the off-season).
+A player's latest stint stays open (end_date NULL) while it is current.
+"""
+from __future__ import annotations
+import os
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import text
+
+from app.etl import metrics
+from app.etl.load import FINAL_STATUSES, _copy_rows, _season_id_by_year, bump_data_version, get_session
+
+STINT_GAP_DAYS = int(os.getenv("MLB_STINT_GAP_DAYS", "30"))
+
+_COLUMNS = ("player_id", "team_id", "start_date", "end_date")
+
+_LINES = """
+SELECT player_id, game_id, season_id, team_id FROM batter_game_stats
+UNION SELECT player_id, game_id, season_id, team_id FROM pitcher_game_stats
+UNION SELECT player_id, game_id, season_id, team_id FROM fielder_game_stats"""
+
+_APPEARANCES = f"""
+SELECT l.player_id, l.team_id, g.date::date AS day
+FROM ({_LINES}) l
+JOIN games g ON g.id = l.game_id AND g.season_id = l.season_id
+WHERE l.team_id IS NOT NULL {{players}}
+ORDER BY l.player_id, g.date, g.id"""
+
+# every player with a line in the season; their whole history is re-derived
+_SEASON_PLAYERS = """
+AND l.player_id IN (
+    SELECT player_id FROM batter_game_stats WHERE season_id = :season_id
+    UNION SELECT player_id FROM pitcher_game_stats WHERE season_id = :season_id
+    UNION SELECT player_id FROM fielder_game_stats WHERE season_id = :season_id)"""
+
+
+def derive_stints(player: np.ndarray, team: np.ndarray, day: np.ndarray, latest: np.datetime64,
+                  gap_days: int = STINT_GAP_DAYS) -> list:
+    """Collapse appearances sorted by (player, day) into (player, team, start, end) rows."""
+    n = len(player)
+    if not n:
+        return []
+    new = np.ones(n, dtype=bool)
+    new[1:] = ((player[1:] != player[:-1]) | (team[1:] != team[:-1])
+               | ((day[1:] - day[:-1]).astype(int) > gap_days))
+    starts = np.flatnonzero(new)
+    ends = np.append(starts[1:], n) - 1
+    # the player's last stint is still running if they appeared recently enough
+    last = np.append(player[starts[1:]] != player[starts[:-1]], True)
+    open_ = last & ((latest - day[ends]).astype(int) <= gap_days)
+    return [
+        (int(p), int(t), s, None if o else e)
+        for p, t, s, e, o in zip(player[starts], team[starts], day[starts].astype(object),
+                                 day[ends].astype(object), open_)
+    ]
+
+
+def rebuild_team_history(year: Optional[int] = None) -> dict:
+    """Replace the stints of every player who appeared in ``year`` (all players if None).
+
+    A player's stints are always rebuilt from all of their appearances, so
+    a re-run is idempotent and a corrected boxscore is picked up.
+    """
+    with get_session() as sesh:
+        # concurrent rebuilds (backfill workers on different seasons) share players
+        sesh.execute(text("SELECT pg_advisory_xact_lock(hashtext('player_team_history'))"))
+        params: dict = {}
+        players = ""
+        if year is not None:
+            params["season_id"] = _season_id_by_year(sesh, year)
+            players = _SEASON_PLAYERS
+        with metrics.timed("sql_seconds", statement="appearances"):
+            rows = sesh.execute(text(_APPEARANCES.format(players=players)), params).all()
+        latest = sesh.execute(
+            text("SELECT max(date)::date FROM games WHERE status = ANY(:final)"),
+            {"final": list(FINAL_STATUSES)},
+        ).scalar()
+
+        if rows:
+            player_ids, team_ids, days = zip(*rows)
+            player = np.array(player_ids, dtype=np.int64)
+            stints = derive_stints(player, np.array(team_ids, dtype=np.int64),
+                                   np.array(days, dtype="datetime64[D]"),
+                                   np.datetime64(latest or max(days), "D"))
+        else:
+            player, stints = np.array([], dtype=np.int64), []
+
+        cur = sesh.connection().connection.cursor()
+        try:
+            if year is None:
+                cur.execute("DELETE FROM player_team_history")
+            else:
+                cur.execute("DELETE FROM player_team_history WHERE player_id = ANY(%s)",
+                            (np.unique(player).tolist(),))
+            with metrics.timed("sql_seconds", statement="team_history_copy"):
+                _copy_rows(cur, "player_team_history", _COLUMNS, stints)
+        finally:
+            cur.close()
+        bump_data_version(sesh)
+        sesh.commit()
+    return {"appearances": len(rows), "players": len(np.unique(player)), "stints": len(stints)}
@@ -1,5 +1,7 @@
 from __future__ import annotations
 from typing import Dict, List, Optional, Any
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime, date, timezone
 
@@ -44,6 +46,8 @@ class GameIn(BaseModel):
     official_start_time: Optional[str] = None
     home_team_mlb_id: Optional[int] = None
     away_team_mlb_id: Optional[int] = None
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
 
 
 def map_games_from_schedule(dates: List[Dict[str, Any]], year: int) -> List[GameIn]:
@@ -53,8 +57,10 @@ def map_games_from_schedule(dates: List[Dict[str, Any]], year: int) -> List[Game
             if game.get("gameType") != "R":
                 continue
             teams = game.get("teams") or {}
-            home = (teams.get("home") or {}).get("team") or {}
-            away = (teams.get("away") or {}).get("team") or {}
+            home_side = teams.get("home") or {}
+            away_side = teams.get("away") or {}
+            home = home_side.get("team") or {}
+            away = away_side.get("team") or {}
 
             # if (home.get("sport") or {}).get("id") != 1 or (away.get("sport") or {}).get("id") != 1:
             #     continue
@@ -70,7 +76,244 @@ def map_games_from_schedule(dates: List[Dict[str, Any]], year: int) -> List[Game
                     official_start_time=(game.get("officialStartTime") or None),
                     home_team_mlb_id=home.get("id"),
                     away_team_mlb_id=away.get("id"),
+                    home_score=home_side.get("score"),
+                    away_score=away_side.get("score"),
                 )
             )
     return rows
 
+
+
+
+GAME_COLUMNS = list(GameIn.model_fields)
+
+
+def _int_column(values: tuple, nullable: bool) -> Any:
+    if None not in values:
+        arr = np.array(values, dtype=np.int64)
+        return pd.array(arr, dtype="Int64") if nullable else arr
+    if not nullable:
+        raise ValueError(f"{values.count(None)} schedule games missing gamePk")
+    return pd.array(values, dtype="Int64")
+
+
+def map_games_columnar(dates: List[Dict[str, Any]], year: int) -> pd.DataFrame:
+    """Columnar equivalent of map_games_from_schedule.
+
+    Schedule buckets are flattened in one pass straight into per-column arrays
+    and validated in bulk, so no per-game model is built. Column names and
+    values match the GameIn fields; missing values are None / <NA>.
+    """
+    flat = []
+    for d in dates:
+        for g in d.get("games", []):
+            if g.get("gameType") != "R":
+                continue
+            teams = g.get("teams") or {}
+            home = teams.get("home") or {}
+            away = teams.get("away") or {}
+            flat.append((
+                g.get("gamePk"),
+                g.get("officialDate") or g.get("gameDate"),
+                (g.get("status") or {}).get("detailedState"),
+                (g.get("venue") or {}).get("name"),
+                g.get("gameDate"),
+                g.get("officialStartTime") or None,
+                (home.get("team") or {}).get("id"),
+                (away.get("team") or {}).get("id"),
+                home.get("score"),
+                away.get("score"),
+            ))
+    cols = list(zip(*flat)) if flat else [()] * 10
+    game_ids, game_dates, status, location, sched, official, home, away, home_score, away_score = cols
+
+    if None in game_dates:
+        raise ValueError(f"{game_dates.count(None)} schedule games missing a date")
+
+    return pd.DataFrame({
+        "game_id": _int_column(game_ids, nullable=False),
+        "date": np.array(game_dates, dtype=object),
+        "status": np.array(status, dtype=object),
+        "location": np.array(location, dtype=object),
+        "season_year": np.full(len(flat), year, dtype=np.int64),
+        "scheduled_start_time": np.array(sched, dtype=object),
+        "official_start_time": np.array(official, dtype=object),
+        "home_team_mlb_id": _int_column(home, nullable=True),
+        "away_team_mlb_id": _int_column(away, nullable=True),
+        "home_score": _int_column(home_score, nullable=True),
+        "away_score": _int_column(away_score, nullable=True),
+    }, columns=GAME_COLUMNS)
+
+
+def games_frame_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows of a columnar game frame as plain dicts, with None for missing values."""
+    clean = frame.astype(object).where(frame.notna(), None)
+    return clean.to_dict("records")
+
+
+class PlayerIn(BaseModel):
+    id: int
+    name: str
+    position: Optional[str] = None
+    team_mlb_id: Optional[int] = None
+
+
+class BatterLineIn(BaseModel):
+    player_id: int
+    team_mlb_id: Optional[int] = None
+    at_bats: int = 0
+    hits: int = 0
+    doubles: int = 0
+    triples: int = 0
+    home_runs: int = 0
+    rbis: int = 0
+    runs_scored: int = 0
+    walks: int = 0
+    strikeouts: int = 0
+    stolen_bases: int = 0
+    caught_stealing: int = 0
+
+
+class PitcherLineIn(BaseModel):
+    player_id: int
+    team_mlb_id: Optional[int] = None
+    innings_pitched: float = 0
+    hits_allowed: int = 0
+    earned_runs: int = 0
+    strikeouts: int = 0
+    walks: int = 0
+    home_runs_allowed: int = 0
+    pitches_thrown: int = 0
+    balls_thrown: int = 0
+    strikes_thrown: int = 0
+
+
+class FielderLineIn(BaseModel):
+    player_id: int
+    team_mlb_id: Optional[int] = None
+    position: Optional[str] = None
+    putouts: int = 0
+    assists: int = 0
+    errors: int = 0
+    double_plays_turned: int = 0
+    fielding_chances: int = 0
+
+
+class BoxscoreIn(BaseModel):
+    game_pk: int
+    game_duration: Optional[str] = None
+    temperature: Optional[str] = None
+    weather_condition: Optional[str] = None
+    wind: Optional[str] = None
+    players: List[PlayerIn] = []
+    batters: List[BatterLineIn] = []
+    pitchers: List[PitcherLineIn] = []
+    fielders: List[FielderLineIn] = []
+
+
+def innings_to_float(ip: Any) -> float:
+    # StatsAPI writes innings as "6.2" meaning six and two thirds
+    if ip in (None, ""):
+        return 0.0
+    whole, _, outs = str(ip).partition(".")
+    return round(int(whole or 0) + int(outs or 0) / 3, 4)
+
+
+def _info_value(info: List[Dict[str, Any]], label: str) -> Optional[str]:
+    for item in info:
+        if item.get("label") == label and item.get("value"):
+            return str(item["value"]).strip().rstrip(".")
+    return None
+
+
+def map_boxscore(payload: Dict[str, Any], game_pk: int) -> BoxscoreIn:
+    info = payload.get("info") or []
+    temperature = condition = None
+    weather = _info_value(info, "Weather")  # e.g. "72 degrees, Partly Cloudy"
+    if weather:
+        temp, _, rest = weather.partition(",")
+        temperature = temp.replace("degrees", "").strip() or None
+        condition = rest.strip() or None
+    duration = _info_value(info, "T")  # e.g. "2:41" or "3:05 (0:22 delay)"
+    if duration:
+        duration = duration.split(" ")[0]
+
+    players: List[PlayerIn] = []
+    batters: List[BatterLineIn] = []
+    pitchers: List[PitcherLineIn] = []
+    fielders: List[FielderLineIn] = []
+    for side in ("away", "home"):
+        team = (payload.get("teams") or {}).get(side) or {}
+        team_mlb_id = (team.get("team") or {}).get("id")
+        for p in (team.get("players") or {}).values():
+            person = p.get("person") or {}
+            pid = person.get("id")
+            if pid is None:
+                continue
+            position = (p.get("position") or {}).get("abbreviation")
+            stats = p.get("stats") or {}
+            bat = stats.get("batting") or {}
+            pit = stats.get("pitching") or {}
+            fld = stats.get("fielding") or {}
+            if not (bat or pit or fld):
+                continue  # on the roster but did not appear
+
+            players.append(PlayerIn(
+                id=pid,
+                name=person.get("fullName") or str(pid),
+                position=position,
+                team_mlb_id=team_mlb_id,
+            ))
+            if bat:
+                batters.append(BatterLineIn(
+                    player_id=pid,
+                    team_mlb_id=team_mlb_id,
+                    at_bats=bat.get("atBats", 0),
+                    hits=bat.get("hits", 0),
+                    doubles=bat.get("doubles", 0),
+                    triples=bat.get("triples", 0),
+                    home_runs=bat.get("homeRuns", 0),
+                    rbis=bat.get("rbi", 0),
+                    runs_scored=bat.get("runs", 0),
+                    walks=bat.get("baseOnBalls", 0),
+                    strikeouts=bat.get("strikeOuts", 0),
+                    stolen_bases=bat.get("stolenBases", 0),
+                    caught_stealing=bat.get("caughtStealing", 0),
+                ))
+            if pit:
+                pitchers.append(PitcherLineIn(
+                    player_id=pid,
+                    team_mlb_id=team_mlb_id,
+                    innings_pitched=innings_to_float(pit.get("inningsPitched")),
+                    hits_allowed=pit.get("hits", 0),
+                    earned_runs=pit.get("earnedRuns", 0),
+                    strikeouts=pit.get("strikeOuts", 0),
+                    walks=pit.get("baseOnBalls", 0),
+                    home_runs_allowed=pit.get("homeRuns", 0),
+                    pitches_thrown=pit.get("numberOfPitches", pit.get("pitchesThrown", 0)),
+                    balls_thrown=pit.get("balls", 0),
+                    strikes_thrown=pit.get("strikes", 0),
+                ))
+            if fld:
+                fielders.append(FielderLineIn(
+                    player_id=pid,
+                    team_mlb_id=team_mlb_id,
+                    position=position,
+                    putouts=fld.get("putOuts", 0),
+                    assists=fld.get("assists", 0),
+                    errors=fld.get("errors", 0),
+                    double_plays_turned=fld.get("doublePlays", 0),
+                    fielding_chances=fld.get("chances", 0),
+                ))
+
+    return BoxscoreIn(
+        game_pk=game_pk,
+        game_duration=duration,
+        temperature=temperature,
+        weather_condition=condition,
+        wind=_info_value(info, "Wind"),
+        players=players,
+        batters=batters,
+        pitchers=pitchers,
+        fielders=fielders,
+    )
@@ -1,15 +1,37 @@
-from typing import Union
+import asyncio
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-app = FastAPI()
+from app.api import cache, games, leaders, live, players, standings, teams
+from app.api.cache import DimensionListener
+from app.db.session import async_engine, engine
 
 
-@app.get("/")
-def read_root():
-    return {"Hello": "World"}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    dimension_listener.start()
+    if version_listener is not None:
+        version_listener.start()
+    if live_listener is not None:
+        live.hub.loop = asyncio.get_running_loop()
+        live_listener.start()
+    yield
+    if live_listener is not None:
+        live_listener.stop()
+    if version_listener is not None:
+        version_listener.stop()
+    dimension_listener.stop()
+    await async_engine.dispose()
 
 
-@app.get("/items/{item_id}")
-def read_item(item_id: int, q: Union[str, None] = None):
-    return {"item_id": item_id, "q": q}
\ No newline at end of file
+app = FastAPI(title="MLB Tracker", lifespan=lifespan)
+version_listener = cache.install(app, engine)
+live_listener = live.install(app, engine)
+dimension_listener = DimensionListener(engine)
+
+app.include_router(games.router)
+app.include_router(leaders.router)
+app.include_router(players.router)
+app.include_router(standings.router)
+app.include_router(teams.router)
@@ -6,4 +6,13 @@ from .position_stats.pitcher_game_stats import PitcherGameStats
 from .position_stats.batter_game_stats import BatterGameStats
 from .position_stats.fielder_game_stats import FielderGameStats
 from .player_team_history import PlayerTeamHistory
-from .seasons import Season
\ No newline at end of file
+from .seasons import Season
+from .etl_watermark import EtlWatermark
+from .player_season import PlayerBattingSeason, PlayerPitchingSeason
+from .player_split import PlayerBattingSplit, PlayerPitchingSplit
+from .standings import StandingsSnapshot
+from .head_to_head import TeamHeadToHead
+from .leaderboard import LeaderboardEntry
+
+from .data_version import DataVersion, DATA_VERSION_CHANNEL, DIMENSIONS_CHANNEL, LIVE_GAMES_CHANNEL
+from .etl_job import EtlJob
\ No newline at end of file
@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+# loaders NOTIFY on this channel (payload: the new version) when they commit
+DATA_VERSION_CHANNEL = "mlb_data_version"
+# the live poller NOTIFYs per-game score/status deltas (JSON) on this channel
+LIVE_GAMES_CHANNEL = "mlb_live_games"
+# upsert_teams/upsert_seasons NOTIFY here so processes drop their cached dimensions
+DIMENSIONS_CHANNEL = "mlb_dimensions"
+
+class DataVersion(Base):
+    """Single-row counter bumped by every ETL write; API caches are keyed on it."""
+    __tablename__ = "data_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
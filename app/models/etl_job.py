@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any
+from sqlalchemy import DateTime, Index, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class EtlJob(Base):
+    """One unit of backfill work, claimed by workers with FOR UPDATE SKIP LOCKED."""
+    __tablename__ = "etl_jobs"
+    __table_args__ = (
+        UniqueConstraint("kind", "key"),  # re-planning the same range is a no-op
+        Index("ix_etl_jobs_claim", "status", "stage", "season"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)  # schedule, boxscores_plan, boxscores, derive
+    key: Mapped[str] = mapped_column(String(64), nullable=False)
+    season: Mapped[int] = mapped_column(nullable=False)
+    # a season's jobs run stage by stage: games before boxscores before standings
+    stage: Mapped[int] = mapped_column(nullable=False)
+    params: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
+
+    status: Mapped[str] = mapped_column(String(16), default="pending")  # pending, running, done, failed
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(default=5)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))  # retry backoff
+    worker: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,12 @@
+from datetime import date, datetime
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class EtlWatermark(Base):
+    __tablename__ = "etl_watermarks"
+
+    source: Mapped[str] = mapped_column(String, primary_key=True)
+    # everything up to and including this date has been refreshed
+    watermark: Mapped[date | None] = mapped_column(nullable=True)
+    updated_at: Mapped[datetime]
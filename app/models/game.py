@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 from typing import TYPE_CHECKING
@@ -8,13 +8,22 @@ if TYPE_CHECKING:
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        Index("ix_games_date_id", "date", "id"),  # keyset paging and date ranges
+        Index("ix_games_season_date", "season_id", "date"),
+        Index("ix_games_home_team_date", "home_team_id", "date"),
+        Index("ix_games_away_team_date", "away_team_id", "date"),
+        # unique keys of a partitioned table must include the partition key
+        UniqueConstraint("game_id", "season_id", name="uq_games_game_id_season"),
+        {"postgresql_partition_by": "LIST (season_id)"},  # one partition per season, see app.db.partitions
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    game_id: Mapped[int] = mapped_column(unique=True, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, index=True)
+    game_id: Mapped[int] = mapped_column(nullable=False)
     date: Mapped[datetime]
     status: Mapped[str | None] = mapped_column(nullable=True)
     location: Mapped[str | None] = mapped_column(nullable=True)
-    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), nullable=False)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), primary_key=True)
 
     scheduled_start_time: Mapped[datetime | None] = mapped_column(nullable=True)
     official_start_time: Mapped[datetime | None] = mapped_column(nullable=True)
@@ -24,10 +33,15 @@ class Game(Base):
     temperature: Mapped[str | None] = mapped_column(nullable=True)
     weather_condition: Mapped[str | None] = mapped_column(nullable=True)
     wind: Mapped[str | None] = mapped_column(nullable=True)
+
+    # md5 of the normalized schedule row; lets the loader skip unchanged games
+    row_hash: Mapped[str | None] = mapped_column(nullable=True)
     
     
     home_team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"))
     away_team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"))
+    home_score: Mapped[int | None] = mapped_column(nullable=True)
+    away_score: Mapped[int | None] = mapped_column(nullable=True)
     
 
     #Relationships
@@ -0,0 +1,23 @@
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+# A season's 30x30 head-to-head matrix of final games, one row per ordered
+# (team, opponent) pair so either side is a single key lookup. Kept current
+# by merge_games, which recomputes the pairs of the games it changes. No FKs:
+# every merge rewrites cells, and their keys come from already-checked games.
+
+class TeamHeadToHead(Base):
+    __tablename__ = "team_head_to_head"
+    __table_args__ = (UniqueConstraint("season_id", "team_id", "opponent_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    season_id: Mapped[int] = mapped_column(nullable=False)
+    team_id: Mapped[int] = mapped_column(nullable=False)
+    opponent_id: Mapped[int] = mapped_column(nullable=False)
+
+    games: Mapped[int] = mapped_column(default=0)
+    wins: Mapped[int] = mapped_column(default=0)
+    losses: Mapped[int] = mapped_column(default=0)
+    runs_for: Mapped[int] = mapped_column(default=0)
+    runs_against: Mapped[int] = mapped_column(default=0)
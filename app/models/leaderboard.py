@@ -0,0 +1,15 @@
+from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class LeaderboardEntry(Base):
+    """One ranked row of a season's top-K list for a stat, rebuilt after each load."""
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (UniqueConstraint("season_id", "stat", "rank"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), nullable=False)
+    stat: Mapped[str] = mapped_column(String(24), nullable=False)
+    rank: Mapped[int] = mapped_column(nullable=False)  # 1-based, ties broken deterministically
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), nullable=False)
+    value: Mapped[float] = mapped_column(nullable=False)
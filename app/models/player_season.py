@@ -0,0 +1,53 @@
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+# Season totals per (player, season, team), kept current by the boxscore
+# loader with per-game deltas; rate stats are derived from these sums.
+
+class PlayerBattingSeason(Base):
+    __tablename__ = "player_batting_seasons"
+    __table_args__ = (
+        UniqueConstraint("player_id", "season_id", "team_id"),
+        Index("ix_player_batting_seasons_season_id", "season_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), nullable=False)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), nullable=False)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), nullable=False)
+
+    games: Mapped[int] = mapped_column(default=0)
+    at_bats: Mapped[int] = mapped_column(default=0)
+    hits: Mapped[int] = mapped_column(default=0)
+    doubles: Mapped[int] = mapped_column(default=0)
+    triples: Mapped[int] = mapped_column(default=0)
+    home_runs: Mapped[int] = mapped_column(default=0)
+    rbis: Mapped[int] = mapped_column(default=0)
+    runs_scored: Mapped[int] = mapped_column(default=0)
+    walks: Mapped[int] = mapped_column(default=0)
+    strikeouts: Mapped[int] = mapped_column(default=0)
+    stolen_bases: Mapped[int] = mapped_column(default=0)
+    caught_stealing: Mapped[int] = mapped_column(default=0)
+
+
+class PlayerPitchingSeason(Base):
+    __tablename__ = "player_pitching_seasons"
+    __table_args__ = (
+        UniqueConstraint("player_id", "season_id", "team_id"),
+        Index("ix_player_pitching_seasons_season_id", "season_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), nullable=False)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), nullable=False)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), nullable=False)
+
+    games: Mapped[int] = mapped_column(default=0)
+    outs: Mapped[int] = mapped_column(default=0)  # innings pitched * 3, summed exactly
+    hits_allowed: Mapped[int] = mapped_column(default=0)
+    earned_runs: Mapped[int] = mapped_column(default=0)
+    strikeouts: Mapped[int] = mapped_column(default=0)
+    walks: Mapped[int] = mapped_column(default=0)
+    home_runs_allowed: Mapped[int] = mapped_column(default=0)
+    pitches_thrown: Mapped[int] = mapped_column(default=0)
@@ -0,0 +1,58 @@
+from datetime import date
+from sqlalchemy import Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+# Rolling splits per player as of each day they played: the sums over the
+# last N days ("7d") or the player's last N games ("10g") within the season,
+# written by app.etl.splits. Rate stats are derived from these sums. No FKs:
+# the rows are rewritten in bulk from stat lines whose keys are already checked.
+
+class PlayerBattingSplit(Base):
+    __tablename__ = "player_batting_splits"
+    __table_args__ = (
+        UniqueConstraint("player_id", "span", "as_of"),
+        Index("ix_player_batting_splits_season_as_of", "season_id", "as_of"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(nullable=False)
+    season_id: Mapped[int] = mapped_column(nullable=False)
+    as_of: Mapped[date] = mapped_column(nullable=False)
+    span: Mapped[str] = mapped_column(String(4), nullable=False)
+
+    games: Mapped[int] = mapped_column(default=0)
+    at_bats: Mapped[int] = mapped_column(default=0)
+    hits: Mapped[int] = mapped_column(default=0)
+    doubles: Mapped[int] = mapped_column(default=0)
+    triples: Mapped[int] = mapped_column(default=0)
+    home_runs: Mapped[int] = mapped_column(default=0)
+    rbis: Mapped[int] = mapped_column(default=0)
+    runs_scored: Mapped[int] = mapped_column(default=0)
+    walks: Mapped[int] = mapped_column(default=0)
+    strikeouts: Mapped[int] = mapped_column(default=0)
+    stolen_bases: Mapped[int] = mapped_column(default=0)
+    caught_stealing: Mapped[int] = mapped_column(default=0)
+
+
+class PlayerPitchingSplit(Base):
+    __tablename__ = "player_pitching_splits"
+    __table_args__ = (
+        UniqueConstraint("player_id", "span", "as_of"),
+        Index("ix_player_pitching_splits_season_as_of", "season_id", "as_of"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(nullable=False)
+    season_id: Mapped[int] = mapped_column(nullable=False)
+    as_of: Mapped[date] = mapped_column(nullable=False)
+    span: Mapped[str] = mapped_column(String(4), nullable=False)
+
+    games: Mapped[int] = mapped_column(default=0)
+    outs: Mapped[int] = mapped_column(default=0)
+    hits_allowed: Mapped[int] = mapped_column(default=0)
+    earned_runs: Mapped[int] = mapped_column(default=0)
+    strikeouts: Mapped[int] = mapped_column(default=0)
+    walks: Mapped[int] = mapped_column(default=0)
+    home_runs_allowed: Mapped[int] = mapped_column(default=0)
+    pitches_thrown: Mapped[int] = mapped_column(default=0)
@@ -1,11 +1,21 @@
-from sqlalchemy import ForeignKey, Date
+from sqlalchemy import ForeignKey, Date, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
 from datetime import date
-from app.models import Player, Team
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from app.models import Player, Team
 
 class PlayerTeamHistory(Base):
     __tablename__ = "player_team_history"
+    __table_args__ = (
+        # a player's stints never overlap, so the start date identifies one
+        Index("uq_player_team_history_player_start", "player_id", "start_date", unique=True),
+        # point-in-time rosters: daterange @> day; an open stint is unbounded above
+        Index("ix_player_team_history_during", text("daterange(start_date, end_date, '[]')"),
+              postgresql_using="gist"),
+        Index("ix_player_team_history_team_start", "team_id", "start_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), nullable=False)
@@ -17,4 +27,4 @@ class PlayerTeamHistory(Base):
 
     #Relationships
     player: Mapped["Player"] = relationship(back_populates="team_history")
-    team: Mapped["Team"] = relationship(back_populates="player_history")
\ No newline at end of file
+    team: Mapped["Team"] = relationship(back_populates="player_history")
@@ -1,14 +1,27 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
-from app.models import Player, Game
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from app.models import Player, Game
 
 class BatterGameStats(Base):
     __tablename__ = "batter_game_stats"
+    __table_args__ = (
+        # one line per player per game; also serves per-player lookups
+        Index("uq_batter_game_stats_player_game", "player_id", "game_id", "season_id", unique=True),
+        Index("ix_batter_game_stats_game_id", "game_id"),
+        ForeignKeyConstraint(["game_id", "season_id"], ["games.id", "games.season_id"]),
+        {"postgresql_partition_by": "LIST (season_id)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), nullable=False)
-    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), nullable=False)
+    game_id: Mapped[int] = mapped_column(nullable=False)
+    # the game's season, copied down so lines partition (and prune) with their games
+    season_id: Mapped[int] = mapped_column(primary_key=True)
+    # side the player appeared for in this game
+    team_id: Mapped[int | None] = mapped_column(ForeignKey("teams.id"), nullable=True)
  
     at_bats: Mapped[int] = mapped_column(default=0)
     hits: Mapped[int] = mapped_column(default=0)
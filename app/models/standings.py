@@ -0,0 +1,21 @@
+from datetime import date
+from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class StandingsSnapshot(Base):
+    """A team's standing at the end of one day of a season."""
+    __tablename__ = "standings_snapshots"
+    __table_args__ = (UniqueConstraint("season_id", "date", "team_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    season_id: Mapped[int] = mapped_column(ForeignKey("seasons.id"), nullable=False)
+    date: Mapped[date]
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), nullable=False)
+
+    wins: Mapped[int] = mapped_column(default=0)
+    losses: Mapped[int] = mapped_column(default=0)
+    pct: Mapped[float] = mapped_column(default=0)
+    games_back: Mapped[float] = mapped_column(default=0)  # within the team's division
+    streak: Mapped[str | None] = mapped_column(String(4), nullable=True)  # e.g. "W3"
+    last_10: Mapped[str | None] = mapped_column(String(5), nullable=True)  # e.g. "7-3"
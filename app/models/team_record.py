@@ -1,11 +1,14 @@
 from datetime import date
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
-from app.models import Team, Game
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from app.models import Team, Game
 
 class TeamRecord(Base):
     __tablename__ = "team_records"
+    __table_args__ = (Index("ix_team_records_team_date", "team_id", "date"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     team_id: Mapped[int] = mapped_column(ForeignKey("teams.id")) 
@@ -13,8 +16,9 @@ class TeamRecord(Base):
     played: Mapped[bool] = mapped_column(default=False)
     won: Mapped[bool | None] = mapped_column(nullable=False)
     opponent_team_id: Mapped[int | None] = mapped_column(ForeignKey("teams.id"), nullable=True)
-    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), nullable=True)
+    # no FK: games is partitioned by season and only (id, season_id) is unique there
+    game_id: Mapped[int] = mapped_column(nullable=True)
 
     team: Mapped["Team"] = relationship(foreign_keys=[team_id], back_populates="daily_records")
     opponent_team: Mapped["Team"] = relationship(foreign_keys=[opponent_team_id])
-    game: Mapped["Game"] = relationship(foreign_keys=[game_id])
\ No newline at end of file
+    game: Mapped["Game"] = relationship(primaryjoin="foreign(TeamRecord.game_id) == Game.id", viewonly=True)
\ No newline at end of file
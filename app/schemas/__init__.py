@@ -1,6 +1,12 @@
 from .player import PlayerBase, PlayerRead
 from .team import TeamBase, TeamRead
-from .game import GameBase, GameRead
+from .game import GameBase, GameRead, GamePage
 from .team_record import TeamRecordBase, TeamRecordRead
 from .season import SeasonBase, SeasonRead
 from .player_team_history import PlayerTeamHistoryBase, PlayerTeamHistoryRead
+from .player_season import (
+    PlayerBattingSeasonBase, PlayerBattingSeasonRead,
+    PlayerPitchingSeasonBase, PlayerPitchingSeasonRead,
+)
+from .standings import StandingsSnapshotBase, StandingsSnapshotRead
+from .leaderboard import LeaderboardEntryBase, LeaderboardEntryRead
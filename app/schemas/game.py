@@ -1,10 +1,10 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
 class GameBase(BaseModel):
-    game_id: str
+    game_id: int
     season_id: int
     date: datetime
     status: Optional[str] = None
@@ -18,9 +18,16 @@ class GameBase(BaseModel):
     wind: Optional[str] = None
     home_team_id: int
     away_team_id: int
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
 
 class GameRead(GameBase):
     id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
+
+class GamePage(BaseModel):
+    items: List[GameRead]
+    # opaque keyset cursor for the next page; None on the last page
+    next_cursor: Optional[str] = None
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class HeadToHeadRead(BaseModel):
+    season_id: int
+    team_id: int
+    opponent_id: int
+    games: int = 0
+    wins: int = 0
+    losses: int = 0
+    runs_for: int = 0
+    runs_against: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+class HeadToHeadSummary(BaseModel):
+    """A pairing over several seasons: the per-season cells and their sums."""
+    team_id: int
+    opponent_id: int
+    games: int = 0
+    wins: int = 0
+    losses: int = 0
+    runs_for: int = 0
+    runs_against: int = 0
+    seasons: List[HeadToHeadRead] = []
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class LeaderboardEntryBase(BaseModel):
+    rank: int
+    player_id: int
+    value: float
+
+class LeaderboardEntryRead(LeaderboardEntryBase):
+    player_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -15,4 +15,4 @@ class PlayerRead(PlayerBase):
 
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
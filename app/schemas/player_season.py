@@ -0,0 +1,98 @@
+from pydantic import BaseModel, computed_field
+from typing import Optional
+
+
+def _rate(num: float, den: float, digits: int = 3) -> Optional[float]:
+    return round(num / den, digits) if den else None
+
+
+class BattingRates(BaseModel):
+    """Rate stats over batting sums; subclasses declare the sums."""
+
+    @computed_field
+    @property
+    def avg(self) -> Optional[float]:
+        return _rate(self.hits, self.at_bats)
+
+    @computed_field
+    @property
+    def obp(self) -> Optional[float]:
+        # HBP and sacrifice flies are not in the boxscore lines we keep
+        return _rate(self.hits + self.walks, self.at_bats + self.walks)
+
+    @computed_field
+    @property
+    def slg(self) -> Optional[float]:
+        singles = self.hits - self.doubles - self.triples - self.home_runs
+        total_bases = singles + 2 * self.doubles + 3 * self.triples + 4 * self.home_runs
+        return _rate(total_bases, self.at_bats)
+
+
+class PlayerBattingSeasonBase(BattingRates):
+    player_id: int
+    season_id: int
+    team_id: int
+
+    games: int = 0
+    at_bats: int = 0
+    hits: int = 0
+    doubles: int = 0
+    triples: int = 0
+    home_runs: int = 0
+    rbis: int = 0
+    runs_scored: int = 0
+    walks: int = 0
+    strikeouts: int = 0
+    stolen_bases: int = 0
+    caught_stealing: int = 0
+
+class PlayerBattingSeasonRead(PlayerBattingSeasonBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class PitchingRates(BaseModel):
+    """Rate stats over pitching sums; subclasses declare the sums."""
+
+    @computed_field
+    @property
+    def innings_pitched(self) -> float:
+        return round(self.outs / 3, 2)
+
+    @computed_field
+    @property
+    def era(self) -> Optional[float]:
+        return _rate(27 * self.earned_runs, self.outs, 2)
+
+    @computed_field
+    @property
+    def whip(self) -> Optional[float]:
+        return _rate(3 * (self.walks + self.hits_allowed), self.outs, 2)
+
+    @computed_field
+    @property
+    def k_per_9(self) -> Optional[float]:
+        return _rate(27 * self.strikeouts, self.outs, 2)
+
+
+class PlayerPitchingSeasonBase(PitchingRates):
+    player_id: int
+    season_id: int
+    team_id: int
+
+    games: int = 0
+    outs: int = 0
+    hits_allowed: int = 0
+    earned_runs: int = 0
+    strikeouts: int = 0
+    walks: int = 0
+    home_runs_allowed: int = 0
+    pitches_thrown: int = 0
+
+class PlayerPitchingSeasonRead(PlayerPitchingSeasonBase):
+    id: int
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,45 @@
+from datetime import date
+
+from app.schemas.player_season import BattingRates, PitchingRates
+
+
+class PlayerBattingSplitRead(BattingRates):
+    player_id: int
+    season_id: int
+    as_of: date
+    span: str  # "7d": last 7 days, "10g": last 10 games
+
+    games: int = 0
+    at_bats: int = 0
+    hits: int = 0
+    doubles: int = 0
+    triples: int = 0
+    home_runs: int = 0
+    rbis: int = 0
+    runs_scored: int = 0
+    walks: int = 0
+    strikeouts: int = 0
+    stolen_bases: int = 0
+    caught_stealing: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+class PlayerPitchingSplitRead(PitchingRates):
+    player_id: int
+    season_id: int
+    as_of: date
+    span: str
+
+    games: int = 0
+    outs: int = 0
+    hits_allowed: int = 0
+    earned_runs: int = 0
+    strikeouts: int = 0
+    walks: int = 0
+    home_runs_allowed: int = 0
+    pitches_thrown: int = 0
+
+    class Config:
+        from_attributes = True
@@ -12,4 +12,4 @@ class PlayerTeamHistoryRead(PlayerTeamHistoryBase):
     id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
@@ -21,4 +21,4 @@ class BatterGameStatsRead(BatterGameStatsBase):
     id: int 
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
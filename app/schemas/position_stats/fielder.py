@@ -16,4 +16,4 @@ class FielderGameStatsRead(FielderGameStatsBase):
     id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
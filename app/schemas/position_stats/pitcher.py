@@ -19,4 +19,4 @@ class PitcherGameStatsRead(PitcherGameStatsBase):
     id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
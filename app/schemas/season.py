@@ -8,4 +8,4 @@ class SeasonRead(SeasonBase):
     id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
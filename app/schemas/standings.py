@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+
+class StandingsSnapshotBase(BaseModel):
+    season_id: int
+    date: date
+    team_id: int
+    wins: int = 0
+    losses: int = 0
+    pct: float = 0
+    games_back: float = 0
+    streak: Optional[str] = None
+    last_10: Optional[str] = None
+
+class StandingsSnapshotRead(StandingsSnapshotBase):
+    id: int
+
+    class Config:
+        from_attributes = True
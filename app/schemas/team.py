@@ -11,4 +11,4 @@ class TeamRead(TeamBase):
     id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
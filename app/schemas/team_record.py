@@ -14,4 +14,4 @@ class TeamRecordRead(TeamRecordBase):
     id: int
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""End-to-end ETL and API benchmark on synthetic seasons.
+
+    DATABASE_URL=postgresql+psycopg2://.../mlb_bench python -m bench.suite --seasons 2
+
+Everything runs offline against the configured Postgres. Synthetic seasons use
+years from --start-year (default 2101) and player ids from 9,000,000, so they
+never collide with loaded data; they are removed at the end unless --keep.
+Teams that already exist are reused as-is. Each stage reports its best wall
+time over --repeat runs, rows/sec and the tracemalloc peak of one extra run,
+and the whole report is written as JSON (see --out / --baseline).
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db import partitions, session
+from app.etl import bridge, load
+from app.etl.leaders import rebuild_leaders
+from app.etl.standings import compute_standings
+from app.etl.transform import (
+    build_seasons, map_boxscore, map_games_columnar, map_games_from_schedule, map_team,
+)
+from app.models import Team
+from bench.synthetic import TEAM_IDS, make_boxscore, make_seasons, make_teams, roster
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[[], Any], rows: int,
+                 setup: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.fn = fn
+        self.rows = rows
+        self.setup = setup
+
+    def run(self, repeat: int) -> Dict[str, Any]:
+        best = float("inf")
+        for _ in range(repeat):
+            if self.setup:
+                self.setup()
+            with contextlib.redirect_stdout(io.StringIO()):  # loader progress prints
+                t0 = time.perf_counter()
+                self.fn()
+                best = min(best, time.perf_counter() - t0)
+
+        # memory on a separate run: tracemalloc slows Python code down too much to time with it
+        if self.setup:
+            self.setup()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            "seconds": round(best, 6),
+            "rows": self.rows,
+            "rows_per_sec": round(self.rows / best, 1) if best > 0 else None,
+            "peak_mb": round(peak / (1024 * 1024), 2),
+        }
+
+
+def _ensure_dimensions(years: List[int]) -> None:
+    # reuse real teams when present; only fill in missing ones
+    teams = [map_team(t).model_dump() for t in make_teams()]
+    with load.get_session() as sesh:
+        sesh.execute(pg_insert(Team).values(teams).on_conflict_do_nothing(index_elements=[Team.team_id]))
+        sesh.commit()
+    load.upsert_seasons(build_seasons(years[0], years[-1]))
+
+
+def _cleanup(years: List[int]) -> None:
+    params = {"years": years, "first": dt.date(years[0], 1, 1), "end": dt.date(years[-1] + 1, 1, 1)}
+    seasons = "(SELECT id FROM seasons WHERE year = ANY(:years))"
+    with load.get_session() as sesh:
+        for table in ("leaderboard_entries", "standings_snapshots",
+                      "player_batting_seasons", "player_pitching_seasons", "team_head_to_head"):
+            sesh.execute(text(f"DELETE FROM {table} WHERE season_id IN {seasons}"), params)
+        sesh.execute(text("DELETE FROM team_records WHERE date >= :first AND date < :end"), params)
+        # games and stat lines go with their season partitions
+        for year in years:
+            partitions.drop_season(sesh, year)
+        sesh.execute(text("DELETE FROM seasons WHERE year = ANY(:years)"), params)
+        ids = [pid for tid in TEAM_IDS for group in roster(tid) for pid in group]
+        sesh.execute(text("DELETE FROM players WHERE id = ANY(:ids)"), {"ids": ids})
+        sesh.commit()
+
+
+def _delete_games(years: List[int]) -> None:
+    with load.get_session() as sesh:
+        sesh.execute(text(
+            "DELETE FROM games WHERE season_id IN (SELECT id FROM seasons WHERE year = ANY(:years))"
+        ), {"years": years})
+        sesh.commit()
+
+
+def _api_stages(years: List[int], client) -> List[Stage]:
+    year = years[0]
+    team_id = client.get("/games", params={"season": year, "limit": 1}).json()["items"][0]["home_team_id"]
+    mid_season = f"{year}-07-01"
+
+    def page_season():
+        n, cursor = 0, None
+        while True:
+            params = {"season": year, "limit": 500}
+            if cursor:
+                params["cursor"] = cursor
+            body = client.get("/games", params=params).json()
+            n += 1
+            cursor = body["next_cursor"]
+            if not cursor:
+                return n
+
+    pages = page_season()
+    player_id = roster(TEAM_IDS[0])[0][0]
+    simple = {
+        "api.games_by_team": ("/games", {"season": year, "team": team_id, "limit": 50}),
+        "api.standings_day": ("/standings", {"season": year, "date": mid_season}),
+        "api.leaders": ("/leaders", {"stat": "home_runs", "season": year, "limit": 50}),
+        "api.player_batting": (f"/players/{player_id}/batting", {"season": year}),
+    }
+    reps = 50
+    stages = [Stage("api.games_season_pages", page_season, pages)]
+    for name, (path, params) in simple.items():
+        assert client.get(path, params=params).status_code == 200, name
+        stages.append(Stage(name, lambda p=path, q=params: [client.get(p, params=q) for _ in range(reps)], reps))
+    return stages
+
+
+def build_stages(years: List[int], schedules, boxscore_games: int) -> List[Stage]:
+    games_rows = sum(len(d["games"]) for _, s in schedules for d in s)
+    rows = [(y, map_games_from_schedule(s, y)) for y, s in schedules]
+    frames = [(y, map_games_columnar(s, y)) for y, s in schedules]
+    n_games = sum(len(f) for _, f in frames)
+
+    sample = [(y, g) for y, s in schedules for d in s for g in d["games"]
+              if g["status"]["detailedState"] == "Final"]
+    step = max(1, len(sample) // max(boxscore_games * len(years), 1))
+    box_games = sample[::step][: boxscore_games * len(years)]
+    payloads = [(y, g["gamePk"], make_boxscore(g)) for y, g in box_games]
+    boxes = [(y, map_boxscore(p, pk)) for y, pk, p in payloads]
+    lines = sum(len(b.batters) + len(b.pitchers) + len(b.fielders) for _, b in boxes)
+
+    def bind_rows():
+        with load.get_session() as db:
+            for _, r in rows:
+                bridge.bind_games_fks(db, r)
+
+    def bind_frames():
+        with load.get_session() as db:
+            for _, f in frames:
+                bridge.bind_games_frame(db, f)
+
+    def load_boxes():
+        for year in years:
+            season = [b for y, b in boxes if y == year]
+            for i in range(0, len(season), 100):
+                load.load_boxscores(season[i:i + 100], year)
+
+    return [
+        Stage("transform.rows", lambda: [map_games_from_schedule(s, y) for y, s in schedules], games_rows),
+        Stage("transform.columnar", lambda: [map_games_columnar(s, y) for y, s in schedules], games_rows),
+        Stage("bridge.rows", bind_rows, n_games),
+        Stage("bridge.columnar", bind_frames, n_games),
+        Stage("load.games_insert", lambda: [load.merge_games(f) for _, f in frames], n_games,
+              setup=lambda: _delete_games(years)),
+        Stage("load.games_unchanged", lambda: [load.merge_games(f) for _, f in frames], n_games),
+        Stage("load.upsert_games_rows", lambda: [load.upsert_games(r) for _, r in rows], n_games),
+        Stage("boxscores.transform", lambda: [map_boxscore(p, pk) for _, pk, p in payloads], len(payloads)),
+        Stage("boxscores.load", load_boxes, lines),
+        Stage("derived.standings", lambda: [compute_standings(y, today=dt.date(y, 12, 31)) for y in years],
+              n_games),
+        Stage("derived.leaders", lambda: [rebuild_leaders(y) for y in years], len(years)),
+    ]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    if baseline and baseline.get("params") != report["params"]:
+        print(f"note: baseline {baseline.get('commit')} ran with {baseline.get('params')}")
+    # throughput ratio against the baseline: below 1.0 is a slowdown
+    print(f"{'stage':<26} {'seconds':>9} {'rows/s':>12} {'peak MB':>8}" + ("   vs base" if baseline else ""))
+    for name, r in report["stages"].items():
+        line = f"{name:<26} {r['seconds']:>9.3f} {r['rows_per_sec'] or 0:>12,.0f} {r['peak_mb']:>8.1f}"
+        base = (baseline or {}).get("stages", {}).get(name)
+        if base and base.get("rows_per_sec") and r["rows_per_sec"]:
+            line += f"   {r['rows_per_sec'] / base['rows_per_sec']:>6.2f}x"
+        print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser("ETL/API benchmark suite")
+    ap.add_argument("--seasons", type=int, default=1)
+    ap.add_argument("--start-year", type=int, default=2101)
+    ap.add_argument("--games", type=int, default=2430, help="Scheduled games per season")
+    ap.add_argument("--boxscore-games", type=int, default=300, help="Boxscores loaded per season")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--skip-api", action="store_true")
+    ap.add_argument("--out", default=None, help="Report path (default bench/results/<time>-<commit>.json)")
+    ap.add_argument("--baseline", default=None, help="Earlier report to compare stage times against")
+    ap.add_argument("--keep", action="store_true", help="Leave the synthetic seasons in the database")
+    args = ap.parse_args()
+
+    session.engine.echo = False
+    years = list(range(args.start_year, args.start_year + args.seasons))
+    schedules = make_seasons(args.seasons, args.start_year, games=args.games)
+
+    _cleanup(years)
+    _ensure_dimensions(years)
+    try:
+        stages = build_stages(years, schedules, args.boxscore_games)
+        results: Dict[str, Any] = {}
+        for stage in stages:
+            results[stage.name] = stage.run(args.repeat)
+            print(f"  {stage.name}: {results[stage.name]['seconds']:.3f}s")
+        if not args.skip_api:
+            from fastapi.testclient import TestClient
+            from app.config import settings
+            # response cache off, so every request hits Postgres
+            settings.API_CACHE_ENABLED = False
+            from app.main import app
+            # one portal (event loop) for the whole run: pooled async connections belong to it
+            with TestClient(app) as client:
+                for stage in _api_stages(years, client):
+                    results[stage.name] = stage.run(args.repeat)
+                    print(f"  {stage.name}: {results[stage.name]['seconds']:.3f}s")
+    finally:
+        if not args.keep:
+            _cleanup(years)
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": {k: getattr(args, k) for k in ("seasons", "games", "boxscore_games", "repeat")},
+        "stages": results,
+    }
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"{dt.datetime.now():%Y%m%d-%H%M%S}-{report['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    _print_report(report, baseline)
+    print(f"Report written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Synthetic StatsAPI-shaped payloads for benchmarks; no network needed."""
+from __future__ import annotations
+import random
+import datetime as dt
+from typing import Any, Dict, List
+
+TEAM_IDS = list(range(108, 138))  # 30 clubs, in the StatsAPI id range
+
+
+def make_teams() -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": tid,
+            "name": f"Team {tid}",
+            "abbreviation": f"T{tid}",
+            "locationName": f"City {tid}",
+            "league": {"id": 103 + (i >= 15), "name": "American League" if i < 15 else "National League"},
+            "division": {"name": f"Division {i // 5}"},
+        }
+        for i, tid in enumerate(TEAM_IDS)
+    ]
+
+
+def make_schedule(year: int, games: int = 2430, seed: int = 0, dup_rate: float = 0.02) -> List[Dict[str, Any]]:
+    """Date buckets like /schedule returns: ~13 games a day from late March.
+
+    A small share of games is repeated later in the list with a better status,
+    the way postponed/resumed games show up twice in real schedules.
+    """
+    rng = random.Random(seed + year)
+    opening = dt.date(year, 3, 28)
+    per_day = 13
+    buckets: Dict[str, List[Dict[str, Any]]] = {}
+    base_pk = year * 1000
+
+    for n in range(games):
+        day = opening + dt.timedelta(days=n // per_day)
+        home, away = rng.sample(TEAM_IDS, 2)
+        hs, as_ = rng.randint(0, 10), rng.randint(0, 10)
+        if hs == as_:
+            hs += 1
+        game = {
+            "gamePk": base_pk + n,
+            "gameType": "R",
+            "season": str(year),
+            "gameDate": f"{day.isoformat()}T{rng.choice(['17:05', '23:05', '23:10', '02:10'])}:00Z",
+            "officialDate": day.isoformat(),
+            "status": {"abstractGameState": "Final", "detailedState": "Final", "statusCode": "F"},
+            "teams": {
+                "away": {"team": {"id": away, "name": f"Team {away}"}, "score": as_, "isWinner": as_ > hs},
+                "home": {"team": {"id": home, "name": f"Team {home}"}, "score": hs, "isWinner": hs > as_},
+            },
+            "venue": {"id": home, "name": f"Park {home}"},
+        }
+        buckets.setdefault(day.isoformat(), []).append(game)
+
+        if rng.random() < dup_rate:
+            later = day + dt.timedelta(days=rng.randint(1, 20))
+            early = dict(game, status={"abstractGameState": "Preview", "detailedState": "Postponed"},
+                         officialStartTime=None)
+            resumed = dict(game, officialDate=later.isoformat(),
+                           officialStartTime=f"{later.isoformat()}T23:05:00Z")
+            buckets[day.isoformat()][-1] = early
+            buckets.setdefault(later.isoformat(), []).append(resumed)
+
+    return [{"date": d, "games": buckets[d]} for d in sorted(buckets)]
+
+
+def make_seasons(n: int, start_year: int, games: int = 2430, seed: int = 0) -> List[tuple[int, List[Dict[str, Any]]]]:
+    return [(year, make_schedule(year, games=games, seed=seed)) for year in range(start_year, start_year + n)]
+
+
+ROSTER_HITTERS = 13
+ROSTER_PITCHERS = 13
+FIELD_POSITIONS = ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"]
+
+
+def roster(team_id: int) -> tuple[List[int], List[int]]:
+    """Stable (hitter ids, pitcher ids) for a synthetic club, far above real player ids."""
+    base = 9_000_000 + (team_id - TEAM_IDS[0]) * 100
+    hitters = [base + i for i in range(ROSTER_HITTERS)]
+    pitchers = [base + 50 + i for i in range(ROSTER_PITCHERS)]
+    return hitters, pitchers
+
+
+def _batting(rng: random.Random) -> Dict[str, int]:
+    ab = rng.randint(2, 5)
+    hits = sum(rng.random() < 0.25 for _ in range(ab))
+    hr = sum(rng.random() < 0.12 for _ in range(hits))
+    doubles = sum(rng.random() < 0.2 for _ in range(hits - hr))
+    triples = int(hits - hr - doubles > 0 and rng.random() < 0.03)
+    return {
+        "atBats": ab, "hits": hits, "doubles": doubles, "triples": triples, "homeRuns": hr,
+        "rbi": hr + rng.randint(0, hits), "runs": rng.randint(0, max(hits, hr)),
+        "baseOnBalls": int(rng.random() < 0.3), "strikeOuts": rng.randint(0, ab - hits),
+        "stolenBases": int(rng.random() < 0.05), "caughtStealing": int(rng.random() < 0.01),
+    }
+
+
+def _pitching(rng: random.Random, outs: int) -> Dict[str, Any]:
+    pitches = outs * 5 + rng.randint(0, 15)
+    strikes = int(pitches * 0.63)
+    return {
+        "inningsPitched": f"{outs // 3}.{outs % 3}", "hits": rng.randint(0, outs // 3 + 2),
+        "earnedRuns": rng.randint(0, outs // 6 + 1), "strikeOuts": rng.randint(0, outs // 2),
+        "baseOnBalls": rng.randint(0, 3), "homeRuns": int(rng.random() < 0.3),
+        "numberOfPitches": pitches, "strikes": strikes, "balls": pitches - strikes,
+    }
+
+
+def make_boxscore(game: Dict[str, Any], seed: int = 0) -> Dict[str, Any]:
+    """A /game/{pk}/boxscore payload for a synthetic schedule game."""
+    rng = random.Random(seed * 1_000_003 + game["gamePk"])
+    teams: Dict[str, Any] = {}
+    for side in ("away", "home"):
+        team_id = game["teams"][side]["team"]["id"]
+        hitters, staff = roster(team_id)
+        players: Dict[str, Any] = {}
+        for pid, pos in zip(rng.sample(hitters, 9), FIELD_POSITIONS):
+            po = rng.randint(0, 6) if pos != "DH" else 0
+            players[f"ID{pid}"] = {
+                "person": {"id": pid, "fullName": f"Hitter {pid}"},
+                "position": {"abbreviation": pos},
+                "stats": {
+                    "batting": _batting(rng),
+                    "pitching": {},
+                    "fielding": {} if pos == "DH" else {
+                        "putOuts": po, "assists": rng.randint(0, 3), "errors": int(rng.random() < 0.05),
+                        "doublePlays": int(rng.random() < 0.1), "chances": po + rng.randint(0, 3),
+                    },
+                },
+            }
+        outs_left = 27
+        used = rng.sample(staff, rng.randint(3, 5))
+        for i, pid in enumerate(used):
+            last = i == len(used) - 1 or outs_left <= 6
+            outs = outs_left if last else rng.randint(3, min(outs_left - 3, 21))
+            outs_left -= outs
+            players[f"ID{pid}"] = {
+                "person": {"id": pid, "fullName": f"Pitcher {pid}"},
+                "position": {"abbreviation": "P"},
+                "stats": {"batting": {}, "pitching": _pitching(rng, outs), "fielding": {}},
+            }
+            if outs_left <= 0:
+                break
+        # bench players on the roster who did not appear: skipped by the mapper
+        for pid in hitters:
+            players.setdefault(f"ID{pid}", {"person": {"id": pid, "fullName": f"Hitter {pid}"},
+                                            "position": {"abbreviation": "PH"}, "stats": {}})
+        teams[side] = {"team": {"id": team_id}, "players": players}
+
+    return {
+        "teams": teams,
+        "info": [
+            {"label": "Weather", "value": f"{rng.randint(45, 95)} degrees, {rng.choice(['Clear', 'Sunny', 'Cloudy', 'Partly Cloudy'])}."},
+            {"label": "Wind", "value": f"{rng.randint(0, 20)} mph, {rng.choice(['Out To CF', 'In From LF', 'L To R'])}."},
+            {"label": "T", "value": f"{rng.randint(2, 3)}:{rng.randint(0, 59):02d}."},
+        ],
+    }
@@ -0,0 +1,67 @@
+"""Compare the per-row Pydantic transform with the columnar one.
+
+    python -m bench.transform --seasons 3
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import time
+
+from app.etl import load
+from app.etl.transform import games_frame_records, map_games_columnar, map_games_from_schedule
+from bench.synthetic import make_schedule
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):  # loader progress prints
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser("transform benchmark")
+    ap.add_argument("--seasons", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    schedules = [(2016 + i, make_schedule(2016 + i)) for i in range(args.seasons)]
+
+    def rows_path():
+        out = []
+        for year, sched in schedules:
+            rows = map_games_from_schedule(sched, year)
+            dicts = load._dedupe_by_game_id([r.model_dump() for r in rows])
+            out.append([load.game_row_hash(d) for d in dicts])
+        return out
+
+    def columnar_path():
+        out = []
+        for year, sched in schedules:
+            frame = map_games_columnar(sched, year)
+            stage, _ = load._prepare_games_frame(frame)
+            out.append([row[-1] for row in stage])
+        return out
+
+    # identical output first: same rows, and the same staged hashes after dedupe
+    for year, sched in schedules:
+        expected = [r.model_dump() for r in map_games_from_schedule(sched, year)]
+        assert games_frame_records(map_games_columnar(sched, year)) == expected, year
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert rows_path() == columnar_path()
+
+    n = sum(sum(len(d["games"]) for d in s) for _, s in schedules)
+    t_rows = _best(rows_path, args.repeat)
+    t_cols = _best(columnar_path, args.repeat)
+    print(f"{n} schedule games, {args.seasons} season(s), best of {args.repeat}")
+    print(f"  per-row  : {t_rows * 1000:8.1f} ms  ({n / t_rows:,.0f} rows/s)")
+    print(f"  columnar : {t_cols * 1000:8.1f} ms  ({n / t_cols:,.0f} rows/s)")
+    print(f"  speedup  : {t_rows / t_cols:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# cumulative microseconds `-X importtime` may report for app.etl.run; it is a
+# few ms when the CLI imports only argparse and metrics, and over a second
+# when SQLAlchemy, pandas or the models come along
+IMPORT_BUDGET_US = int(os.getenv("MLB_CLI_IMPORT_BUDGET_US", "150000"))
+HEAVY = ("sqlalchemy", "pandas", "numpy", "httpx", "pydantic", "app.config", "app.db.session", "app.models")
+
+
+def _python(*args):
+    # no database settings: the CLI must not need them just to start
+    env = {k: v for k, v in os.environ.items() if not k.startswith(("POSTGRES_", "DATABASE_URL"))}
+    env["PYTHONPATH"] = ROOT
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+def test_cli_import_loads_no_heavy_modules():
+    out = _python("-c", "import sys, app.etl.run; print(' '.join(sorted(sys.modules)))")
+    assert out.returncode == 0, out.stderr
+    loaded = set(out.stdout.split())
+    assert not [m for m in HEAVY if m in loaded]
+
+
+def test_cli_import_time_budget():
+    out = _python("-X", "importtime", "-c", "import app.etl.run")
+    assert out.returncode == 0, out.stderr
+    # "import time: self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in out.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line.split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total)
+    assert cumulative["app.etl.run"] <= IMPORT_BUDGET_US, (
+        f"importing app.etl.run took {cumulative['app.etl.run'] / 1000:.1f}ms "
+        f"(budget {IMPORT_BUDGET_US / 1000:.0f}ms)"
+    )
+
+
+def test_cli_help_needs_no_settings():
+    out = _python("-m", "app.etl.run", "--help")
+    assert out.returncode == 0, out.stderr
+    assert "backfill" in out.stdout
+
+
+def test_rolling_sums_match_naive_windows():
+    from app.etl.splits import rolling_sums
+
+    rng = np.random.default_rng(7)
+    # three players, days with gaps and doubleheaders, sorted by (player, day, game)
+    player = np.repeat([3, 5, 9], [40, 25, 1])
+    day = np.concatenate([np.sort(rng.integers(0, 60, 40)), np.sort(rng.integers(10, 40, 25)), [59]])
+    values = rng.integers(0, 4, (len(player), 2))
+    last, sums = rolling_sums(player, day, values, day_spans=(1, 7, 30), game_spans=(1, 5, 10))
+
+    expected_last = [i for i in range(len(player))
+                     if i + 1 == len(player) or (player[i + 1], day[i + 1]) != (player[i], day[i])]
+    assert list(last) == expected_last
+    for row, i in enumerate(last):
+        own = [j for j in range(i + 1) if player[j] == player[i]]
+        for span in (1, 7, 30):
+            window = [j for j in own if day[i] - span < day[j]]
+            assert list(sums[f"{span}d"][row]) == list(values[window].sum(axis=0))
+        for span in (1, 5, 10):
+            assert list(sums[f"{span}g"][row]) == list(values[own[-span:]].sum(axis=0))
+
+
+def test_derive_stints():
+    import datetime as dt
+    from app.etl.team_history import STINT_GAP_DAYS, derive_stints
+
+    d = dt.date(2024, 4, 1)
+    recall = d + dt.timedelta(days=20 + STINT_GAP_DAYS + 1)
+    rows = [
+        # traded from 10 to 20, sent down for longer than the gap, recalled and still playing
+        (1, 10, d), (1, 10, d + dt.timedelta(days=5)), (1, 20, d + dt.timedelta(days=6)),
+        (1, 20, d + dt.timedelta(days=20)), (1, 20, recall), (1, 20, recall + dt.timedelta(days=3)),
+        # the next player, on the same team: their last stint ended long ago
+        (2, 20, d), (2, 20, d + dt.timedelta(days=5)),
+    ]
+    player, team, day = (np.array(c) for c in zip(*rows))
+    latest = np.datetime64(recall + dt.timedelta(days=3), "D")
+    stints = derive_stints(player, team, day.astype("datetime64[D]"), latest)
+
+    assert stints == [
+        (1, 10, d, d + dt.timedelta(days=5)),
+        (1, 20, d + dt.timedelta(days=6), d + dt.timedelta(days=20)),
+        (1, 20, recall, None),
+        (2, 20, d, d + dt.timedelta(days=5)),
+    ]
+
+
+def _archived(payload):
+    import hashlib, json
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return body, hashlib.blake2b(body, digest_size=10).hexdigest()
+
+
+def test_archive_skips_identical_payload(tmp_path):
+    from app.etl.archive import Segment
+
+    seg = Segment(str(tmp_path), "boxscore", 2024)
+    assert seg.append("745001", *_archived({"runs": 3}))
+    assert not seg.append("745001", *_archived({"runs": 3}))
+    assert seg.append("745001", *_archived({"runs": 4}))
+
+    # a fresh reader (another process) sees two records and the newest payload
+    other = Segment(str(tmp_path), "boxscore", 2024)
+    assert len(open(other.index_path).read().splitlines()) == 2
+    assert other.read("745001") == {"runs": 4}
+    assert not other.append("745001", *_archived({"runs": 4}))
+
+
+def test_archive_repairs_torn_index_line(tmp_path):
+    from app.etl.archive import Segment
+
+    seg = Segment(str(tmp_path), "boxscore", 2024)
+    seg.append("745001", *_archived({"runs": 3}))
+    with open(seg.index_path, "ab") as idx:
+        idx.write(b"512\t40\tdead")  # a writer crashed mid-line
+
+    other = Segment(str(tmp_path), "boxscore", 2024)
+    assert list(other.entries()) == ["745001"]
+    assert other.append("745002", *_archived({"runs": 5}))
+    lines = open(other.index_path).read().splitlines()
+    assert lines[1] == "512\t40\tdead" and lines[2].endswith("\t745002")
+
+    fresh = Segment(str(tmp_path), "boxscore", 2024)
+    assert sorted(fresh.entries()) == ["745001", "745002"]
+    assert fresh.read("745001") == {"runs": 3}
+    assert fresh.read("745002") == {"runs": 5}
+
+
+def test_snapshot_round_trip(tmp_path):
+    import datetime as dt, json, os
+    from app.etl.snapshot import _encode
+    from app.etl.snapshot_reader import FORMAT_VERSION, open_season
+
+    columns = {
+        "id": ("int", (1, 2, 3)),
+        "team_id": ("int", (10, None, 12)),
+        "venue": ("category", ("Fenway", None, "Fenway")),
+        "era": ("float", (3.5, None, float("nan"))),
+        "win": ("bool", (True, None, False)),
+        "date": ("date", (dt.date(2024, 4, 1), dt.date(2024, 4, 2), dt.date(2024, 4, 3))),
+        "start": ("datetime", (dt.datetime(2024, 4, 1, 19, 5), dt.datetime(2024, 4, 2, 13, 10),
+                               dt.datetime(2024, 4, 3, 18, 40))),
+    }
+    # laid out like _export_table writes it
+    out = tmp_path / "2024" / "v1" / "games"
+    out.mkdir(parents=True)
+    meta = {}
+    for name, (kind, values) in columns.items():
+        arr, valid, meta[name] = _encode(kind, values)
+        np.save(out / f"{name}.npy", arr)
+        if valid is not None:
+            np.save(out / f"{name}.valid.npy", valid)
+        meta[name]["dtype"] = str(arr.dtype)
+    manifest = {"format": FORMAT_VERSION, "season": 2024, "path": os.path.join("2024", "v1"),
+                "tables": {"games": {"rows": 3, "columns": meta}}}
+    (tmp_path / "2024.json").write_text(json.dumps(manifest))
+
+    snap = open_season(2024, str(tmp_path))
+    df = snap.frame("games")
+    assert df["id"].tolist() == [1, 2, 3]
+    assert str(df["team_id"].dtype) == "Int64" and df["team_id"].isna().tolist() == [False, True, False]
+    assert df["team_id"].dropna().tolist() == [10, 12]
+    assert df["venue"].cat.categories.tolist() == ["Fenway"]
+    assert df["venue"].isna().tolist() == [False, True, False]
+    assert df["era"].iloc[0] == 3.5 and df["era"].iloc[1:].isna().all()
+    assert str(df["win"].dtype) == "boolean" and df["win"].isna().tolist() == [False, True, False]
+    assert df["date"].tolist() == [pd.Timestamp(d) for d in columns["date"][1]]
+    assert df["start"].tolist() == [pd.Timestamp(t) for t in columns["start"][1]]
+
+    # plain numeric and timestamp columns are views of the mapped files
+    for name in ("id", "era", "start"):
+        assert isinstance(snap.column("games", name), np.memmap)
+        assert np.shares_memory(df[name].to_numpy(), snap.column("games", name))
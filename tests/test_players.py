@@ -0,0 +1,35 @@
+import datetime as dt
+
+from app.api.players import _current_splits
+from app.models import PlayerPitchingSplit
+from app.schemas.player_split import PlayerPitchingSplitRead
+
+
+SUMS = ("games", "outs", "hits_allowed", "earned_runs", "strikeouts", "walks", "home_runs_allowed", "pitches_thrown")
+
+
+def _split(span, as_of, **sums):
+    return PlayerPitchingSplit(player_id=7, season_id=3, span=span, as_of=as_of, **{**dict.fromkeys(SUMS, 0), **sums})
+
+
+def test_day_splits_of_an_idle_player_are_zero():
+    # a reliever last used on May 1st, asked about on May 21st
+    last = dt.date(2024, 5, 1)
+    rows = [_split(span, last, games=g, outs=3 * g, earned_runs=1, strikeouts=g)
+            for span, g in (("10g", 10), ("7d", 3), ("30d", 9))]
+    day = last + dt.timedelta(days=20)
+    out = [PlayerPitchingSplitRead.model_validate(r) for r in _current_splits(rows, day)]
+
+    assert [s.span for s in out] == ["7d", "30d", "10g"]
+    by_span = {s.span: s for s in out}
+    assert by_span["7d"].as_of == day and by_span["7d"].games == 0 and by_span["7d"].era is None
+    # still inside 30 days, and the last ten games do not expire
+    assert by_span["30d"].games == 9 and by_span["30d"].as_of == last
+    assert by_span["10g"].games == 10
+
+
+def test_day_split_counts_up_to_its_last_day():
+    last = dt.date(2024, 5, 1)
+    rows = [_split("7d", last, games=2, outs=6)]
+    assert _current_splits(rows, last + dt.timedelta(days=6))[0] is rows[0]
+    assert _current_splits(rows, last + dt.timedelta(days=7))[0]["as_of"] == last + dt.timedelta(days=7)